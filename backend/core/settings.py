@@ -98,6 +98,19 @@ CORS_ALLOW_CREDENTIALS = True
 # Increase thread pool for long-running ML inference requests
 ASGI_THREADS = 10
 
+# Interview orchestrator pool: one lightweight orchestrator per live session
+INTERVIEW_MAX_CONCURRENT_SESSIONS = int(os.getenv("INTERVIEW_MAX_CONCURRENT_SESSIONS", "32"))
+INTERVIEW_SESSION_IDLE_SECONDS = int(os.getenv("INTERVIEW_SESSION_IDLE_SECONDS", "1800"))
+
+# Load the shared embedding model at startup instead of on the first interview
+INTERVIEW_WARM_UP_MODELS = os.getenv("INTERVIEW_WARM_UP_MODELS", "False") == "True"
+
+# Keep a copy of every user audio blob under MEDIA_ROOT (written off the hot path)
+INTERVIEW_PERSIST_USER_AUDIO = os.getenv("INTERVIEW_PERSIST_USER_AUDIO", "False") == "True"
+
+# How long a finished interview's detail payload (chat log + report) stays cached
+INTERVIEW_DETAIL_CACHE_SECONDS = int(os.getenv("INTERVIEW_DETAIL_CACHE_SECONDS", "3600"))
+
 # Email setup for OTP (Real SMTP)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
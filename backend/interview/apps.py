@@ -1,10 +1,19 @@
+import logging
 import sys
+import threading
 from pathlib import Path
 from django.apps import AppConfig
+from django.conf import settings
 
-# Global orchestrator instance for REST views (lazy-loaded singleton)
+logger = logging.getLogger('interview')
+
+# Global orchestrator instance for stateless REST endpoints (lazy-loaded singleton)
 _orchestrator = None
 
+# Per-session orchestrator pool (lazy-loaded)
+_session_pool = None
+_session_pool_lock = threading.Lock()
+
 
 def _ensure_ml_path():
     """Add the ml/ directory to sys.path so we can import orchestrator."""
@@ -15,23 +24,65 @@ def _ensure_ml_path():
 
 
 def get_orchestrator():
-    """Get or create the singleton BeaverAI orchestrator for REST views.
+    """Get or create the singleton orchestrator for stateless endpoints.
 
-    NOTE: The WebSocket consumer creates its OWN per-connection instance
-    via _create_orchestrator() in consumers.py. This singleton is only
-    for REST API endpoints (views.py).
+    Only for calls that carry no conversation state (health check, one-off
+    ATS analysis, TTS). Anything tied to an interview must go through
+    get_session_pool() so concurrent candidates never share history.
     """
     global _orchestrator
     if _orchestrator is None:
         _ensure_ml_path()
-        from orchestrator import BeaverAIOrchestrator
-        _orchestrator = BeaverAIOrchestrator(lazy_load=True)
+        from orchestrator import IntrvAIOrchestrator
+        _orchestrator = IntrvAIOrchestrator(lazy_load=True)
     return _orchestrator
 
 
+def get_session_pool():
+    """Get or create the per-session orchestrator pool.
+
+    Sized by INTERVIEW_MAX_CONCURRENT_SESSIONS and
+    INTERVIEW_SESSION_IDLE_SECONDS in Django settings.
+    """
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _ensure_ml_path()
+                from orchestrator import IntrvAIOrchestrator
+                from .session_pool import OrchestratorPool
+
+                _session_pool = OrchestratorPool(
+                    factory=lambda key: IntrvAIOrchestrator(
+                        lazy_load=True, session_key=key,
+                    ),
+                    max_sessions=getattr(
+                        settings, 'INTERVIEW_MAX_CONCURRENT_SESSIONS', 32),
+                    idle_timeout=getattr(
+                        settings, 'INTERVIEW_SESSION_IDLE_SECONDS', 1800),
+                )
+    return _session_pool
+
+
 class InterviewConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interview'
 
     def ready(self):
         _ensure_ml_path()
+        if getattr(settings, 'INTERVIEW_WARM_UP_MODELS', False):
+            # Background thread: startup stays fast, and the model is usually
+            # resident before the first candidate connects.
+            threading.Thread(
+                target=_warm_up_models, name='model-warm-up', daemon=True,
+            ).start()
+
+
+def _warm_up_models():
+    """Load process-wide ML models ahead of the first interview."""
+    try:
+        from src.core.embedding_registry import get_embedding_registry
+        warmed = get_embedding_registry().warm_up()
+        logger.info(f"Warmed up embedding models: {warmed}")
+    except Exception as e:
+        logger.warning(f"Model warm-up failed: {e}")
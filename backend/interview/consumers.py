@@ -4,24 +4,44 @@ Full interview pipeline over WebSocket:
 1. Frontend sends "setup" with resume, JD, difficulty, mode, type → ATS + opening question
 2. Frontend sends "answer" with text → AI response (streaming)
 3. Frontend sends binary audio → transcribed via STT → treated as answer
+   (or streams PCM frames between "audio_stream_start"/"audio_stream_end"
+   and receives partial transcriptions while speaking)
 4. Frontend sends "end" → evaluation report + proctoring summary
+
+With "tts": true in "setup", every AI reply is also spoken: audio is
+synthesized sentence by sentence while the LLM streams and arrives as
+binary frames (see src.voice.tts_stream for the frame header).
+
+With "proctoring": true the camera stays in the browser: the client uploads
+downscaled JPEG/WebP frames at the negotiated rate and receives risk
+updates (see src.eyes.remote_proctoring).
 """
 
 import asyncio
 import base64
 import json
 import logging
-import os
 import secrets
-import tempfile
 
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
 
+from .session_pool import PoolExhausted
+from .utils.audio_handler import save_audio_blob
+from .utils.streaming import StreamMetrics, iterate_in_thread
+
 logger = logging.getLogger('interview')
 
+PROCTORING_FRAME_MAGIC = b'PRCT'  # binary messages with this prefix are camera frames
+
+
+def _log_task_failure(task):
+    if not task.cancelled() and task.exception():
+        logger.warning(f"Background task failed: {task.exception()}")
+
 
 class InterviewConsumer(AsyncWebsocketConsumer):
     """Async WebSocket consumer for real-time interview sessions.
@@ -31,22 +51,41 @@ class InterviewConsumer(AsyncWebsocketConsumer):
     → Client sends:
         {"type": "setup", "resume": "...", "jd": "...",
          "difficulty": "Medium", "mode": "curated",
-         "interview_type": "technical", "proctoring": false}
+         "interview_type": "technical", "proctoring": false, "tts": false,
+         "proctoring_fps": 2, "proctoring_width": 640}
         {"type": "answer", "text": "My answer..."}
         {"type": "end"}
         (or binary audio data for STT)
+        {"type": "audio_stream_start", "encoding": "pcm_s16le", "sample_rate": 16000}
+        (then binary 16-bit mono PCM frames)
+        {"type": "audio_stream_end"}
+        (with "proctoring": true) binary camera frames: 8-byte header
+            [b"PRCT", seq u32] followed by one JPEG or WebP image
 
     ← Server sends:
         {"type": "connected", "session_id": "..."}
         {"type": "status", "message": "..."}
         {"type": "ats_result", "data": {...}}
+        {"type": "proctoring_config", "data": {"fps": 2.0, "max_width": 640,
+            "formats": ["jpeg", "webp"], "max_frame_bytes": ...}}
+        {"type": "proctoring_update", "data": {"seq": 12, "violations": [...],
+            "face_count": 1, "risk_score": 0.2, "alert_level": "clear"}}
+            (when violations or the alert level change; frames are dropped,
+            not queued, while analysis is behind)
         {"type": "question", "text": "..."}
+        {"type": "partial_transcription", "text": "..."}
+        {"type": "transcription", "text": "..."}
         {"type": "stream_start"}
-        {"type": "stream_chunk", "text": "..."}
-        {"type": "stream_end", "text": "full response"}
+        {"type": "stream_chunk", "text": "...", "latency_ms": 42.0}
+        {"type": "stream_end", "text": "full response", "metrics": {...}}
         {"type": "response", "text": "..."}
+        {"type": "report_section", "section": "evaluation" | "speech_analysis"
+            | "proctoring", "data": {...}}   (each as soon as it is ready)
         {"type": "report", "data": {...}}
         {"type": "error", "message": "..."}
+        (with "tts": true) binary audio frames: 14-byte header
+            [b"TTSA", stream u32, seq u32, codec u8 (1=mp3, 2=wav), flags u8 (1=final)]
+            followed by one encoded clip; one stream per question/reply
     """
 
     def __init__(self, *args, **kwargs):
@@ -57,8 +96,13 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         self._interview_active = False
         self._difficulty = 'Medium'
         self._proctoring_enabled = False
+        self._tts_enabled = False
+        self._tts_stream_id = 0
+        self._turn_task = None
+        self._audio_stream = None
+        self._stream_decode_task = None
+        self._background_tasks = set()
 
-   
 
     async def connect(self):
         """Accept WebSocket connection and generate session ID."""
@@ -86,7 +130,12 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         """Route incoming messages to appropriate handlers."""
          
         if bytes_data:
-            await self._handle_audio(bytes_data)
+            if bytes_data[:len(PROCTORING_FRAME_MAGIC)] == PROCTORING_FRAME_MAGIC:
+                self._handle_proctoring_frame(bytes_data)
+            elif self._audio_stream is not None:
+                self._handle_audio_frame(bytes_data)
+            else:
+                await self._handle_audio(bytes_data)
             return
 
         
@@ -107,6 +156,8 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'start': self._handle_setup,  
                 'answer': self._handle_answer,
                 'end': self._handle_end,
+                'audio_stream_start': self._handle_audio_stream_start,
+                'audio_stream_end': self._handle_audio_stream_end,
             }
 
             handler = handlers.get(msg_type)
@@ -116,7 +167,8 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 await self.send_json({
                     'type': 'error',
                     'message': f'Unknown type: "{msg_type}". '
-                               f'Use "setup", "answer", or "end".',
+                               f'Use "setup", "answer", "audio_stream_start", '
+                               f'"audio_stream_end", or "end".',
                 })
 
 
@@ -147,7 +199,9 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             difficulty: str (Easy/Medium/Hard/Extreme)
             mode: str (generic/curated)
             interview_type: str (technical/behavioral/hr/combined)
-            proctoring: bool
+            proctoring: bool (frames come from the client's camera)
+            proctoring_fps, proctoring_width: proposed frame rate and width
+            tts: bool
         """
         if self._interview_active:
             await self.send_json({
@@ -161,6 +215,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         interview_mode = data.get('mode', 'generic')
         interview_type = data.get('interview_type', 'technical')
         self._proctoring_enabled = data.get('proctoring', False)
+        self._tts_enabled = bool(data.get('tts', False))
 
         
         resume_text = data.get('resume', '')
@@ -213,7 +268,16 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'message': 'Initializing AI interview engine...',
             })
 
-            self.api = await asyncio.to_thread(self._create_orchestrator)
+            try:
+                self.api = await asyncio.to_thread(
+                    self._create_orchestrator, self.session_id
+                )
+            except PoolExhausted:
+                await self.send_json({
+                    'type': 'error',
+                    'message': 'All interview slots are busy. Please try again shortly.',
+                })
+                return
 
             # ── Step 2: Load resume and JD ──
             if resume_text:
@@ -272,11 +336,27 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                     'type': 'status',
                     'message': 'Starting proctoring...',
                 })
-                await asyncio.to_thread(self.api.start_proctoring)
+                proctoring_config = await asyncio.to_thread(
+                    self.api.start_remote_proctoring,
+                    data.get('proctoring_fps'), data.get('proctoring_width'),
+                )
+                if proctoring_config:
+                    await self.send_json({
+                        'type': 'proctoring_config',
+                        'data': proctoring_config,
+                    })
+                else:
+                    self._proctoring_enabled = False
+                    await self.send_json({
+                        'type': 'status',
+                        'message': 'Proctoring unavailable; continuing without it.',
+                    })
 
             # ── Step 6: Create DB record ──
             self.db_session = await self._create_db_session(
                 difficulty=self._difficulty,
+                resume_text=resume_text or '',
+                jd_text=jd_text or '',
             )
 
             self._interview_active = True
@@ -297,6 +377,11 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'type': 'question',
                 'text': opening,
             })
+            speech = self._new_speech()
+            if speech:
+                speech.feed(opening)
+                speech.close()
+                self._background(self._send_speech(speech))
 
             logger.info(
                 f"Interview started: session={self.session_id[:8]}, "
@@ -314,7 +399,12 @@ class InterviewConsumer(AsyncWebsocketConsumer):
     # ── Answer: Chat with AI ──────────────────────────────────────
 
     async def _handle_answer(self, data: dict):
-        """Process a user answer and get AI response."""
+        """Process a user answer and stream the AI response.
+
+        The turn runs as a background task so that a disconnect arriving
+        mid-stream can cancel it (Channels dispatches messages one at a
+        time, so a blocking handler would never see the disconnect).
+        """
         if not self._interview_active or not self.api:
             await self.send_json({
                 'type': 'error',
@@ -330,6 +420,17 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             })
             return
 
+        if self._turn_task and not self._turn_task.done():
+            await self.send_json({
+                'type': 'error',
+                'message': 'Still responding to the previous answer.',
+            })
+            return
+
+        self._turn_task = asyncio.create_task(self._run_turn(user_text))
+
+    async def _run_turn(self, user_text: str):
+        """Toxicity check, persist the answer, stream the reply."""
         # Check toxicity
         toxicity = await asyncio.to_thread(
             self.api.check_toxicity, user_text
@@ -338,12 +439,16 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         # Save user message
         await self._save_message('user', user_text)
 
+        speech_task = None
         try:
-            # Stream AI response
+            # Stream AI response (and speak it sentence by sentence, if enabled)
             await self.send_json({'type': 'stream_start'})
 
-            full_response = await self._stream_response(
-                user_text, self._difficulty
+            speech = self._new_speech()
+            if speech:
+                speech_task = asyncio.create_task(self._send_speech(speech))
+            full_response, metrics = await self._stream_response(
+                user_text, self._difficulty, speech
             )
 
             # Save AI message
@@ -354,6 +459,7 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'type': 'stream_end',
                 'text': full_response,
                 'toxicity': toxicity,
+                'metrics': metrics,
             })
 
             # Also send as a simple "response" for easy consumption
@@ -362,6 +468,15 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'text': full_response,
             })
 
+            # The turn lasts until the reply has been spoken
+            if speech_task:
+                await speech_task
+
+        except asyncio.CancelledError:
+            logger.info(f"Turn cancelled: session={self.session_id[:8]}")
+            if speech_task:
+                speech_task.cancel()
+            raise
         except Exception as e:
             logger.exception(f"Chat error: {e}")
             await self.send_json({
@@ -369,6 +484,24 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'message': f'AI response failed: {str(e)}',
             })
 
+    async def _await_turn(self):
+        """Wait for an in-flight turn to finish (used before ending)."""
+        if self._turn_task and not self._turn_task.done():
+            try:
+                await self._turn_task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def _cancel_turn(self):
+        """Cancel an in-flight turn, e.g. when the socket goes away."""
+        task, self._turn_task = self._turn_task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
     # ── Audio: STT → Answer ───────────────────────────────────────
 
     async def _handle_audio(self, audio_data: bytes):
@@ -385,22 +518,17 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             'message': 'Transcribing audio...',
         })
 
-        try:
-            with tempfile.NamedTemporaryFile(
-                delete=False, suffix='.webm'
-            ) as tmp:
-                tmp.write(audio_data)
-                audio_path = tmp.name
+        if settings.INTERVIEW_PERSIST_USER_AUDIO:
+            # Optional archive copy; transcription never waits on the disk.
+            self._background(asyncio.to_thread(
+                save_audio_blob, audio_data, self.session_id
+            ))
 
+        try:
             result = await asyncio.to_thread(
-                self.api.transcribe_audio, audio_path
+                self.api.transcribe_audio_bytes, audio_data
             )
 
-            try:
-                os.unlink(audio_path)
-            except OSError:
-                pass
-
             transcribed_text = result.get('text', '').strip()
             if not transcribed_text:
                 await self.send_json({
@@ -426,50 +554,193 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 'message': f'Transcription failed: {str(e)}',
             })
 
-    # ── End: Report + Cleanup ─────────────────────────────────────
+    # ── Audio: streaming STT ──────────────────────────────────────
 
-    async def _handle_end(self, data: dict):
-        """End interview, generate report, stop proctoring."""
+    async def _handle_audio_stream_start(self, data: dict):
+        """Begin incremental transcription of PCM frames sent as binary messages."""
         if not self._interview_active or not self.api:
             await self.send_json({
                 'type': 'error',
-                'message': 'No active interview to end.',
+                'message': 'No active interview. Send "setup" first.',
             })
             return
 
-        report = None
+        try:
+            sample_rate = int(data.get('sample_rate', 16000))
+        except (TypeError, ValueError):
+            sample_rate = 0
+        if not 8000 <= sample_rate <= 48000:
+            await self.send_json({
+                'type': 'error',
+                'message': 'sample_rate must be between 8000 and 48000.',
+            })
+            return
 
+        await self._stop_audio_stream()
         try:
-            # Generate evaluation report (with 120s timeout)
+            self._audio_stream = await asyncio.to_thread(
+                self.api.create_stream_transcriber,
+                sample_rate, None, data.get('encoding', 'pcm_s16le'),
+            )
+        except ValueError as e:
+            await self.send_json({'type': 'error', 'message': str(e)})
+            return
+        await self.send_json({'type': 'status', 'message': 'Listening...'})
+
+        # While the candidate speaks, prefill the LLM with the prompt prefix
+        # every reply shares so only their answer is left to process.
+        self._background(asyncio.to_thread(self.api.warm_next_turn, self._difficulty))
+
+    def _handle_audio_frame(self, frame: bytes):
+        """Buffer one PCM frame; start a partial decode when one is due.
+
+        At most one decode runs at a time. Audio that arrives meanwhile is
+        picked up by the next decode, so slow hardware gets fewer partials
+        but never falls behind the stream.
+        """
+        due = self._audio_stream.append(frame)
+        task = self._stream_decode_task
+        if due and (task is None or task.done()):
+            self._stream_decode_task = asyncio.create_task(
+                self._decode_partial(self._audio_stream)
+            )
+
+    async def _decode_partial(self, transcriber):
+        try:
+            text = await asyncio.to_thread(transcriber.decode_pending)
+        except Exception as e:
+            logger.warning(f"Partial transcription failed: {e}")
+            return
+        if text and transcriber is self._audio_stream:
             await self.send_json({
-                'type': 'status',
-                'message': 'Generating evaluation report... (this may take up to 2 minutes)',
+                'type': 'partial_transcription',
+                'text': text,
             })
 
-            history = await asyncio.to_thread(self.api.get_chat_history)
+    async def _handle_audio_stream_end(self, data: dict):
+        """Finalize the streamed utterance and treat it as the answer."""
+        transcriber = self._audio_stream
+        if transcriber is None:
+            await self.send_json({
+                'type': 'error',
+                'message': 'No audio stream in progress.',
+            })
+            return
+        await self._stop_audio_stream()
 
+        try:
+            result = await asyncio.to_thread(
+                self.api.finish_stream_transcription, transcriber
+            )
+            transcribed_text = result['text']
+        except Exception as e:
+            logger.exception(f"Streaming transcription error: {e}")
+            await self.send_json({
+                'type': 'error',
+                'message': f'Transcription failed: {str(e)}',
+            })
+            return
+
+        if not transcribed_text:
+            await self.send_json({
+                'type': 'error',
+                'message': 'Could not transcribe audio.',
+            })
+            return
+
+        await self.send_json({
+            'type': 'transcription',
+            'text': transcribed_text,
+        })
+        await self._handle_answer({
+            'type': 'answer',
+            'text': transcribed_text,
+        })
+
+    async def _stop_audio_stream(self):
+        """Detach the active stream and let any in-flight partial decode finish."""
+        self._audio_stream = None
+        task, self._stream_decode_task = self._stream_decode_task, None
+        if task and not task.done():
             try:
-                report = await asyncio.wait_for(
-                    asyncio.to_thread(self.api.generate_report, history),
-                    timeout=120.0,
-                )
-            except asyncio.TimeoutError:
-                logger.error("Report generation timed out after 120s")
-                report = {"error": "Report generation timed out", "chat_history": history}
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    # ── Proctoring: client camera frames ──────────────────────────
+
+    def _handle_proctoring_frame(self, frame: bytes):
+        """Hand a camera frame to analysis, or drop it if analysis is behind."""
+        if not self._interview_active or not self._proctoring_enabled:
+            return
+        future = self.api.submit_proctoring_frame(frame)
+        if future is not None:
+            self._background(self._send_proctoring_update(future))
 
+    async def _send_proctoring_update(self, future):
+        try:
+            update = await asyncio.wrap_future(future)
         except Exception as e:
-            logger.exception(f"Report error: {e}")
-            report = {"error": str(e)}
+            logger.warning(f"Proctoring frame analysis failed: {e}")
+            return
+        if update and self._interview_active:
+            await self.send_json({
+                'type': 'proctoring_update',
+                'data': update,
+            })
+
+    # ── End: Report + Cleanup ─────────────────────────────────────
+
+    async def _handle_end(self, data: dict):
+        """End interview, generate report, stop proctoring."""
+        if not self._interview_active or not self.api:
+            await self.send_json({
+                'type': 'error',
+                'message': 'No active interview to end.',
+            })
+            return
+
+        await self._await_turn()
 
-        # Stop proctoring (always attempt)
-        proctoring_summary = None
-        if self._proctoring_enabled:
+        await self.send_json({
+            'type': 'status',
+            'message': 'Generating evaluation report... (this may take up to 2 minutes)',
+        })
+
+        # Evaluation, speech analysis and proctoring run concurrently; each
+        # section goes to the client as soon as it is ready.
+        sections = {}
+        history = []
+        try:
+            history = await asyncio.to_thread(self.api.get_chat_history)
+            stream = iterate_in_thread(
+                self.api.generate_report_sections, history, self._proctoring_enabled
+            )
             try:
-                proctoring_summary = await asyncio.to_thread(
-                    self.api.stop_proctoring
-                )
-            except Exception as e:
-                logger.warning(f"Proctoring stop failed: {e}")
+                async with asyncio.timeout(120.0):
+                    async for name, section in stream:
+                        sections[name] = section
+                        await self.send_json({
+                            'type': 'report_section',
+                            'section': name,
+                            'data': section,
+                        })
+            finally:
+                await stream.aclose()
+        except TimeoutError:
+            logger.error("Report generation timed out after 120s")
+            sections.setdefault(
+                'evaluation',
+                {"error": "Report generation timed out", "chat_history": history},
+            )
+        except Exception as e:
+            logger.exception(f"Report error: {e}")
+            sections.setdefault('evaluation', {"error": str(e)})
+
+        report = sections.get('evaluation')
+        if report and sections.get('speech_analysis'):
+            report['sentiment_analysis'] = sections['speech_analysis']
+        proctoring_summary = sections.get('proctoring')
 
         # Update DB
         if report:
@@ -492,38 +763,90 @@ class InterviewConsumer(AsyncWebsocketConsumer):
 
     # ── Streaming Helper ──────────────────────────────────────────
 
-    async def _stream_response(self, user_text: str,
-                                difficulty: str) -> str:
-        """Stream LLM response token-by-token over WebSocket."""
-        chunks = []
+    async def _stream_response(self, user_text: str, difficulty: str,
+                                speech=None) -> tuple[str, dict]:
+        """Stream LLM sentence fragments over WebSocket as they are produced.
 
-        def _generate():
-            return list(self.api.chat_stream(user_text, difficulty))
+        Each fragment is also fed to ``speech`` (a SpeechStream), if given.
 
-        all_chunks = await asyncio.to_thread(_generate)
+        Returns:
+            (full response text, latency metrics dict)
+        """
+        chunks = []
+        metrics = StreamMetrics()
 
-        for chunk in all_chunks:
-            if chunk.strip():
+        if getattr(self.api, 'async_streaming_available', False):
+            # Native asyncio stream: no worker thread parked on the HTTP read.
+            stream = self.api.achat_stream(user_text, difficulty)
+        else:
+            stream = iterate_in_thread(self.api.chat_stream, user_text, difficulty)
+
+        try:
+            async for chunk in stream:
+                if not chunk.strip():
+                    continue
+                latency_ms = metrics.mark_chunk()
                 chunks.append(chunk)
                 await self.send_json({
                     'type': 'stream_chunk',
                     'text': chunk,
+                    'latency_ms': round(latency_ms, 1),
                 })
+                if speech:
+                    speech.feed(chunk)
+        except asyncio.CancelledError:
+            metrics.cancelled = True
+            raise
+        finally:
+            await stream.aclose()
+            if speech:
+                speech.close()
+            summary = metrics.to_dict()
+            logger.info(
+                f"LLM stream: session={self.session_id[:8]}, "
+                f"ttfc={summary['time_to_first_chunk_ms']}ms, "
+                f"chunks={summary['chunk_count']}, "
+                f"total={summary['total_ms']}ms, "
+                f"cancelled={summary['cancelled']}"
+            )
+
+        return ' '.join(chunks).strip(), summary
 
-        return ' '.join(chunks).strip()
+    # ── Speech (server-side TTS) ──────────────────────────────────
+
+    def _new_speech(self):
+        """A SpeechStream for one reply, or None when TTS is off."""
+        if not self._tts_enabled:
+            return None
+        self._tts_stream_id += 1
+        return self.api.create_speech_stream(self._tts_stream_id)
+
+    async def _send_speech(self, speech):
+        """Forward a SpeechStream's frames as binary messages until it ends."""
+        frames = speech.frames()
+        try:
+            async for frame in frames:
+                await self.send(bytes_data=frame)
+        finally:
+            await frames.aclose()
 
     # ── Orchestrator Factory ──────────────────────────────────────
 
     @staticmethod
-    def _create_orchestrator():
-        """Create orchestrator instance."""
-        from .apps import get_orchestrator
-        return get_orchestrator()
+    def _create_orchestrator(session_id: str):
+        """Acquire this connection's own orchestrator from the session pool.
+
+        The entry is pinned so idle eviction never reclaims it while the
+        socket is open; _cleanup_session releases it.
+        """
+        from .apps import get_session_pool
+        orchestrator, _ = get_session_pool().acquire(session_id, pin=True)
+        return orchestrator
 
     # ── Database Helpers ──────────────────────────────────────────
 
     @database_sync_to_async
-    def _create_db_session(self, difficulty: str):
+    def _create_db_session(self, difficulty: str, resume_text: str = '', jd_text: str = ''):
         from .models import InterviewSession
 
         user = self.scope.get('user')
@@ -534,6 +857,8 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             user=user,
             session_id=self.session_id,
             difficulty=difficulty,
+            resume_text=resume_text,
+            jd_text=jd_text,
         )
 
     @database_sync_to_async
@@ -557,11 +882,17 @@ class InterviewConsumer(AsyncWebsocketConsumer):
     # ── Session Cleanup ───────────────────────────────────────────
 
     async def _cleanup_session(self):
-        if self.api and self._interview_active:
+        await self._cancel_turn()
+        await self._stop_audio_stream()
+        await self._cancel_background()
+        if self.api:
+            from .apps import get_session_pool
             try:
-                await asyncio.to_thread(self.api.reset_chat)
-            except Exception:
-                pass
+                await asyncio.to_thread(
+                    get_session_pool().release, self.session_id
+                )
+            except Exception as e:
+                logger.warning(f"Orchestrator release failed: {e}")
         self._interview_active = False
         self._proctoring_enabled = False
         self.api = None
@@ -569,5 +900,25 @@ class InterviewConsumer(AsyncWebsocketConsumer):
 
     # ── Utility ───────────────────────────────────────────────────
 
+    def _background(self, coro):
+        """Run a fire-and-forget coroutine, keeping a reference until it ends."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        task.add_done_callback(_log_task_failure)
+
+    async def _cancel_background(self):
+        """Cancel and await background tasks before the orchestrator is released.
+
+        Work already handed to a thread (``asyncio.to_thread``) still runs to
+        completion; only the awaiting task is cancelled.
+        """
+        tasks = list(self._background_tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._background_tasks.clear()
+
     async def send_json(self, content: dict):
         await self.send(text_data=json.dumps(content))
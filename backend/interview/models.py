@@ -31,6 +31,10 @@ class InterviewSession(models.Model):
     )
     enable_proctoring = models.BooleanField(default=False)
 
+    # Grounding documents, kept so an evicted orchestrator can be rebuilt
+    resume_text = models.TextField(blank=True, default='')
+    jd_text = models.TextField(blank=True, default='')
+
     # ATS scores (populated after resume analysis)
     ats_algorithmic_score = models.FloatField(null=True, blank=True)
     ats_llm_score = models.FloatField(null=True, blank=True)
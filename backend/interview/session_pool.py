@@ -0,0 +1,148 @@
+"""Per-session orchestrator pool.
+
+Each interview gets its own lightweight ``IntrvAIOrchestrator`` holding the
+conversation state (resume/JD text, LLM history, SessionState).
+Heavy models are shared process-wide inside the ML layer, so an entry costs
+little more than its history.
+
+The pool enforces a concurrency cap and evicts entries that have been idle
+longer than the configured timeout. Entries still inside the idle window are
+never evicted to make room; ``acquire`` raises ``PoolExhausted`` instead. WebSocket sessions pin their entry for
+the lifetime of the connection so it is never evicted underneath them.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+logger = logging.getLogger('interview')
+
+
+class PoolExhausted(Exception):
+    """Raised when every slot is taken by a pinned or recently used session."""
+
+
+@dataclass
+class _PoolEntry:
+    orchestrator: object
+    pinned: bool = False
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class OrchestratorPool:
+    """Thread-safe map of session key → orchestrator with LRU idle eviction."""
+
+    def __init__(self, factory, max_sessions: int = 32,
+                 idle_timeout: float = 1800.0):
+        """
+        Args:
+            factory: Callable ``factory(session_key)`` returning a new
+                     orchestrator.
+            max_sessions: Maximum number of live orchestrators.
+            idle_timeout: Seconds after which an unpinned entry is evicted.
+        """
+        self._factory = factory
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._released_total = 0
+
+    def acquire(self, session_key: str, pin: bool = False):
+        """Return the orchestrator for ``session_key``, creating it if needed.
+
+        Args:
+            session_key: Interview session identifier.
+            pin: Keep the entry out of idle eviction until ``release``.
+
+        Returns:
+            (orchestrator, created) — ``created`` is True when a fresh
+            instance was built (e.g. after eviction), so the caller can
+            restore its state.
+
+        Raises:
+            PoolExhausted: When the cap is reached and nothing can be evicted.
+        """
+        orchestrator = None
+        with self._lock:
+            entry = self._entries.get(session_key)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                entry.pinned = entry.pinned or pin
+                self._entries.move_to_end(session_key)
+                return entry.orchestrator, False
+
+            evicted = self._pop_idle_locked()
+            if len(self._entries) < self.max_sessions:
+                # Engines load lazily, so building under the lock is cheap.
+                orchestrator = self._factory(session_key)
+                self._entries[session_key] = _PoolEntry(orchestrator, pinned=pin)
+
+        # Closing may stop proctoring etc., so do it outside the lock.
+        self._close_all(evicted)
+        if orchestrator is None:
+            raise PoolExhausted(
+                f"Interview capacity reached ({self.max_sessions} sessions)"
+            )
+        logger.info(f"Orchestrator created: session={session_key[:8]}, "
+                    f"live={len(self._entries)}")
+        return orchestrator, True
+
+    def get(self, session_key: str):
+        """Return the live orchestrator for ``session_key`` or None."""
+        with self._lock:
+            entry = self._entries.get(session_key)
+            if entry is None:
+                return None
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(session_key)
+            return entry.orchestrator
+
+    def release(self, session_key: str) -> None:
+        """Remove and close the orchestrator for ``session_key``."""
+        with self._lock:
+            entry = self._entries.pop(session_key, None)
+        if entry is not None:
+            self._close_all([(session_key, entry)])
+
+    def evict_idle(self) -> int:
+        """Evict every unpinned entry idle beyond the timeout."""
+        with self._lock:
+            evicted = self._pop_idle_locked()
+        self._close_all(evicted)
+        return len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pinned = sum(1 for e in self._entries.values() if e.pinned)
+            return {
+                'live_sessions': len(self._entries),
+                'pinned_sessions': pinned,
+                'max_sessions': self.max_sessions,
+                'idle_timeout': self.idle_timeout,
+                'released_total': self._released_total,
+            }
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _pop_idle_locked(self) -> list:
+        """Pop unpinned entries idle past the timeout (lock held)."""
+        cutoff = time.monotonic() - self.idle_timeout
+        stale = [
+            key for key, entry in self._entries.items()
+            if not entry.pinned and entry.last_used < cutoff
+        ]
+        return [(key, self._entries.pop(key)) for key in stale]
+
+    def _close_all(self, evicted: list) -> None:
+        for key, entry in evicted:
+            with self._lock:
+                self._released_total += 1
+            try:
+                entry.orchestrator.close()
+            except Exception as e:
+                logger.warning(f"Orchestrator close failed for {key[:8]}: {e}")
+            logger.info(f"Orchestrator released: session={key[:8]}")
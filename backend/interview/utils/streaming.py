@@ -0,0 +1,133 @@
+"""Async bridges for streaming ML output over the interview WebSocket.
+
+The ML layer produces sentence fragments from blocking generators
+(``LLMEngine.generate_stream``). ``iterate_in_thread`` drives such a
+generator on a worker thread and hands every item to the event loop the
+moment it is produced, so the consumer can forward it to the client
+instead of waiting for the whole reply.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+
+logger = logging.getLogger('interview')
+
+_END = object()
+
+
+class _ProducerError:
+    """Wraps an exception raised inside the producer thread."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+@dataclass
+class StreamMetrics:
+    """Latency bookkeeping for one streamed reply.
+
+    All timestamps come from ``time.perf_counter`` and are reported in
+    milliseconds relative to ``started_at``.
+    """
+
+    started_at: float = field(default_factory=time.perf_counter)
+    first_chunk_at: float | None = None
+    last_chunk_at: float | None = None
+    chunk_latencies_ms: list[float] = field(default_factory=list)
+    cancelled: bool = False
+
+    def mark_chunk(self) -> float:
+        """Record a chunk arrival and return ms since the previous one."""
+        now = time.perf_counter()
+        previous = self.last_chunk_at or self.started_at
+        latency_ms = (now - previous) * 1000
+        if self.first_chunk_at is None:
+            self.first_chunk_at = now
+        self.last_chunk_at = now
+        self.chunk_latencies_ms.append(latency_ms)
+        return latency_ms
+
+    @property
+    def time_to_first_chunk_ms(self) -> float | None:
+        if self.first_chunk_at is None:
+            return None
+        return (self.first_chunk_at - self.started_at) * 1000
+
+    def to_dict(self) -> dict:
+        latencies = self.chunk_latencies_ms
+        # The first latency is TTFC; inter-chunk gaps are the rest.
+        gaps = latencies[1:]
+        total_ms = (time.perf_counter() - self.started_at) * 1000
+        ttfc = self.time_to_first_chunk_ms
+        return {
+            'time_to_first_chunk_ms': round(ttfc, 1) if ttfc is not None else None,
+            'chunk_count': len(latencies),
+            'avg_chunk_latency_ms': round(sum(gaps) / len(gaps), 1) if gaps else None,
+            'max_chunk_latency_ms': round(max(gaps), 1) if gaps else None,
+            'total_ms': round(total_ms, 1),
+            'cancelled': self.cancelled,
+        }
+
+
+async def iterate_in_thread(factory, *args, **kwargs):
+    """Iterate a blocking generator from async code without buffering it.
+
+    ``factory(*args, **kwargs)`` is called on a worker thread and every
+    item it yields is pushed onto an ``asyncio.Queue`` via
+    ``call_soon_threadsafe``. If the awaiting task is cancelled (e.g. the
+    WebSocket disconnected) the producer is told to stop; it closes the
+    generator after the next item, which in turn releases the LLM lock and
+    the underlying HTTP stream.
+
+    Yields:
+        Items from the generator, in order, as soon as they are produced.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def _put(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # Event loop already closed — nobody is listening anymore.
+            stop.set()
+
+    def _produce():
+        gen = None
+        try:
+            gen = factory(*args, **kwargs)
+            for item in gen:
+                if stop.is_set():
+                    break
+                _put(item)
+        except BaseException as e:  # noqa: BLE001 — re-raised on the loop
+            _put(_ProducerError(e))
+        finally:
+            if gen is not None and hasattr(gen, 'close'):
+                try:
+                    gen.close()
+                except Exception as e:
+                    logger.debug(f"Stream generator close failed: {e}")
+            _put(_END)
+
+    producer = loop.run_in_executor(None, _produce)
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        if producer.done():
+            producer.exception()
+        else:
+            # Let the thread finish on its own; just silence its result.
+            producer.add_done_callback(lambda f: f.cancelled() or f.exception())
@@ -3,15 +3,18 @@ import logging
 import tempfile
 import os
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from django.http import FileResponse
+from django.http import HttpResponse
 
-from .apps import get_orchestrator
+from .apps import get_orchestrator, get_session_pool
 from .models import InterviewSession, ChatMessage
+from .session_pool import PoolExhausted
 from .serializers import (
     ResumeUploadSerializer,
     StartSessionSerializer,
@@ -45,15 +48,6 @@ def _extract_pdf_text(uploaded_file):
         return None
 
 
-def _save_uploaded_audio(uploaded_file):
-    """Save uploaded audio to a temp file and return the path."""
-    suffix = os.path.splitext(uploaded_file.name)[1] or '.wav'
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        for chunk in uploaded_file.chunks():
-            tmp.write(chunk)
-        return tmp.name
-
-
 def _get_active_session(user):
     """Get the active interview session for a user, or None."""
     return InterviewSession.objects.filter(
@@ -61,6 +55,40 @@ def _get_active_session(user):
     ).first()
 
 
+def _session_orchestrator(session):
+    """Return the pooled orchestrator for an interview session.
+
+    If the orchestrator was evicted since the last request (idle timeout,
+    worker restart), a fresh one is rebuilt from the persisted resume, JD
+    and chat log.
+    """
+    orch, created = get_session_pool().acquire(session.session_id)
+    if created:
+        if session.resume_text:
+            orch.load_resume_from_text(session.resume_text)
+        if session.jd_text:
+            orch.load_jd_from_text(session.jd_text)
+        orch.new_session(difficulty=session.difficulty)
+        history = [
+            {
+                "role": "assistant" if msg.role == 'ai' else msg.role,
+                "content": msg.content,
+            }
+            for msg in session.messages.all()
+            if msg.role in ('user', 'ai')
+        ]
+        if history:
+            orch.restore_history(history)
+    return orch
+
+
+def _capacity_response():
+    return Response(
+        {"error": "All interview slots are busy. Please try again shortly."},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
 # ── Health Check ─────────────────────────────────────────────────
 
 class HealthCheckView(APIView):
@@ -71,13 +99,27 @@ class HealthCheckView(APIView):
         try:
             orch = get_orchestrator()
             health = orch.health_check()
-            return Response(health, status=status.HTTP_200_OK)
+            health["session_pool"] = get_session_pool().stats()
         except Exception as e:
             return Response(
                 {"error": str(e), "detail": "ML orchestrator failed to initialize"},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
+        # Optional subsystems report independently; None = not started yet
+        for section, stats in (
+            ("embedding_batcher", orch.embedding_stats),
+            ("stt_service", orch.stt_stats),
+            ("tts_service", orch.tts_stats),
+            ("vision_service", orch.vision_stats),
+        ):
+            try:
+                health[section] = stats()
+            except Exception as e:
+                logger.warning(f"Health section {section} failed: {e}")
+                health[section] = {"error": str(e)}
+        return Response(health, status=status.HTTP_200_OK)
+
 
 # ── ATS Resume Analysis ─────────────────────────────────────────
 
@@ -136,40 +178,50 @@ class StartSessionView(APIView):
         difficulty = serializer.validated_data['difficulty']
         enable_proctoring = serializer.validated_data['enable_proctoring']
 
-        orch = get_orchestrator()
-
-        # Load documents if provided
-        resume_text = serializer.validated_data.get('resume_text')
-        jd_text = serializer.validated_data.get('jd_text')
-        if resume_text:
-            orch.load_resume_from_text(resume_text)
-        if jd_text:
-            orch.load_jd_from_text(jd_text)
-
-        # Create orchestrator session
-        orch.new_session(difficulty=difficulty)
-        orch.reset_chat()
-
-        # Start proctoring if requested
-        if enable_proctoring:
-            orch.start_proctoring()
-
-        # Create Django model
         session_id = secrets.token_hex(16)
-        session = InterviewSession.objects.create(
-            user=request.user,
-            session_id=session_id,
-            difficulty=difficulty,
-            enable_proctoring=enable_proctoring,
-        )
+        try:
+            orch, _ = get_session_pool().acquire(session_id)
+        except PoolExhausted:
+            return _capacity_response()
 
-        # Generate opening question
-        opening = orch.get_opening_question(difficulty=difficulty)
+        try:
+            # Load documents if provided
+            resume_text = serializer.validated_data.get('resume_text') or ''
+            jd_text = serializer.validated_data.get('jd_text') or ''
+            if resume_text:
+                orch.load_resume_from_text(resume_text)
+            if jd_text:
+                orch.load_jd_from_text(jd_text)
+
+            # Create orchestrator session
+            orch.new_session(difficulty=difficulty)
+            orch.reset_chat()
+
+            # Start proctoring if requested
+            if enable_proctoring:
+                orch.start_proctoring()
+
+            # Create Django model
+            session = InterviewSession.objects.create(
+                user=request.user,
+                session_id=session_id,
+                difficulty=difficulty,
+                enable_proctoring=enable_proctoring,
+                resume_text=resume_text,
+                jd_text=jd_text,
+            )
 
-        # Save AI opening message
-        ChatMessage.objects.create(
-            session=session, role='ai', content=opening
-        )
+            # Generate opening question
+            opening = orch.get_opening_question(difficulty=difficulty)
+
+            # Save AI opening message
+            ChatMessage.objects.create(
+                session=session, role='ai', content=opening
+            )
+        except Exception:
+            # Don't leak the pool slot when setup fails part-way
+            get_session_pool().release(session_id)
+            raise
 
         return Response(
             {
@@ -214,20 +266,19 @@ class ChatView(APIView):
         serializer = ChatInputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        orch = get_orchestrator()
+        try:
+            orch = _session_orchestrator(session)
+        except PoolExhausted:
+            return _capacity_response()
         user_text = serializer.validated_data.get('message', '')
 
         # If audio provided, transcribe first
         audio_file = serializer.validated_data.get('audio')
         transcription = None
         if audio_file:
-            audio_path = _save_uploaded_audio(audio_file)
-            try:
-                result = orch.transcribe_audio(audio_path)
-                transcription = result.get('text', '')
-                user_text = transcription
-            finally:
-                os.unlink(audio_path)
+            result = orch.transcribe_audio_bytes(audio_file.read())
+            transcription = result.get('text', '')
+            user_text = transcription
 
         if not user_text:
             return Response(
@@ -292,15 +343,10 @@ class EndSessionView(APIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        orch = get_orchestrator()
-
-        # Stop proctoring if active
-        proctoring_summary = None
-        if session.enable_proctoring:
-            try:
-                proctoring_summary = orch.stop_proctoring()
-            except Exception as e:
-                logger.warning(f"Proctoring stop failed: {e}")
+        try:
+            orch = _session_orchestrator(session)
+        except PoolExhausted:
+            return _capacity_response()
 
         # Build chat history for evaluator
         messages = session.messages.all()
@@ -309,13 +355,19 @@ class EndSessionView(APIView):
             for msg in messages
         ]
 
-        # Generate evaluation report
-        report = None
+        # Evaluation, speech analysis and proctoring shutdown run concurrently
         try:
-            report = orch.generate_report(history=history)
+            sections = dict(orch.generate_report_sections(
+                history=history, include_proctoring=session.enable_proctoring,
+            ))
         except Exception as e:
             logger.error(f"Report generation failed: {e}")
-            report = {"error": str(e)}
+            sections = {"evaluation": {"error": str(e)}}
+
+        report = sections.get("evaluation") or {"error": "No report generated"}
+        if sections.get("speech_analysis"):
+            report["sentiment_analysis"] = sections["speech_analysis"]
+        proctoring_summary = sections.get("proctoring")
 
         # Update session
         session.status = 'completed'
@@ -323,8 +375,8 @@ class EndSessionView(APIView):
         session.evaluation_report = report
         session.save()
 
-        # Reset orchestrator state
-        orch.reset_chat()
+        # Release the session's orchestrator
+        get_session_pool().release(session.session_id)
 
         response_data = {
             "session_id": session.session_id,
@@ -350,19 +402,18 @@ class TTSView(APIView):
         text = serializer.validated_data['text']
         orch = get_orchestrator()
 
-        audio_path = orch.synthesize_audio(text)
-        if not audio_path or not os.path.exists(audio_path):
+        result = orch.synthesize_audio_bytes(text)
+        if not result:
             return Response(
                 {"error": "TTS synthesis failed. Engine may not be available."},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
-        return FileResponse(
-            open(audio_path, 'rb'),
-            content_type='audio/wav',
-            as_attachment=True,
-            filename='tts_output.wav',
-        )
+        audio, codec = result
+        content_type = 'audio/mpeg' if codec == 'mp3' else 'audio/wav'
+        response = HttpResponse(audio, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="tts_output.{codec}"'
+        return response
 
 # ── Past Interviews ──────────────────────────────────────────────
 
@@ -387,8 +438,15 @@ class PastInterviewDetailView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, session_id):
+        # Finished sessions never change, so their serialized detail (chat log
+        # plus the full report) is cached instead of rebuilt on every view.
+        cache_key = f"interview_detail:{request.user.pk}:{session_id}"
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
+
         try:
-            session = InterviewSession.objects.get(
+            session = InterviewSession.objects.prefetch_related('messages').get(
                 user=request.user, 
                 session_id=session_id
             )
@@ -399,5 +457,7 @@ class PastInterviewDetailView(APIView):
             )
 
         # Use full serializer to include chat logs and evaluation report if desired
-        serializer = InterviewSessionSerializer(session)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        data = InterviewSessionSerializer(session).data
+        if session.status != 'active':
+            cache.set(cache_key, data, settings.INTERVIEW_DETAIL_CACHE_SECONDS)
+        return Response(data, status=status.HTTP_200_OK)
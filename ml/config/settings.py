@@ -23,10 +23,26 @@ N_GPU_LAYERS = -1 if _HAS_CUDA else 0
 
 STT_MODEL_SIZE = "small.en"
 STT_DEVICE = "cuda" if _HAS_CUDA else "cpu"
+SENTIMENT_MAX_TURN_SECONDS = 60  # per-answer audio kept in memory for the end-of-session analysis
+PERSIST_TURN_AUDIO = False  # also write CLI turn recordings to data/temp (off the hot path)
+STT_WORKERS = 2  # concurrent CPU decodes (CUDA always uses one)
+STT_STREAM_SAMPLE_RATE = 16000  # default rate of streamed PCM frames
+STT_VAD_ENERGY_THRESHOLD = 0.01  # frame RMS (of full scale) counted as speech
+STT_SEGMENT_SILENCE_MS = 600  # pause that closes a streaming segment
+STT_PARTIAL_INTERVAL_MS = 700  # new speech between partial decodes
+STT_MAX_SEGMENT_SECONDS = 15  # force-close long segments
 
 
 TTS_MODEL_NAME = "en_US-ryan-medium.onnx"
 TTS_MODEL_PATH = MODELS_DIR / "tts" / "en" / "en_US" / "ryan" / "medium" / TTS_MODEL_NAME
+TTS_BACKENDS = ("edge", "piper")  # fallback order; ("stub",) = offline stand-in for benchmarks
+TTS_MAX_CONCURRENT = 4  # sentences synthesized at once across all sessions
+TTS_TIMEOUT_SECONDS = 20  # per-backend deadline for one sentence
+TTS_MAX_BACKEND_FAILURES = 5  # consecutive failures before a backend is skipped
+TTS_BACKEND_RETRY_SECONDS = 60  # a skipped backend gets one trial request after this long
+TTS_CACHE_MEMORY_BYTES = 32 * 1024 * 1024  # synthesized utterances kept in RAM
+TTS_CACHE_DISK_BYTES = 256 * 1024 * 1024  # data/cache/tts; least recently used evicted first
+TTS_PREWARM_MAX_QUESTIONS = 200  # question-bank questions synthesized ahead per difficulty
 
 ENABLE_RAG = True
 ENABLE_PROCTORING = True
@@ -35,11 +51,24 @@ ENABLE_ATS = True
 
 JD_DIR = BASE_DIR / "data" / "job_descriptions"
 CHROMADB_DIR = MODELS_DIR / "chromadb"
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DEVICE = "cuda" if _HAS_CUDA else "cpu"
+EMBEDDING_BATCH_MAX_SIZE = 64  # texts per coalesced encode
+EMBEDDING_BATCH_MAX_WAIT_MS = 5  # how long a lone query waits for company
+EMBEDDING_CACHE_DTYPE = "float16"  # on-disk vector precision (float16 or float32)
+EMBEDDING_CACHE_MAX_ENTRIES = 50000  # per vector store, before compaction
+EMBEDDING_MEMORY_CACHE_SIZE = 4096  # hot in-process LRU entries
+JD_INDEX_CACHE_SIZE = 64  # distinct JDs kept embedded in memory
 EMOTION_MODEL_NAME = "ehcalabres/wav2vec2-lg-xlsr-en-speech-emotion-recognition"
 
 PROCTORING_FPS = 5
 PROCTORING_DISPLAY_FPS = 30
 VIOLATION_THRESHOLD_SECONDS = 2  
+PROCTORING_REMOTE_WORKERS = 2  # client-frame analyses at once across all sessions; extra frames are dropped
+PROCTORING_REMOTE_MAX_FPS = 5  # upper bound for the rate a client may negotiate
+PROCTORING_REMOTE_MAX_WIDTH = 640  # wider client frames are rejected before decoding; narrower ones above the negotiated width are downscaled
+PROCTORING_REMOTE_MAX_HEIGHT = 640  # taller client frames are rejected before decoding (allows portrait phones)
+PROCTORING_REMOTE_MAX_FRAME_BYTES = 512 * 1024  # larger uploads are rejected undecoded
 
 # --- Proctoring Enhancements ---
 ENABLE_OBJECT_DETECTION = True
@@ -48,9 +77,18 @@ ENABLE_EARPIECE_DETECTION = True
 YOLO_MODEL_NAME = "yolov8n.pt"
 YOLO_MODEL_PATH = MODELS_DIR / "yolo" / YOLO_MODEL_NAME
 YOLO_CONFIDENCE_THRESHOLD = 0.45
+YOLO_BACKEND = "torch"  # "onnx" / "openvino": CPU export created beside YOLO_MODEL_PATH on first use
+YOLO_BATCH_MAX_SIZE = 8  # frames per shared YOLO call across sessions
+YOLO_BATCH_MAX_WAIT_MS = 10  # how long a lone frame waits for frames from other sessions
 MOUTH_OPEN_THRESHOLD = 0.35
+PROCTORING_VIOLATIONS = ("user_left", "multiple_people")  # reported types; detectors feeding none of them are skipped
+PROCTORING_OBJECT_DETECTION_INTERVAL = 5  # analyzed frames between YOLO passes (sooner when the face count changes)
+PROCTORING_ANALYSIS_WIDTH = 640  # FaceMesh and YOLO run on a copy downscaled to this width
 RISK_WINDOW_SECONDS = 30
 RISK_ALERT_THRESHOLDS = {"info": 0.3, "warning": 0.6, "critical": 0.85}
+PROCTORING_TIMELINE_MAX_SEGMENTS = 2000  # violation runs kept per session; oldest dropped first
+PROCTORING_TIMELINE_MERGE_SECONDS = 10  # same-type violations closer than this extend one run
+PROCTORING_TIMELINE_REPORT_BUCKETS = 120  # report timeline merges runs into at most this many time buckets per type
 
 FILLER_WORDS = ["umm", "uh", "like", "you know", "so", "basically", "actually"]
 
@@ -62,6 +100,7 @@ VOICE_CLONE_SAMPLE = MODELS_DIR / "voice_samples" / "interviewer.wav"
 QUESTION_BANK_PATH = BASE_DIR / "data" / "datasets" / "question_bank.json"
 DATASETS_RAW_DIR = BASE_DIR / "data" / "datasets" / "raw"
 ENABLE_QUESTION_BANK = True
+ENABLE_QUESTION_BANK_MEMORY_INDEX = True  # serve retrieval from RAM instead of ChromaDB
 ENABLE_PER_QUESTION_EVAL = True
 
 # --- Voice AI Pipeline Enhancements ---
@@ -71,3 +110,5 @@ ENABLE_LOCAL_BARGE_IN = False  # Set to True if wearing headphones, False otherw
 SCORING_WEIGHT_TECHNICAL = 0.50
 SCORING_WEIGHT_CLARITY = 0.30
 SCORING_WEIGHT_COMMUNICATION = 0.20
+TURN_SCORE_WAIT_SECONDS = 30  # how long the final report waits for answers still being scored
+TURN_SCORE_MAX_IDLE_WAIT_SECONDS = 5  # a queued score waits at most this long for Ollama to go idle
@@ -24,17 +24,42 @@ Usage:
 
     # Evaluation
     report = api.generate_report()
+
+Concurrency:
+    Heavy, read-only models (Whisper, the sentence encoder, spaCy inside
+    ATSChecker, the emotion model) are loaded once per process and shared by
+    every orchestrator, as are JD indexes (keyed by JD content). Conversation
+    state (resume/JD text, LLM history, SessionState) lives on the instance,
+    so the backend keeps one lightweight orchestrator per interview session.
 """
-import json
 import logging
 import os
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from config import settings
 
 logger = logging.getLogger("IntrvAI")
 
+# ── Process-wide shared engines ───────────────────────────────────
+_shared_engines: dict[str, object] = {}
+_shared_lock = threading.Lock()
+
+
+def _get_shared(name: str, factory):
+    """Return the process-wide engine ``name``, building it on first use."""
+    engine = _shared_engines.get(name)
+    if engine is None:
+        with _shared_lock:
+            engine = _shared_engines.get(name)
+            if engine is None:
+                engine = factory()
+                _shared_engines[name] = engine
+    return engine
+
 
 class IntrvAIOrchestrator:
     """Unified API for all intrv.ai ML functionalities.
@@ -52,13 +77,17 @@ class IntrvAIOrchestrator:
     - Cache management
     """
 
-    def __init__(self, lazy_load: bool = True) -> None:
+    def __init__(self, lazy_load: bool = True,
+                 session_key: str | None = None) -> None:
         """Initialize orchestrator.
 
         Args:
             lazy_load: If True, engines are loaded on first use (faster startup).
                        If False, all engines load immediately.
+            session_key: Identifier of the interview session this instance
+                         serves.
         """
+        self._session_key = session_key
         self._interview_mode: str = "generic"
         self._interview_type: str = "technical"
         self._resume_text: str | None = None
@@ -74,6 +103,12 @@ class IntrvAIOrchestrator:
         self._proctoring = None
         self._sentiment = None
         self._session = None
+        # (int16 waveform, transcript) per spoken answer, for the report's speech analysis
+        self._turn_audio: list[tuple] = []
+        # Background per-answer scores (TurnScorer futures) and the question-bank
+        # entry behind the question currently being answered
+        self._turn_scores: list = []
+        self._question_context: dict | None = None
 
         if not lazy_load:
             self.load_documents()
@@ -160,10 +195,10 @@ class IntrvAIOrchestrator:
 
     @property
     def stt(self):
-        """Speech-to-Text engine (Whisper)."""
+        """Speech-to-Text service (shared, priority-queued Whisper)."""
         if self._stt_engine is None:
-            from src.ears.stt_engine import STTEngine
-            self._stt_engine = STTEngine()
+            from src.ears.stt_service import get_stt_service
+            self._stt_engine = get_stt_service()
         return self._stt_engine
 
     @property
@@ -182,13 +217,21 @@ class IntrvAIOrchestrator:
             self._rag_engine = RAGEngine()
         return self._rag_engine
 
+    @property
+    def question_bank(self):
+        """Question bank retriever (shared: the collection is read-only at runtime)."""
+        from src.brain.rag_engine import QuestionBankRAG
+        return _get_shared("question_bank", QuestionBankRAG)
+
     @property
     def ats(self):
         """ATS resume checker."""
         if self._ats_checker is None:
             from src.core.ats_checker import ATSChecker
-            llm_model = self.llm.llm if self._llm_engine else None
-            self._ats_checker = ATSChecker(llm_model=llm_model)
+            self._ats_checker = _get_shared("ats", ATSChecker)
+        # The Ollama client is stateless, so any session's client will do.
+        if self._ats_checker.llm_model is None and self._llm_engine:
+            self._ats_checker.llm_model = self._llm_engine.llm
         return self._ats_checker
 
     @property
@@ -196,10 +239,9 @@ class IntrvAIOrchestrator:
         """Post-interview evaluator."""
         if self._evaluator is None:
             from src.brain.evaluator import Evaluator
-            llm_model = self.llm.llm if self._llm_engine else None
-            self._evaluator = Evaluator(
-                model_path=settings.LLM_MODEL_PATH, 
-                llm_model=llm_model
+            self._evaluator = _get_shared(
+                "evaluator",
+                lambda: Evaluator(model_path=settings.LLM_MODEL_PATH),
             )
         return self._evaluator
 
@@ -216,7 +258,7 @@ class IntrvAIOrchestrator:
         """Sentiment & emotion analyzer."""
         if self._sentiment is None:
             from src.ears.sentiment_analyzer import SentimentAnalyzer
-            self._sentiment = SentimentAnalyzer()
+            self._sentiment = _get_shared("sentiment", SentimentAnalyzer)
         return self._sentiment
 
     @property
@@ -262,7 +304,7 @@ class IntrvAIOrchestrator:
         Returns:
             Full LLM response as string.
         """
-        chunks = list(self.llm.generate_stream(user_input, difficulty, question_context=question_context))
+        chunks = list(self.chat_stream(user_input, difficulty, question_context=question_context))
         return " ".join(chunks).strip()
 
     def chat_stream(self, user_input: str,
@@ -277,7 +319,60 @@ class IntrvAIOrchestrator:
         Yields:
             Sentence fragments as they are generated.
         """
-        yield from self.llm.generate_stream(user_input, difficulty, question_context=question_context)
+        answered = self._answered_question()
+        try:
+            yield from self.llm.generate_stream(user_input, difficulty, question_context=question_context)
+        finally:
+            self._score_turn(answered, user_input, question_context)
+
+    @property
+    def async_streaming_available(self) -> bool:
+        """Whether ``achat_stream`` can be used (async HTTP client installed)."""
+        return self.llm.supports_async
+
+    async def achat_stream(self, user_input: str,
+                           difficulty: str = "Medium",
+                           question_context: dict | None = None) -> AsyncGenerator[str, None]:
+        """Async variant of ``chat_stream`` for event-loop callers.
+
+        Args:
+            user_input: User's message text.
+            difficulty: Interview difficulty level.
+
+        Yields:
+            Sentence fragments as they are generated.
+        """
+        answered = self._answered_question()
+        try:
+            async for fragment in self.llm.agenerate_stream(
+                user_input, difficulty, question_context=question_context
+            ):
+                yield fragment
+        finally:
+            self._score_turn(answered, user_input, question_context)
+
+    def warm_next_turn(self, difficulty: str = "Medium") -> None:
+        """Prefill the LLM's prompt cache for the next reply while the candidate speaks."""
+        if self._llm_engine is not None:
+            self._llm_engine.warm_prefix(difficulty)
+
+    def _answered_question(self) -> str:
+        """The interviewer message the next user input answers ("" before the first)."""
+        if self._llm_engine is None:
+            return ""
+        for msg in reversed(self._llm_engine.history):
+            if msg["role"] == "assistant":
+                return msg["content"]
+        return ""
+
+    def _score_turn(self, question: str, answer: str, next_context: dict | None) -> None:
+        """Queue the answer for idle-priority scoring once the live reply is underway."""
+        if settings.ENABLE_PER_QUESTION_EVAL and question and answer.strip():
+            from src.brain.turn_scorer import get_turn_scorer
+            self._turn_scores.append(
+                get_turn_scorer().submit(question, answer, self._question_context)
+            )
+        self._question_context = next_context
 
     def get_opening_question(self, difficulty: str = "Medium") -> str:
         """Generate the first interview question based on resume/JD context.
@@ -298,23 +393,123 @@ class IntrvAIOrchestrator:
             self._llm_engine.history = []
             self._llm_engine._is_first_call = True
         self._session = None
+        self._turn_audio = []
+        for future in self._turn_scores:
+            future.cancel()
+        self._turn_scores = []
+        self._question_context = None
+
+    def restore_history(self, history: list[dict]) -> None:
+        """Seed the LLM history, e.g. when a session's orchestrator was evicted.
+
+        Args:
+            history: Messages with 'role' ('user'/'assistant') and 'content'.
+        """
+        self.llm.history = [dict(m) for m in history]
+        self.llm._is_first_call = not history
+
+    def close(self) -> None:
+        """Release per-session resources: proctoring, JD handle, history.
+
+        Shared engines are left untouched.
+        """
+        if self._proctoring is not None and self._proctoring.is_running:
+            try:
+                self._proctoring.stop()
+            except Exception as e:
+                logger.warning(f"Proctoring stop on close failed: {e}")
+        if self._rag_engine is not None:
+            self._rag_engine.drop_index()
+        self.reset_chat()
+        self._llm_engine = None
+        self._rag_engine = None
 
     # ── Speech-to-Text ────────────────────────────────────────────
 
     def transcribe_audio(self, audio_path: str,
-                         language: str | None = None) -> dict:
+                         language: str | None = None,
+                         background: bool = False) -> dict:
         """Transcribe an audio file to text.
 
         Args:
             audio_path: Path to audio file (wav, mp3, flac, m4a, ogg).
             language: Force language (None = auto-detect).
+            background: Queue behind live turns (e.g. post-session analysis).
 
         Returns:
             dict with 'text' and 'language' keys.
         """
-        text, lang = self.stt.transcribe(audio_path, language)
+        from src.ears.stt_service import PRIORITY_BACKGROUND, PRIORITY_LIVE
+        priority = PRIORITY_BACKGROUND if background else PRIORITY_LIVE
+        text, lang = self.stt.transcribe(audio_path, language, priority=priority)
         return {"text": text, "language": lang}
 
+    def transcribe_audio_bytes(self, data: bytes,
+                               language: str | None = None,
+                               background: bool = False) -> dict:
+        """Transcribe an encoded clip (webm/opus/wav/...) without touching disk.
+
+        Args:
+            data: Encoded audio bytes, e.g. a MediaRecorder blob.
+            language: Force language (None = auto-detect).
+            background: Queue behind live turns (e.g. post-session analysis).
+
+        Returns:
+            dict with 'text' and 'language' keys.
+        """
+        from src.ears.audio_io import decode_audio
+        from src.ears.stt_service import PRIORITY_BACKGROUND, PRIORITY_LIVE
+        try:
+            audio = decode_audio(data)
+        except ValueError as e:
+            logger.warning(f"Audio decode failed: {e}")
+            return {"text": "", "language": language or "en"}
+
+        priority = PRIORITY_BACKGROUND if background else PRIORITY_LIVE
+        text, lang = self.stt.transcribe_array(audio, language, vad_filter=True, priority=priority)
+        self._remember_turn_audio(audio, text)
+        return {"text": text, "language": lang}
+
+    def finish_stream_transcription(self, transcriber) -> dict:
+        """Finalize a ``create_stream_transcriber`` stream.
+
+        Returns:
+            dict with 'text' and 'language' keys.
+        """
+        text = transcriber.finish()
+        self._remember_turn_audio(transcriber.speech_audio(), text)
+        return {"text": text, "language": transcriber.language or "en"}
+
+    def _remember_turn_audio(self, audio, transcript: str) -> None:
+        """Keep a bounded int16 copy of an answer for the end-of-session speech analysis."""
+        if not (settings.ENABLE_SENTIMENT and transcript and len(audio)):
+            return
+        import numpy as np
+        clip = audio[: settings.SENTIMENT_MAX_TURN_SECONDS * 16000]
+        self._turn_audio.append(
+            ((np.clip(clip, -1.0, 1.0) * 32767).astype(np.int16), transcript)
+        )
+
+    def create_stream_transcriber(self, sample_rate: int = 16000,
+                                  language: str | None = None,
+                                  encoding: str = "pcm_s16le"):
+        """Start incremental transcription of a live audio stream.
+
+        Args:
+            sample_rate: Rate of the incoming mono audio.
+            language: Force language (None = auto-detect).
+            encoding: Frame encoding; only ``pcm_s16le`` is supported.
+
+        Returns:
+            A ``StreamingTranscriber`` sharing this process's Whisper model.
+
+        Raises:
+            ValueError: If the encoding is not supported.
+        """
+        from src.ears.streaming_stt import StreamingTranscriber
+        return StreamingTranscriber(self.stt, sample_rate=sample_rate,
+                                    language=language, encoding=encoding)
+
     # ── Text-to-Speech ────────────────────────────────────────────
 
     def speak(self, text: str) -> None:
@@ -330,10 +525,32 @@ class IntrvAIOrchestrator:
         Returns:
             Path to generated audio file, or None on failure.
         """
-        audio_path = self.tts._synthesize_edge(text)
-        if not audio_path:
-            audio_path = self.tts._synthesize_piper(text)
-        return audio_path
+        result = self.tts.synthesize_bytes(text)
+        if result is None:
+            return None
+        audio, codec = result
+        temp_dir = settings.BASE_DIR / "data" / "temp"
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        output_path = temp_dir / f"tts_{int(time.time() * 1000000)}.{codec}"
+        output_path.write_bytes(audio)
+        return str(output_path)
+
+    def synthesize_audio_bytes(self, text: str) -> tuple[bytes, str] | None:
+        """Synthesize text in memory.
+
+        Returns:
+            (encoded audio, codec ``"mp3"`` or ``"wav"``), or None on failure.
+        """
+        return self.tts.synthesize_bytes(text)
+
+    def create_speech_stream(self, stream_id: int = 0):
+        """Sentence-pipelined TTS for one reply, sent as binary frames.
+
+        Feed it the ``chat_stream`` fragments as they arrive and forward
+        ``frames()`` to the client; see ``src.voice.tts_stream``.
+        """
+        from src.voice.tts_stream import SpeechStream
+        return SpeechStream(self.tts.synthesize_bytes, stream_id)
 
     # ── RAG ───────────────────────────────────────────────────────
 
@@ -359,14 +576,74 @@ class IntrvAIOrchestrator:
     def generate_report(self, history: list[dict] | None = None) -> dict:
         """Generate a post-interview evaluation report.
 
+        Answers scored in the background during the session are reduced
+        into the report; only a short summary needs the LLM at the end.
+
         Args:
             history: Chat history to evaluate (uses current if None).
 
         Returns:
             dict with score, mistakes, suggestions, domain_rating, swot_analysis.
         """
+        from src.brain.turn_scorer import collect_scores
         chat_history = history or self.get_chat_history()
-        return self.evaluator.generate_report(chat_history)
+        scores = collect_scores(self._turn_scores, settings.TURN_SCORE_WAIT_SECONDS)
+        return self.evaluator.generate_report(chat_history, per_question_scores=scores or None)
+
+    def analyze_speech(self) -> dict | None:
+        """Batched emotion + prosody analysis over this session's spoken answers.
+
+        Returns:
+            The report's ``sentiment_analysis`` section, or None without audio.
+        """
+        if not self._turn_audio:
+            return None
+        from src.ears.sentiment_analyzer import summarize_session
+        audios = [pcm.astype("float32") / 32768.0 for pcm, _ in self._turn_audio]
+        transcripts = [text for _, text in self._turn_audio]
+        return summarize_session(self.sentiment.analyze_batch(audios, transcripts))
+
+    def generate_report_sections(self, history: list[dict] | None = None,
+                                 include_proctoring: bool = False) -> Generator[tuple[str, dict], None, None]:
+        """Build the end-of-session report sections concurrently.
+
+        The LLM evaluation, the batched speech analysis and (optionally) the
+        proctoring summary run in parallel. Each section is yielded as soon
+        as it is ready, so callers can show partial results while the slow
+        LLM evaluation is still running.
+
+        Args:
+            history: Chat history to evaluate (uses current if None).
+            include_proctoring: Stop proctoring and include its summary.
+
+        Yields:
+            (section, data) pairs: ``evaluation``, ``speech_analysis`` and
+            ``proctoring``. A failed section yields ``{"error": "..."}``.
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        chat_history = history or self.get_chat_history()
+        jobs = {"evaluation": lambda: self.generate_report(chat_history)}
+        if self._turn_audio:
+            jobs["speech_analysis"] = self.analyze_speech
+        if include_proctoring:
+            jobs["proctoring"] = self.stop_proctoring
+
+        executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="report")
+        try:
+            futures = {executor.submit(job): name for name, job in jobs.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(f"Report section '{name}' failed: {e}")
+                    data = {"error": str(e)}
+                if data is not None:
+                    yield name, data
+        finally:
+            # Don't block a consumer that stopped early on the LLM call.
+            executor.shutdown(wait=False, cancel_futures=True)
 
     # ── Proctoring ────────────────────────────────────────────────
 
@@ -378,6 +655,39 @@ class IntrvAIOrchestrator:
             logger.error(f"Proctoring failed to start: {e}")
             return False
 
+    def start_remote_proctoring(self, fps: float | None = None,
+                                max_width: int | None = None) -> dict | None:
+        """Start proctoring on frames uploaded by the client (headless server).
+
+        Args:
+            fps: Frame rate the client proposes.
+            max_width: Widest frame the client proposes to send.
+
+        Returns:
+            The negotiated config (``fps``, ``max_width``, ``formats``,
+            ``max_frame_bytes``), or None if proctoring could not start.
+        """
+        try:
+            from src.eyes.remote_proctoring import RemoteProctoringMonitor
+            self._proctoring = RemoteProctoringMonitor(fps=fps, max_width=max_width)
+            self._proctoring.start()
+            return self._proctoring.config
+        except Exception as e:
+            logger.error(f"Remote proctoring failed to start: {e}")
+            self._proctoring = None
+            return None
+
+    def submit_proctoring_frame(self, data: bytes):
+        """Hand one client frame to remote proctoring (non-blocking).
+
+        Returns:
+            Future resolving to a ``proctoring_update`` payload or None, or
+            None if the frame was dropped (rate, backlog, or not started).
+        """
+        if self._proctoring is None or not hasattr(self._proctoring, "submit_frame"):
+            return None
+        return self._proctoring.submit_frame(data)
+
     def stop_proctoring(self) -> dict:
         """Stop proctoring and return violation summary."""
         summary = self.proctoring.get_violations_summary()
@@ -386,8 +696,8 @@ class IntrvAIOrchestrator:
 
     # ── Sentiment Analysis ────────────────────────────────────────
 
-    def analyze_sentiment(self, audio_path: str) -> dict:
-        """Analyze emotion from audio file.
+    def analyze_sentiment(self, audio_path) -> dict:
+        """Analyze emotion from an audio file path or decoded 16 kHz waveform.
 
         Returns:
             dict with 'emotion' and 'confidence' keys.
@@ -459,6 +769,31 @@ class IntrvAIOrchestrator:
         from src.core.cache_manager import get_cache_manager
         get_cache_manager().clear_cache()
 
+    # The *_stats methods below only report services that are already running.
+    # They never import or build one, so health checks stay cheap and an
+    # unavailable optional subsystem can't fail them. None = not started.
+
+    @staticmethod
+    def _running_service_stats(module_name: str, singleton: str) -> dict | None:
+        service = getattr(sys.modules.get(module_name), singleton, None)
+        return service.stats() if service is not None else None
+
+    def embedding_stats(self) -> dict | None:
+        """Occupancy counters of the shared embedding batcher."""
+        return self._running_service_stats("src.core.embedding_batcher", "_global_batcher")
+
+    def stt_stats(self) -> dict | None:
+        """Queue depth, latency and real-time factor of the shared STT service."""
+        return self._running_service_stats("src.ears.stt_service", "_global_stt_service")
+
+    def tts_stats(self) -> dict | None:
+        """Concurrency, backend health and latency of the shared TTS service."""
+        return self._running_service_stats("src.voice.tts_service", "_global_tts_service")
+
+    def vision_stats(self) -> dict | None:
+        """Batch occupancy and inference time of the shared YOLO service."""
+        return self._running_service_stats("src.eyes.vision_service", "_global_service")
+
     # ── Full Interview Flow (convenience) ─────────────────────────
 
     def run_interactive_interview(self) -> None:
@@ -476,20 +811,13 @@ class IntrvAIOrchestrator:
         """Index the question bank from question_bank.json into ChromaDB.
 
         Returns:
-            dict with 'count' of indexed questions and 'status'.
+            dict with 'status', 'count' and the 'sync' counters (added/updated/removed).
         """
-        from src.brain.rag_engine import QuestionBankRAG
-
-        qb = QuestionBankRAG()
-
-        if not settings.QUESTION_BANK_PATH.exists():
+        qb = self.question_bank
+        result = qb.ensure_indexed(force=True)
+        if result["status"] == "missing":
             return {"status": "error", "message": "question_bank.json not found. Run ingest_datasets.py first."}
-
-        with open(settings.QUESTION_BANK_PATH, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
-
-        count = qb.index_questions(questions)
-        return {"status": "ok", "count": count}
+        return {"status": "ok", "count": result["count"], "sync": qb.last_sync}
 
     def get_question_from_bank(
         self,
@@ -511,9 +839,7 @@ class IntrvAIOrchestrator:
         Returns:
             List of question dicts with answer and metadata.
         """
-        from src.brain.rag_engine import QuestionBankRAG
-
-        qb = QuestionBankRAG()
+        qb = self.question_bank
         if not qb.is_indexed:
             return []
 
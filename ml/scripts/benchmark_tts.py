@@ -0,0 +1,65 @@
+"""Benchmark TTS synthesis: one sentence at a time, pipelined, and cached.
+
+Runs offline against the stand-in backend by default:
+
+    python scripts/benchmark_tts.py --sentences 8 --latency 0.4
+    python scripts/benchmark_tts.py --backend edge      # real edge-tts (online)
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.voice.tts_cache import TTSCache
+from src.voice.tts_service import BACKENDS, StubTTSBackend, TTSService
+
+SENTENCE = "Can you walk me through how you would design a rate limiter for a public API?"
+
+
+def run(service: TTSService, sentences: list[str], pipelined: bool) -> tuple[float, float]:
+    """Return (time to first audio, total time) in seconds."""
+    started = time.perf_counter()
+    first = None
+    if pipelined:
+        futures = [service.submit(s) for s in sentences]
+        for future in futures:
+            future.result()
+            first = first or time.perf_counter() - started
+    else:
+        for sentence in sentences:
+            service.synthesize(sentence)
+            first = first or time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="stub")
+    parser.add_argument("--sentences", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.4, help="stub backend latency (s)")
+    args = parser.parse_args()
+
+    backend = StubTTSBackend(latency=args.latency) if args.backend == "stub" else BACKENDS[args.backend]()
+    cache_dir = tempfile.TemporaryDirectory()
+    service = TTSService([backend], max_concurrent=args.concurrency, cache=TTSCache(cache_dir.name))
+
+    try:
+        # Distinct texts per uncached run; the last run repeats the pipelined texts
+        for label, run_id, pipelined in (("sequential", "a", False), ("pipelined", "b", True),
+                                         ("cached", "b", True)):
+            sentences = [f"{SENTENCE} ({run_id}{i})" for i in range(args.sentences)]
+            first, total = run(service, sentences, pipelined)
+            print(f"{label:>10}: first audio {first * 1000:7.1f} ms, "
+                  f"{args.sentences} sentences {total * 1000:8.1f} ms")
+        print(service.stats())
+    finally:
+        service.close()
+        cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
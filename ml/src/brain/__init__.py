@@ -2,11 +2,14 @@ from src.brain.evaluator import Evaluator
 from src.brain.llm_engine import LLMEngine
 from src.brain.prompt_manager import PromptManager
 from src.brain.rag_engine import RAGEngine, QuestionBankRAG
+from src.brain.question_index import QuestionBankIndex
 from src.brain.skill_extractor import SkillExtractor
 from src.brain.question_evaluator import QuestionEvaluator
+from src.brain.turn_scorer import TurnScorer
 from src.brain.question_bank_schema import InterviewQuestion
 
 __all__ = [
     "Evaluator", "LLMEngine", "PromptManager", "RAGEngine",
-    "QuestionBankRAG", "SkillExtractor", "QuestionEvaluator", "InterviewQuestion",
+    "QuestionBankRAG", "QuestionBankIndex", "SkillExtractor", "QuestionEvaluator", "TurnScorer",
+    "InterviewQuestion",
 ]
@@ -66,17 +66,28 @@ class DecisionEngine:
         self._adjust_difficulty(0.5)
         return self._build_result(self.ACTION_LLM_DRILL_DOWN, current_difficulty, "Detailed answer requires follow-up.")
 
+    def reachable_difficulties(self) -> set[str]:
+        """Difficulty labels the next ``evaluate`` call can return (for prefetching)."""
+        return {
+            self._difficulty_label(max(1, min(5, self.current_difficulty_score + delta)))
+            for delta in (-1, -0.5, 0.5, 1)
+        }
+
+    @staticmethod
+    def _difficulty_label(score: float) -> str:
+        if score <= 2:
+            return "Easy"
+        if score >= 4:
+            return "Hard"
+        return "Medium"
+
     def _adjust_difficulty(self, diff_delta: float):
         """Clamp difficulty between 1 and 5."""
         self.current_difficulty_score = max(1, min(5, self.current_difficulty_score + diff_delta))
 
     def _build_result(self, action: str, old_diff_str: str, reason: str) -> Dict[str, Any]:
         """Maps internal difficulty score back to Easy/Medium/Hard string."""
-        new_diff_str = "Medium"
-        if self.current_difficulty_score <= 2:
-            new_diff_str = "Easy"
-        elif self.current_difficulty_score >= 4:
-            new_diff_str = "Hard"
+        new_diff_str = self._difficulty_label(self.current_difficulty_score)
 
         if old_diff_str != new_diff_str:
             logger.info(f"DecisionEngine: Difficulty scaling from {old_diff_str} to {new_diff_str}!")
@@ -7,15 +7,16 @@ from config import settings
 logger = logging.getLogger("Evaluator")
 
 MAX_EVAL_TOKENS = 800
+MAX_SUMMARY_TOKENS = 500
 EVAL_TEMPERATURE = 0.1
 
 
 class Evaluator:
     """Generates post-interview evaluation reports using the LLM (Ollama)."""
 
-    def __init__(self, model_path: str | Path = None, llm_model: Llama | None = None) -> None:
+    def __init__(self, model_path: str | Path = None, llm_model=None) -> None:
         self.model_path = model_path
-        self.llm = None
+        self.llm = llm_model
     
     def _ensure_llm_loaded(self) -> None:
         if self.llm is None:
@@ -26,6 +27,12 @@ class Evaluator:
                         per_question_scores: list[dict] | None = None) -> dict:
         """Generate a structured evaluation report from interview history.
 
+        With ``per_question_scores`` (scored in the background during the
+        interview) the report is reduced from those scores plus one short
+        summarization call over a compact per-turn digest, so its cost does
+        not grow with interview length. Without them the whole transcript
+        is evaluated in one prompt.
+
         Args:
             history: Full conversation history.
             per_question_scores: Optional per-question evaluations from QuestionEvaluator.
@@ -47,6 +54,9 @@ class Evaluator:
 
         self._ensure_llm_loaded()
 
+        if per_question_scores:
+            return self._report_from_turn_scores(history, per_question_scores)
+
         prompt = (
             "You are a strict Senior Technical Hiring Manager. Analyze the interview transcript below.\n"
             "RULES:\n"
@@ -77,18 +87,7 @@ class Evaluator:
                 response_format={"type": "json_object"},
                 num_ctx=4096,  # Evaluator needs more context for full transcript
             )
-            report = json.loads(output['choices'][0]['message']['content'])
-
-            # Attach per-question scores if available
-            if per_question_scores:
-                report["per_question_evaluations"] = per_question_scores
-
-                # Aggregate per-question metrics
-                from src.brain.question_evaluator import QuestionEvaluator
-                aggregator = QuestionEvaluator()
-                report["question_bank_summary"] = aggregator.aggregate_scores(per_question_scores)
-
-            return report
+            return json.loads(output['choices'][0]['message']['content'])
 
         except Exception as e:
             logger.error(f"Failed to generate evaluation: {e}", exc_info=True)
@@ -104,4 +103,63 @@ class Evaluator:
                     "strengths": ["N/A"], "weaknesses": ["N/A"]
                 },
                 "ai_insight": "Could not generate insights due to a system error."
-            }
\ No newline at end of file
+            }
+
+    def _report_from_turn_scores(self, history: list[dict],
+                                 per_question_scores: list[dict]) -> dict:
+        """Reduce per-turn scores into the report; the LLM only writes the prose."""
+        from src.brain.question_evaluator import QuestionEvaluator
+        from src.brain.turn_scorer import turn_digest
+
+        summary = QuestionEvaluator().aggregate_scores(per_question_scores)
+        suggestions = [s["suggested_improvement"] for s in per_question_scores
+                       if s.get("suggested_improvement")]
+        report = {
+            "score": round(summary["overall_score"] * 10),
+            "mistakes": summary.get("all_weaknesses", [])[:5],
+            "suggestions": list(dict.fromkeys(suggestions))[:5],
+            "domain_rating": {
+                "HR": -1,
+                "Technical": round(summary.get("avg_technical", 0) * 10),
+                "Communication": round(summary.get("avg_communication", 0) * 10),
+            },
+            "swot_analysis": {
+                "strengths": summary.get("all_strengths", [])[:5],
+                "weaknesses": summary.get("all_weaknesses", [])[:5],
+            },
+            "ai_insight": "",
+            "per_question_evaluations": per_question_scores,
+            "question_bank_summary": summary,
+        }
+
+        prompt = (
+            "You are a strict Senior Technical Hiring Manager. Below are per-question scores "
+            "(0-10) and feedback from an interview that was already graded answer by answer.\n"
+            "Summarize them. Do not re-grade and do not invent anything that is not in the notes. "
+            "Rate a domain -1 if it was not covered. Output strictly valid JSON.\n\n"
+            f"Overall: {summary['overall_score']}/10 over {summary['total_questions']} scored answers.\n"
+            "Per-question notes:\n" + "\n".join(turn_digest(history, per_question_scores)) + "\n\n"
+            "Output Format:\n"
+            "{\n"
+            '  "mistakes": [list of specific errors],\n'
+            '  "suggestions": [list of actionable advice],\n'
+            '  "domain_rating": {"HR": int 0-100, "Technical": int 0-100, "Communication": int 0-100},\n'
+            '  "swot_analysis": {"strengths": [3-5 items], "weaknesses": [3-5 items]},\n'
+            '  "ai_insight": "A personalized 1-2 sentence insightful quote summarizing their performance"\n'
+            "}"
+        )
+        try:
+            output = self.llm.create_chat_completion(
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=MAX_SUMMARY_TOKENS,
+                temperature=EVAL_TEMPERATURE,
+                response_format={"type": "json_object"},
+            )
+            prose = json.loads(output['choices'][0]['message']['content'])
+            for key in ("mistakes", "suggestions", "domain_rating", "swot_analysis", "ai_insight"):
+                if prose.get(key):
+                    report[key] = prose[key]
+        except Exception as e:
+            # The scores are already computed; ship them without the prose.
+            logger.error(f"Report summarization failed, using score aggregates: {e}")
+        return report
@@ -0,0 +1,198 @@
+"""Content-addressed, shared JD chunk indexes.
+
+A job description is chunked and embedded once per process, keyed by a
+hash of its text, and kept in a bounded LRU. When one role is posted to
+hundreds of applicants, every session gets the same immutable
+``JDIndex``. Concurrent first requests for the same JD wait on a single
+build instead of embedding it again.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger("JDIndex")
+
+DEFAULT_CHUNK_SIZE = 150
+DEFAULT_CHUNK_OVERLAP = 50
+MAX_MEMOIZED_QUERIES = 32
+
+
+def jd_hash(jd_text: str) -> str:
+    """Content key for a JD (insensitive to whitespace differences)."""
+    normalized = " ".join(jd_text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def chunk_text(text: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               overlap: int = DEFAULT_CHUNK_OVERLAP) -> list[str]:
+    """Split text into overlapping word-level chunks for better retrieval."""
+    if not text:
+        return []
+
+    words = text.split()
+    chunks = []
+    step = max(chunk_size - overlap, 1)
+
+    for i in range(0, len(words), step):
+        chunk = " ".join(words[i:i + chunk_size])
+        if chunk.strip():
+            chunks.append(chunk)
+        if i + chunk_size >= len(words):
+            break
+
+    return chunks
+
+
+class JDIndex:
+    """Immutable chunk texts plus their L2-normalised embedding matrix."""
+
+    def __init__(self, key: str, chunks: list[str], embeddings) -> None:
+        self.key = key
+        self.chunks = tuple(chunks)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if self.chunks:
+            matrix = matrix.reshape(len(self.chunks), -1)
+        else:  # e.g. whitespace-only text from an empty PDF extraction
+            matrix = matrix.reshape(0, matrix.shape[-1] if matrix.ndim == 2 else 0)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+        self.matrix.setflags(write=False)  # shared between sessions
+        self._memo: dict = {}
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def memoized(self, key, compute):
+        """Return ``compute()`` cached on this index under ``key``.
+
+        Results derived only from the JD (e.g. the system-prompt context)
+        are then computed once per JD, not once per session.
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = compute()
+        if len(self._memo) >= MAX_MEMOIZED_QUERIES:
+            self._memo.clear()
+        self._memo[key] = value
+        return value
+
+    def search(self, query_embedding, top_k: int) -> list[str]:
+        """Return up to ``top_k`` chunks by cosine similarity, best first."""
+        if not self.chunks or top_k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        scores = self.matrix @ query
+        k = min(top_k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.chunks[i] for i in top]
+
+    def search_many(self, query_embeddings, top_k: int) -> list[list[int]]:
+        """Rank chunks for several queries with one matrix product.
+
+        Returns:
+            Per query, up to ``top_k`` chunk positions, best first.
+        """
+        if not self.chunks or top_k <= 0:
+            return []
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.matrix.shape[1])
+        scores = queries @ self.matrix.T
+        k = min(top_k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+        return np.take_along_axis(top, order, axis=1).tolist()
+
+
+class JDIndexCache:
+    """Thread-safe LRU of ``JDIndex`` objects keyed by JD content hash."""
+
+    def __init__(self, max_entries: int = settings.JD_INDEX_CACHE_SIZE) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, JDIndex] = OrderedDict()
+        self._building: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._builds = 0
+
+    def get_or_build(self, jd_text: str, encoder) -> JDIndex:
+        """Return the shared index for ``jd_text``, embedding it only once.
+
+        Args:
+            jd_text: Job description text.
+            encoder: Object with a ``SentenceTransformer``-style ``encode``.
+        """
+        key = jd_hash(jd_text)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return index
+            pending = self._building.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._building[key] = Future()
+
+        if not owner:
+            # Someone else is embedding this JD right now; share their result.
+            with self._lock:
+                self._hits += 1
+            return pending.result()
+
+        try:
+            chunks = chunk_text(jd_text)
+            embeddings = encoder.encode(chunks) if chunks else np.empty((0, 0))
+            index = JDIndex(key, chunks, embeddings)
+        except BaseException as e:
+            with self._lock:
+                self._building.pop(key, None)
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._building.pop(key, None)
+            self._entries[key] = index
+            self._builds += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        pending.set_result(index)
+        logger.info(f"Indexed JD {key[:12]}: {len(index)} chunks "
+                    f"(size={DEFAULT_CHUNK_SIZE}, overlap={DEFAULT_CHUNK_OVERLAP})")
+        return index
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "builds": self._builds,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_global_jd_cache: Optional[JDIndexCache] = None
+_jd_cache_lock = threading.Lock()
+
+
+def get_jd_index_cache() -> JDIndexCache:
+    """Return singleton JDIndexCache instance."""
+    global _global_jd_cache
+    if _global_jd_cache is None:
+        with _jd_cache_lock:
+            if _global_jd_cache is None:
+                _global_jd_cache = JDIndexCache()
+    return _global_jd_cache
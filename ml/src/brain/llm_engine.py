@@ -1,13 +1,22 @@
+import asyncio
+import atexit
 import json
 import logging
+import random
 import time
 import threading
-from typing import Generator
+from typing import AsyncGenerator, AsyncIterator, Generator
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+except ImportError:  # async client is optional; the sync client still works
+    aiohttp = None
 
 from config import settings
-from src.brain.prompt_manager import PromptManager
+from src.brain.prompt_manager import MAX_HISTORY_MESSAGES, PromptManager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("LLMEngine")
@@ -15,12 +24,197 @@ logger = logging.getLogger("LLMEngine")
 MAX_RESPONSE_TOKENS = 150
 LLM_TEMPERATURE = 0.7
 STREAM_TIMEOUT_SECONDS = 120  # Gemma4 thinks before responding — give it time
+STOP_SEQUENCES = ["User:", "[INSTRUCTION]", "STRICT RULES:", "CANDIDATE'S RESUME", "QUESTION FOCUS:", "ABSOLUTE RULE:"]
+FALLBACK_REPLY = "I apologize, I'm having technical difficulties. Could you please repeat that?"
 
 OLLAMA_BASE_URL = "http://localhost:11434"
 OLLAMA_CHAT_URL = f"{OLLAMA_BASE_URL}/api/chat"
+OLLAMA_TAGS_URL = f"{OLLAMA_BASE_URL}/api/tags"
 OLLAMA_MODEL = "gemma4"
 OLLAMA_CAREER_MODEL = "career-llama3:latest"  # Meta-Llama-3-8B for career features
 
+# ── HTTP transport ────────────────────────────────────────────────
+REQUEST_TIMEOUT_SECONDS = 600
+HTTP_POOL_SIZE = 16  # keep-alive connections to Ollama per process
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5  # seconds; doubles per attempt, with jitter
+RETRY_MAX_DELAY = 8.0
+MODEL_PROBE_TTL_SECONDS = 300  # how long an /api/tags result is trusted
+
+_http_session: requests.Session | None = None
+_http_session_lock = threading.Lock()
+_model_probe: tuple[float, list[str]] | None = None
+_model_probe_lock = threading.Lock()
+# event loop → aiohttp.ClientSession. Held strongly (a session references its
+# loop, so weak keys would never be released) and closed at interpreter exit.
+_aiohttp_sessions: dict = {}
+_aiohttp_sessions_lock = threading.Lock()
+_live_generations = 0
+_live_generations_cond = threading.Condition()
+
+
+def _get_http_session() -> requests.Session:
+    """Process-wide keep-alive session, so calls reuse pooled TCP connections."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=HTTP_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def _get_aiohttp_session():
+    """Keep-alive aiohttp session for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _aiohttp_sessions_lock:
+        session = _aiohttp_sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS, sock_connect=10),
+            )
+            _aiohttp_sessions[loop] = session
+    return session
+
+
+def close_aiohttp_sessions() -> None:
+    """Close every pooled aiohttp session. Registered with ``atexit``.
+
+    Must not be called from a running event loop's thread.
+    """
+    with _aiohttp_sessions_lock:
+        sessions = list(_aiohttp_sessions.items())
+        _aiohttp_sessions.clear()
+    for loop, session in sessions:
+        if session.closed:
+            continue
+        try:
+            if loop.is_closed():
+                # Its transports died with the loop; closing just marks the
+                # session and connector closed, which any loop can do.
+                asyncio.run(session.close())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+            else:
+                loop.run_until_complete(session.close())
+        except Exception as e:
+            logger.debug(f"Failed to close aiohttp session: {e}")
+
+
+atexit.register(close_aiohttp_sessions)
+
+
+class live_generation:
+    """Marks a candidate-facing generation as in flight (see ``wait_until_idle``).
+
+    Usable with both ``with`` and ``async with``; entering never blocks.
+    """
+
+    def __enter__(self):
+        global _live_generations
+        with _live_generations_cond:
+            _live_generations += 1
+
+    def __exit__(self, *exc_info):
+        global _live_generations
+        with _live_generations_cond:
+            _live_generations -= 1
+            _live_generations_cond.notify_all()
+
+    async def __aenter__(self):
+        self.__enter__()
+
+    async def __aexit__(self, *exc_info):
+        self.__exit__(*exc_info)
+
+
+def wait_until_idle(timeout: float | None = None) -> bool:
+    """Block until no live generation is streaming from Ollama.
+
+    Background LLM work (per-turn scoring) calls this before each request
+    so it only uses Ollama in the gaps between interview turns.
+
+    Returns:
+        True if idle, False if ``timeout`` expired first.
+    """
+    with _live_generations_cond:
+        return _live_generations_cond.wait_for(lambda: _live_generations == 0, timeout)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with equal jitter for retry ``attempt`` (0-based)."""
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _free_cuda_cache() -> None:
+    # Ollama 500s here are usually VRAM contention with our own torch models.
+    try:
+        import torch; torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+
+def list_models(force: bool = False) -> list[str]:
+    """Return the models Ollama serves, probing /api/tags at most every TTL.
+
+    Raises:
+        requests.RequestException: If Ollama is unreachable (never cached).
+    """
+    global _model_probe
+    probe = _model_probe
+    if not force and probe and time.monotonic() - probe[0] < MODEL_PROBE_TTL_SECONDS:
+        return probe[1]
+    with _model_probe_lock:
+        probe = _model_probe
+        if not force and probe and time.monotonic() - probe[0] < MODEL_PROBE_TTL_SECONDS:
+            return probe[1]
+        r = _get_http_session().get(OLLAMA_TAGS_URL, timeout=5)
+        r.raise_for_status()
+        models = [m["name"] for m in r.json().get("models", [])]
+        _model_probe = (time.monotonic(), models)
+        logger.info(f"Connected to Ollama. Available models: {models}")
+        return models
+
+
+def _build_payload(model_name, messages, max_tokens, temperature, stop, stream,
+                   response_format, keep_alive, num_ctx) -> dict:
+    payload = {
+        "model": model_name,
+        "messages": messages,
+        "stream": stream,
+        "think": False,  # Disable Gemma4 thinking — interview needs fast direct answers
+        "options": {
+            "num_predict": max_tokens,
+            "temperature": temperature,
+            "num_ctx": num_ctx,
+        }
+    }
+
+    if stop:
+        payload["options"]["stop"] = stop
+    if response_format:
+        payload["format"] = "json"
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def _to_completion(data: dict) -> dict:
+    """Convert an Ollama chat response to the llama.cpp-compatible format."""
+    return {
+        "choices": [{
+            "message": {
+                "role": data.get("message", {}).get("role", "assistant"),
+                "content": data.get("message", {}).get("content", ""),
+            }
+        }]
+    }
+
 
 class OllamaClient:
     """Thin wrapper around Ollama's REST API, compatible with the llama.cpp interface."""
@@ -28,12 +222,9 @@ class OllamaClient:
     def __init__(self, model_name: str = OLLAMA_MODEL) -> None:
         self.model_name = model_name
 
-        # Verify connectivity
+        # Verify connectivity (cached across clients for MODEL_PROBE_TTL_SECONDS)
         try:
-            r = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
-            r.raise_for_status()
-            models = [m["name"] for m in r.json().get("models", [])]
-            logger.info(f"Connected to Ollama. Available models: {models}")
+            models = list_models()
             if not any(model_name in m for m in models):
                 logger.warning(f"Model '{model_name}' not found in Ollama. Available: {models}")
         except Exception as e:
@@ -43,42 +234,33 @@ class OllamaClient:
     def create_chat_completion(self, messages, max_tokens=MAX_RESPONSE_TOKENS,
                                temperature=LLM_TEMPERATURE, stop=None, stream=False,
                                response_format=None, keep_alive=None, **kwargs):
-        payload = {
-            "model": self.model_name,
-            "messages": messages,
-            "stream": stream,
-            "think": False,  # Disable Gemma4 thinking — interview needs fast direct answers
-            "options": {
-                "num_predict": max_tokens,
-                "temperature": temperature,
-                "num_ctx": kwargs.get("num_ctx", 2048),
-            }
-        }
-
-        if stop:
-            payload["options"]["stop"] = stop
-        if response_format:
-            payload["format"] = "json"
-        if keep_alive is not None:
-            payload["keep_alive"] = keep_alive
+        payload = _build_payload(
+            self.model_name, messages, max_tokens, temperature, stop, stream,
+            response_format, keep_alive, kwargs.get("num_ctx", 2048),
+        )
 
         if stream:
             return self._stream_generator(payload)
         else:
             return self._sync_request(payload)
 
+    @staticmethod
+    def _retry_wait(attempt: int, reason: str) -> None:
+        delay = backoff_delay(attempt)
+        logger.warning(f"Ollama {reason} on attempt {attempt+1}, retrying in {delay:.1f}s...")
+        _free_cuda_cache()
+        time.sleep(delay)
+
     def _stream_generator(self, payload):
         """Yield streaming chunks with retry logic for VRAM contention 500s."""
-        for attempt in range(3):
+        session = _get_http_session()
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
             try:
-                with requests.post(OLLAMA_CHAT_URL, json=payload, stream=True, timeout=600) as response:
-                    if response.status_code == 500 and attempt < 2:
-                        logger.warning(f"Ollama stream 500 on attempt {attempt+1}, retrying in 2s...")
-                        try:
-                            import torch; torch.cuda.empty_cache()
-                        except Exception:
-                            pass
-                        time.sleep(2.0)
+                with session.post(OLLAMA_CHAT_URL, json=payload, stream=True,
+                                  timeout=REQUEST_TIMEOUT_SECONDS) as response:
+                    if response.status_code == 500 and not last_attempt:
+                        self._retry_wait(attempt, "stream 500")
                         continue
                     response.raise_for_status()
                     for line in response.iter_lines():
@@ -93,77 +275,47 @@ class OllamaClient:
                                 continue
                     return  # success — stop retry loop
             except requests.exceptions.HTTPError as e:
-                if e.response is not None and e.response.status_code == 500 and attempt < 2:
-                    logger.warning(f"Ollama stream HTTPError 500 on attempt {attempt+1}, retrying in 2s...")
-                    try:
-                        import torch; torch.cuda.empty_cache()
-                    except Exception:
-                        pass
-                    time.sleep(2.0)
+                if e.response is not None and e.response.status_code == 500 and not last_attempt:
+                    self._retry_wait(attempt, "stream HTTPError 500")
                     continue
                 logger.error(f"Ollama streaming request failed: {e}")
                 raise
             except requests.exceptions.RequestException as e:
                 logger.error(f"Ollama streaming request connection error: {e}")
-                if attempt < 2:
-                    try:
-                        import torch; torch.cuda.empty_cache()
-                    except Exception:
-                        pass
-                    time.sleep(2.0)
+                if not last_attempt:
+                    self._retry_wait(attempt, "stream connection error")
                     continue
                 raise
 
     def _sync_request(self, payload):
         """Non-streaming request with retry logic for VRAM contention 500s."""
-        for attempt in range(3):
+        session = _get_http_session()
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
             try:
-                r = requests.post(OLLAMA_CHAT_URL, json=payload, timeout=600)
-                if r.status_code == 500 and attempt < 2:
-                    logger.warning(f"Ollama sync 500 on attempt {attempt+1}, retrying in 2s...")
-                    try:
-                        import torch; torch.cuda.empty_cache()
-                    except Exception:
-                        pass
-                    time.sleep(2.0)
+                r = session.post(OLLAMA_CHAT_URL, json=payload, timeout=REQUEST_TIMEOUT_SECONDS)
+                if r.status_code == 500 and not last_attempt:
+                    self._retry_wait(attempt, "sync 500")
                     continue
                 r.raise_for_status()
-                data = r.json()
-                # Convert Ollama response to llama.cpp-compatible format
-                return {
-                    "choices": [{
-                        "message": {
-                            "role": data.get("message", {}).get("role", "assistant"),
-                            "content": data.get("message", {}).get("content", ""),
-                        }
-                    }]
-                }
+                return _to_completion(r.json())
             except requests.exceptions.HTTPError as e:
-                if e.response is not None and e.response.status_code == 500 and attempt < 2:
-                    logger.warning(f"Ollama sync HTTPError 500 on attempt {attempt+1}, retrying in 2s...")
-                    try:
-                        import torch; torch.cuda.empty_cache()
-                    except Exception:
-                        pass
-                    time.sleep(2.0)
+                if e.response is not None and e.response.status_code == 500 and not last_attempt:
+                    self._retry_wait(attempt, "sync HTTPError 500")
                     continue
                 logger.error(f"Ollama sync request failed: {e}")
                 raise
             except requests.exceptions.RequestException as e:
                 logger.error(f"Ollama sync connection error: {e}")
-                if attempt < 2:
-                    try:
-                        import torch; torch.cuda.empty_cache()
-                    except Exception:
-                        pass
-                    time.sleep(2.0)
+                if not last_attempt:
+                    self._retry_wait(attempt, "sync connection error")
                     continue
                 raise
 
     def unload_model(self):
         """Unload model from VRAM."""
         try:
-            requests.post(OLLAMA_CHAT_URL, json={
+            _get_http_session().post(OLLAMA_CHAT_URL, json={
                 "model": self.model_name,
                 "messages": [],
                 "keep_alive": 0
@@ -173,6 +325,92 @@ class OllamaClient:
             logger.warning(f"Failed to unload model: {e}")
 
 
+class AsyncOllamaClient:
+    """asyncio-native Ollama client over a pooled keep-alive aiohttp session.
+
+    Streaming reads the response line by line only as fast as the caller
+    iterates, so a slow WebSocket consumer applies TCP backpressure to
+    Ollama instead of buffering the reply in memory, and no worker thread
+    is held for the duration of the stream.
+    """
+
+    def __init__(self, model_name: str = OLLAMA_MODEL) -> None:
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for AsyncOllamaClient")
+        self.model_name = model_name
+
+    async def astream_chat(self, messages, max_tokens=MAX_RESPONSE_TOKENS,
+                           temperature=LLM_TEMPERATURE, stop=None,
+                           keep_alive=None, **kwargs) -> AsyncIterator[dict]:
+        """Yield Ollama stream chunks (``{"message": {...}, "done": bool}``)."""
+        payload = _build_payload(
+            self.model_name, messages, max_tokens, temperature, stop, True,
+            None, keep_alive, kwargs.get("num_ctx", 2048),
+        )
+        session = _get_aiohttp_session()
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
+            yielded = False
+            try:
+                async with session.post(OLLAMA_CHAT_URL, json=payload) as response:
+                    if response.status == 500 and not last_attempt:
+                        await self._retry_wait(attempt, "async stream 500")
+                        continue
+                    response.raise_for_status()
+                    async for line in response.content:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            chunk = json.loads(line)
+                        except json.JSONDecodeError:
+                            logger.warning(f"Failed to decode streaming chunk: {line}")
+                            continue
+                        yielded = True
+                        yield chunk
+                        if chunk.get("done"):
+                            return
+                    return
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Never retry once output has reached the caller — it would
+                # be duplicated.
+                if yielded or last_attempt:
+                    logger.error(f"Ollama async stream failed: {e}")
+                    raise
+                await self._retry_wait(attempt, f"async stream error ({e})")
+
+    async def achat(self, messages, max_tokens=MAX_RESPONSE_TOKENS,
+                    temperature=LLM_TEMPERATURE, stop=None, response_format=None,
+                    keep_alive=None, **kwargs) -> dict:
+        """Non-streaming chat; returns the llama.cpp-compatible completion dict."""
+        payload = _build_payload(
+            self.model_name, messages, max_tokens, temperature, stop, False,
+            response_format, keep_alive, kwargs.get("num_ctx", 2048),
+        )
+        session = _get_aiohttp_session()
+        for attempt in range(MAX_ATTEMPTS):
+            last_attempt = attempt == MAX_ATTEMPTS - 1
+            try:
+                async with session.post(OLLAMA_CHAT_URL, json=payload) as response:
+                    if response.status == 500 and not last_attempt:
+                        await self._retry_wait(attempt, "async 500")
+                        continue
+                    response.raise_for_status()
+                    return _to_completion(await response.json())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    logger.error(f"Ollama async request failed: {e}")
+                    raise
+                await self._retry_wait(attempt, f"async error ({e})")
+
+    @staticmethod
+    async def _retry_wait(attempt: int, reason: str) -> None:
+        delay = backoff_delay(attempt)
+        logger.warning(f"Ollama {reason} on attempt {attempt+1}, retrying in {delay:.1f}s...")
+        _free_cuda_cache()
+        await asyncio.sleep(delay)
+
+
 class LLMEngine:
     """LLM inference engine using Ollama backend."""
 
@@ -194,6 +432,8 @@ class LLMEngine:
         self.history = []
         self._is_first_call = True
         self.lock = threading.Lock()
+        self._async_model: AsyncOllamaClient | None = None
+        self._async_lock: asyncio.Lock | None = None
 
 
     def generate_stream(self, user_input: str, difficulty: str = "Medium", question_context: dict | None = None) -> Generator[str, None, None]:
@@ -204,18 +444,18 @@ class LLMEngine:
 
         logger.info(f"Generating LLM response for: {user_input[:50]}...")
         
-        with self.lock:
+        with self.lock, live_generation():
             try:
                 stream = self.model.create_chat_completion(
                     messages=messages,
                     max_tokens=MAX_RESPONSE_TOKENS,
                     temperature=LLM_TEMPERATURE,
-                    stop=["User:", "[INSTRUCTION]", "STRICT RULES:", "CANDIDATE'S RESUME", "QUESTION FOCUS:", "ABSOLUTE RULE:"],
+                    stop=STOP_SEQUENCES,
                     stream=True,
                 )
             except Exception as e:
                 logger.error(f"LLM generation error: {e}")
-                yield "I apologize, I'm having technical difficulties. Could you please repeat that?"
+                yield FALLBACK_REPLY
                 return
 
             buffer = ""
@@ -247,6 +487,15 @@ class LLMEngine:
                         if any(x in token for x in [".", "?", "!", "\n"]):
                             yield buffer
                             buffer = ""
+            except GeneratorExit:
+                # Consumer stopped reading (e.g. WebSocket closed). Close the
+                # HTTP stream so Ollama aborts generation, and keep the partial
+                # reply so history stays user/assistant aligned.
+                logger.info(f"LLM stream closed by consumer after {token_count} tokens")
+                if hasattr(stream, "close"):
+                    stream.close()
+                self.history.append({"role": "assistant", "content": full_response})
+                raise
             except Exception as e:
                 logger.error(f"Stream error: {e}", exc_info=True)
                 if buffer:
@@ -260,6 +509,92 @@ class LLMEngine:
 
         self.history.append({"role": "assistant", "content": full_response})
 
+    def warm_prefix(self, difficulty: str = "Medium") -> None:
+        """Prefill Ollama's KV cache with the next turn's prompt prefix.
+
+        The next request is the system prompt, the history window and the
+        candidate's answer. Evaluating everything but the answer while they
+        are still speaking leaves only the answer's tokens to prefill.
+        """
+        # The window the next request will keep once the answer is appended
+        window = list(self.history)[-(MAX_HISTORY_MESSAGES - 1):]
+        messages = self.prompt_manager.build_messages(window, difficulty)
+        try:
+            self.model.create_chat_completion(messages=messages, max_tokens=1, temperature=0.0)
+        except Exception as e:
+            logger.warning(f"KV cache warm-up failed: {e}")
+
+    @property
+    def supports_async(self) -> bool:
+        """Whether ``agenerate_stream`` can run (aiohttp installed)."""
+        return aiohttp is not None
+
+    async def agenerate_stream(self, user_input: str, difficulty: str = "Medium",
+                               question_context: dict | None = None) -> AsyncGenerator[str, None]:
+        """asyncio counterpart of ``generate_stream``.
+
+        Tokens are read from Ollama only as fast as the caller consumes
+        fragments, and no thread is parked on the HTTP stream.
+        """
+        if self._async_model is None:
+            self._async_model = AsyncOllamaClient(model_name=self.model.model_name)
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+
+        async with self._async_lock, live_generation():
+            self.history.append({"role": "user", "content": user_input})
+            messages = self.prompt_manager.build_messages(self.history, difficulty, question_context=question_context)
+            logger.info(f"Generating LLM response (async) for: {user_input[:50]}...")
+
+            buffer = ""
+            full_response = ""
+            token_count = 0
+            stream_start = time.time()
+            apply_timeout = not self._is_first_call
+            self._is_first_call = False
+
+            stream = self._async_model.astream_chat(
+                messages=messages,
+                max_tokens=MAX_RESPONSE_TOKENS,
+                temperature=LLM_TEMPERATURE,
+                stop=STOP_SEQUENCES,
+            )
+            try:
+                async for chunk in stream:
+                    if apply_timeout and time.time() - stream_start > STREAM_TIMEOUT_SECONDS:
+                        logger.warning(f"LLM stream timed out after {STREAM_TIMEOUT_SECONDS}s")
+                        break
+
+                    token = chunk.get("message", {}).get("content")
+                    if not token:
+                        continue
+                    buffer += token
+                    full_response += token
+                    token_count += 1
+
+                    if any(x in token for x in [".", "?", "!", "\n"]):
+                        yield buffer
+                        buffer = ""
+            except (GeneratorExit, asyncio.CancelledError):
+                # Consumer went away; keep history user/assistant aligned.
+                logger.info(f"LLM stream closed by consumer after {token_count} tokens")
+                self.history.append({"role": "assistant", "content": full_response})
+                raise
+            except Exception as e:
+                logger.error(f"Stream error: {e}", exc_info=True)
+                if not full_response:
+                    buffer = FALLBACK_REPLY
+            finally:
+                await stream.aclose()
+
+            logger.info(f"Generated {token_count} tokens, {len(full_response)} characters")
+            # Record what the candidate hears: the fallback when nothing streamed.
+            # Recorded before the last yield so a consumer closing there
+            # still leaves history aligned.
+            self.history.append({"role": "assistant", "content": full_response or buffer})
+            if buffer:
+                yield buffer
+
     def shutdown(self):
         """Unload memory before exiting."""
         self.model.unload_model()
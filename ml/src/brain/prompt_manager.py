@@ -1,5 +1,15 @@
 import re
 
+# Retrieved together (one batched query) to build the JD section of the prompt
+JD_CONTEXT_QUERIES = (
+    "technical skills and technologies required",
+    "required experience and qualifications",
+    "key responsibilities and duties",
+    "education and certifications",
+    "team and project details",
+)
+MAX_HISTORY_MESSAGES = 10  # conversation window sent with each request
+
 
 class PromptManager:
     """Manages system prompts, difficulty presets, and injection-safe message construction."""
@@ -138,25 +148,8 @@ class PromptManager:
         """Query RAG engine for comprehensive JD context."""
         if not self.rag_engine:
             return ""
-        
-        queries = [
-            "technical skills and technologies required",
-            "required experience and qualifications",
-            "key responsibilities and duties",
-            "education and certifications",
-            "team and project details",
-        ]
-        contexts = []
-        seen = set()
-        
-        for query in queries:
-            results = self.rag_engine.query_jd(query, top_k=2)
-            for chunk in results:
-                chunk_key = chunk[:100]
-                if chunk_key not in seen:
-                    seen.add(chunk_key)
-                    contexts.append(chunk)
-        
+
+        contexts = self.rag_engine.query_jd_multi(JD_CONTEXT_QUERIES, top_k=2)
         return "\n".join(contexts[:6]) if contexts else ""
 
     def get_opening_prompt(self, difficulty: str = "Medium") -> str:
@@ -219,7 +212,9 @@ class PromptManager:
 
         if history:
             sanitized_history = []
-            for msg in history[-10:]:
+            for msg in history[-MAX_HISTORY_MESSAGES:]:
+                role = msg["role"]
+                content = self._sanitize_text(msg["content"]) if role == "user" else msg["content"]
                 sanitized_msg = {
                     "role": role,
                     "content": content
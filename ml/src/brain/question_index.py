@@ -0,0 +1,153 @@
+"""In-process vector index over the static interview question bank.
+
+The question bank only changes when it is re-ingested, so the retrieval
+hot path doesn't need a database round-trip. ``QuestionBankIndex`` keeps:
+
+- an L2-normalised float32 matrix (cosine similarity = one mat-vec product)
+- a boolean mask per category and per difficulty value
+- metadata already decoded from JSON, one record per row
+
+Filters and already-asked exclusions are applied as masks *before*
+ranking, so a query never over-fetches, and top-k is an
+``np.argpartition`` over the surviving scores.
+"""
+import hashlib
+import json
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger("QuestionBankIndex")
+
+MAX_ANSWER_CHARS = 1500
+
+
+def question_id(question_text: str) -> str:
+    """Stable id derived from the question text (whitespace/case-insensitive)."""
+    normalized = " ".join(question_text.lower().split())
+    return "qb_" + hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def question_record(q: dict) -> dict:
+    """Normalise a question-bank entry into the shape retrieval returns."""
+    return {
+        "question": q.get("question", ""),
+        "answer": q.get("answer", "")[:MAX_ANSWER_CHARS],
+        "category": q.get("category", "general_technical"),
+        "difficulty": q.get("difficulty", "medium"),
+        "tags": list(q.get("tags", [])),
+        "evaluation_points": list(q.get("evaluation_points", [])),
+        "source": q.get("source", "unknown"),
+    }
+
+
+class QuestionBankIndex:
+    """Exact cosine top-k over the question bank with metadata masks."""
+
+    FILTER_FIELDS = ("category", "difficulty")
+
+    def __init__(self, ids: list[str], embeddings, records: list[dict]) -> None:
+        """
+        Args:
+            ids: Question ids (same ids the ChromaDB collection uses).
+            embeddings: (n, dim) array of question embeddings.
+            records: Decoded metadata per row (see ``question_record``).
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(ids) or len(ids) != len(records):
+            raise ValueError("ids, embeddings and records must have matching lengths")
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+        self.ids = list(ids)
+        self.records = records
+        self._positions = {qid: i for i, qid in enumerate(self.ids)}
+
+        self._masks: dict[tuple[str, str], np.ndarray] = {}
+        for field in self.FILTER_FIELDS:
+            values = np.array([r.get(field, "") for r in records], dtype=object)
+            for value in set(values.tolist()):
+                self._masks[(field, value)] = values == value
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ── Builders ──────────────────────────────────────────────────
+
+    @classmethod
+    def from_collection(cls, collection) -> "QuestionBankIndex":
+        """Build from an indexed ChromaDB collection, reusing its embeddings."""
+        start = time.perf_counter()
+        data = collection.get(include=["embeddings", "documents", "metadatas"])
+        records = []
+        for doc, meta in zip(data["documents"], data["metadatas"]):
+            meta = meta or {}
+            records.append({
+                "question": doc,
+                "answer": meta.get("answer", ""),
+                "category": meta.get("category", "general_technical"),
+                "difficulty": meta.get("difficulty", "medium"),
+                "tags": json.loads(meta.get("tags", "[]")),
+                "evaluation_points": json.loads(meta.get("evaluation_points", "[]")),
+                "source": meta.get("source", "unknown"),
+            })
+        index = cls(data["ids"], data["embeddings"], records)
+        logger.info(f"Question index built from ChromaDB: {len(index)} questions "
+                    f"in {(time.perf_counter() - start) * 1000:.0f}ms")
+        return index
+
+    # ── Retrieval ─────────────────────────────────────────────────
+
+    def search(
+        self,
+        query_embedding,
+        top_k: int = 5,
+        category: str | None = None,
+        difficulty: str | None = None,
+        exclude_ids: list[str] | None = None,
+    ) -> list[dict]:
+        """Rank questions by cosine similarity to ``query_embedding``.
+
+        Returns:
+            Up to ``top_k`` dicts shaped like ``QuestionBankRAG.retrieve_questions``
+            output, with ``distance`` = 1 - cosine similarity.
+        """
+        if not self.ids or top_k <= 0:
+            return []
+
+        allowed = np.ones(len(self.ids), dtype=bool)
+        for field, value in (("category", category), ("difficulty", difficulty)):
+            if value:
+                mask = self._masks.get((field, value))
+                if mask is None:
+                    return []
+                allowed &= mask
+        for qid in exclude_ids or ():
+            pos = self._positions.get(qid)
+            if pos is not None:
+                allowed[pos] = False
+
+        candidates = int(allowed.sum())
+        if candidates == 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        scores = self.matrix @ query
+        scores[~allowed] = -np.inf
+
+        k = min(top_k, candidates)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                "id": self.ids[i],
+                **self.records[i],
+                "distance": float(1.0 - scores[i]),
+            }
+            for i in top
+        ]
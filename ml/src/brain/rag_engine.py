@@ -1,112 +1,116 @@
 """Retrieval-Augmented Generation engine using ChromaDB.
 
 Contains two engines:
-- RAGEngine: Original JD-context retrieval (unchanged)
+- RAGEngine: JD-context retrieval over shared, content-addressed JD indexes
 - QuestionBankRAG: Interview question bank retrieval with metadata filtering
 """
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from pathlib import Path
 from typing import Optional
 
 import chromadb
-from sentence_transformers import SentenceTransformer
 
 from config import settings
+from src.brain.jd_index import JDIndex, chunk_text, get_jd_index_cache
+from src.brain.question_index import QuestionBankIndex, question_id, question_record
 
 logger = logging.getLogger("RAGEngine")
 
-DEFAULT_CHUNK_SIZE = 150
-DEFAULT_CHUNK_OVERLAP = 50
 DEFAULT_TOP_K = 5
+QUESTION_BANK_MANIFEST_PATH = settings.CHROMADB_DIR / "question_bank_manifest.json"
+QUESTION_BANK_MANIFEST_VERSION = 2  # bump when the id scheme or metadata layout changes
+
+_question_bank_lock = threading.Lock()
+
+
+def _metadata_hash(metadata: dict) -> str:
+    return hashlib.sha256(
+        json.dumps(metadata, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
 
 
 class RAGEngine:
-    """Retrieval-Augmented Generation engine using ChromaDB for JD context."""
+    """Per-session, read-only handle onto a shared JD index.
 
-    def __init__(self, jd_text: str | None = None) -> None:
-        self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    The chunk embeddings live in the process-wide ``JDIndexCache``, keyed
+    by JD content, so sessions that use the same JD share one index and
+    never reset each other's data.
+    """
 
-        settings.CHROMADB_DIR.mkdir(parents=True, exist_ok=True)
-        self.client = chromadb.PersistentClient(path=str(settings.CHROMADB_DIR))
-        self.collection = self.client.get_or_create_collection(name="job_context")
+    def __init__(self, jd_text: str | None = None, embedding_model=None) -> None:
+        """
+        Args:
+            jd_text: JD to attach immediately.
+            embedding_model: Encoder to use. Defaults to the process-wide
+                             batching service over the shared model.
+        """
+        # Imported here: src.core's package init imports InterviewManager,
+        # which imports this module
+        from src.core.embedding_batcher import get_embedding_batcher
+        self.embedding_model = embedding_model or get_embedding_batcher()
+        self.index: JDIndex | None = None
 
-        # Always reindex when JD text is provided (ensures fresh data)
         if jd_text:
-            self.reset_index()
-            self._index_jd(jd_text)
+            self.index_jd(jd_text)
 
-    def _index_jd(self, jd_text: str) -> None:
-        """Chunk and embed JD text into ChromaDB with overlap."""
-        chunks = self._chunk_text(jd_text, chunk_size=DEFAULT_CHUNK_SIZE, overlap=DEFAULT_CHUNK_OVERLAP)
-        if not chunks:
-            return
-
-        embeddings = self.embedding_model.encode(chunks).tolist()
-        ids = [f"chunk_{i}" for i in range(len(chunks))]
+    @property
+    def chunk_count(self) -> int:
+        return len(self.index) if self.index is not None else 0
 
-        self.collection.add(embeddings=embeddings, documents=chunks, ids=ids)
-        logger.info(f"Indexed {len(chunks)} JD chunks into ChromaDB (size={DEFAULT_CHUNK_SIZE}, overlap={DEFAULT_CHUNK_OVERLAP})")
+    def index_jd(self, jd_text: str) -> None:
+        """Point this handle at the (possibly already built) index for ``jd_text``."""
+        self.index = get_jd_index_cache().get_or_build(jd_text, self.embedding_model)
 
     def _chunk_text(self, text: str, chunk_size: int = 150, overlap: int = 50) -> list[str]:
         """Split text into overlapping word-level chunks for better retrieval."""
-        if not text:
-            return []
-
-        words = text.split()
-        chunks = []
-        step = max(chunk_size - overlap, 1)
-
-        for i in range(0, len(words), step):
-            chunk = " ".join(words[i:i + chunk_size])
-            if chunk.strip():
-                chunks.append(chunk)
-            if i + chunk_size >= len(words):
-                break
-
-        return chunks
+        return chunk_text(text, chunk_size=chunk_size, overlap=overlap)
 
     def query_jd(self, query_term: str, top_k: int = DEFAULT_TOP_K) -> list[str]:
         """Query JD context for relevant chunks."""
-        if self.collection.count() == 0:
+        if not self.chunk_count:
             return []
 
-        query_embedding = self.embedding_model.encode([query_term]).tolist()
-
-        results = self.collection.query(
-            query_embeddings=query_embedding,
-            n_results=min(top_k, self.collection.count())
-        )
-
-        if results and results['documents']:
-            return results['documents'][0]
-        return []
+        query_embedding = self.embedding_model.encode(query_term)
+        return self.index.search(query_embedding, top_k=top_k)
 
     def query_jd_multi(self, queries: list[str], top_k: int = 3) -> list[str]:
-        """Query with multiple terms and return deduplicated results."""
-        if self.collection.count() == 0:
+        """Query with multiple terms and return deduplicated results.
+
+        All queries are encoded in one forward pass and ranked with one
+        matrix product. The result is memoized on the shared index, so
+        repeated context queries for the same JD cost nothing.
+        """
+        if not self.chunk_count or not queries:
             return []
 
-        all_results = []
-        seen = set()
+        index = self.index
+        queries = tuple(queries)
 
-        for query in queries:
-            results = self.query_jd(query, top_k=top_k)
-            for chunk in results:
-                chunk_key = chunk[:80]
-                if chunk_key not in seen:
-                    seen.add(chunk_key)
-                    all_results.append(chunk)
+        def _search() -> tuple[str, ...]:
+            embeddings = self.embedding_model.encode(list(queries))
+            seen = set()
+            ordered = []
+            for positions in index.search_many(embeddings, top_k=top_k):
+                for pos in positions:
+                    if pos not in seen:
+                        seen.add(pos)
+                        ordered.append(index.chunks[pos])
+            return tuple(ordered)
 
-        return all_results
+        return list(index.memoized(("multi", queries, top_k), _search))
 
     def reset_index(self) -> None:
-        """Delete and recreate the JD collection."""
-        try:
-            self.client.delete_collection(name="job_context")
-        except (ValueError, Exception):
-            pass
-        self.collection = self.client.get_or_create_collection(name="job_context")
-        logger.info("Reset job_context collection")
+        """Detach from the current JD. The shared index stays cached for others."""
+        self.index = None
+
+    def drop_index(self) -> None:
+        """Release this session's handle (session teardown)."""
+        self.index = None
 
 
 # ══════════════════════════════════════════════════════════════════
@@ -117,11 +121,19 @@ class QuestionBankRAG:
     """Retrieves interview questions from the curated question bank.
 
     Supports filtering by category, difficulty, and candidate skills.
-    Uses a separate ChromaDB collection from the JD engine.
+    Uses a separate ChromaDB collection from the JD engine. With
+    ENABLE_QUESTION_BANK_MEMORY_INDEX, retrieval is served from an
+    in-process ``QuestionBankIndex`` built once from that collection.
     """
 
-    def __init__(self) -> None:
-        self.embedding_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+    def __init__(self, embedding_model=None) -> None:
+        # Imported here: src.core's package init imports InterviewManager,
+        # which imports this module
+        from src.core.embedding_batcher import get_embedding_batcher
+        self.embedding_model = embedding_model or get_embedding_batcher()
+        self._memory_index: QuestionBankIndex | None = None
+        self._memory_index_lock = threading.Lock()
+        self.last_sync: dict = {}
 
         settings.CHROMADB_DIR.mkdir(parents=True, exist_ok=True)
         self.client = chromadb.PersistentClient(path=str(settings.CHROMADB_DIR))
@@ -145,22 +157,141 @@ class QuestionBankRAG:
 
     @property
     def is_indexed(self) -> bool:
-        return self._indexed and self.collection.count() > 0
+        """Whether the bank has questions, without a ChromaDB round trip.
+
+        Checked on every interview turn, so it reads the in-memory index
+        or the flag kept current by ``index_questions``.
+        """
+        if self._memory_index is not None:
+            return len(self._memory_index) > 0
+        return self._indexed
 
     def index_questions(self, questions: list[dict], batch_size: int = 100) -> int:
-        """Index the question bank into ChromaDB with metadata.
+        """Sync the question bank into ChromaDB, embedding only what changed.
+
+        Ids are content hashes of the question text, so reordering
+        question_bank.json keeps every id (and ``asked_question_ids``) valid.
+        New questions are embedded and added, questions whose metadata
+        changed are updated in place (same text, so same embedding), and
+        questions no longer in the bank are deleted.
 
         Args:
             questions: List of dicts matching InterviewQuestion schema.
-            batch_size: Number of questions to embed per batch.
+            batch_size: Number of questions per ChromaDB/encode call.
 
         Returns:
-            Number of questions indexed.
+            Number of questions in the index after the sync.
         """
         if not questions:
             return 0
 
-        # Reset collection for fresh index
+        manifest = self._read_manifest()
+        if manifest and manifest.get("embedding_model") != settings.EMBEDDING_MODEL_NAME:
+            logger.info("Embedding model changed since last index; rebuilding question bank")
+            self._recreate_collection()
+
+        desired: dict[str, tuple[dict, dict]] = {}
+        for q in questions:
+            q_text = q.get("question", "")
+            if not q_text or len(q_text.strip()) < 10:
+                continue
+            qid = question_id(q_text)
+            if qid in desired:
+                continue  # duplicate question text; keep the first entry
+            record = question_record(q)
+            metadata = {
+                "answer": record["answer"],
+                "category": record["category"],
+                "difficulty": record["difficulty"],
+                "tags": json.dumps(record["tags"]),
+                "company": q.get("company", "generic"),
+                "evaluation_points": json.dumps(record["evaluation_points"]),
+                "source": record["source"],
+            }
+            metadata["content_hash"] = _metadata_hash(metadata)
+            desired[qid] = (record, metadata)
+
+        existing = self.collection.get(include=["metadatas"])
+        current = {
+            qid: (meta or {}).get("content_hash")
+            for qid, meta in zip(existing["ids"], existing["metadatas"])
+        }
+
+        added = [qid for qid in desired if qid not in current]
+        updated = [qid for qid in desired
+                   if qid in current and current[qid] != desired[qid][1]["content_hash"]]
+        removed = [qid for qid in current if qid not in desired]
+
+        for i in range(0, len(removed), batch_size):
+            self.collection.delete(ids=removed[i:i + batch_size])
+
+        for i in range(0, len(updated), batch_size):
+            ids = updated[i:i + batch_size]
+            self.collection.update(
+                ids=ids,
+                metadatas=[desired[qid][1] for qid in ids],
+            )
+
+        for i in range(0, len(added), batch_size):
+            ids = added[i:i + batch_size]
+            documents = [desired[qid][0]["question"] for qid in ids]
+            embeddings = self.embedding_model.encode(documents)
+            self.collection.add(
+                embeddings=embeddings.tolist(),
+                documents=documents,
+                metadatas=[desired[qid][1] for qid in ids],
+                ids=ids,
+            )
+
+        self._indexed = bool(desired)
+        if added or updated or removed:
+            self._memory_index = None  # rebuilt from the collection on next query
+        self.last_sync = {
+            "added": len(added), "updated": len(updated),
+            "removed": len(removed), "total": len(desired),
+        }
+        logger.info(f"Question bank synced: +{len(added)} ~{len(updated)} "
+                    f"-{len(removed)} ({len(desired)} total)")
+        return len(desired)
+
+    def ensure_indexed(self, path=None, force: bool = False) -> dict:
+        """Index question_bank.json unless the manifest says it is current.
+
+        The manifest records the source file's sha256, the embedding model
+        and the resulting count, so an unchanged bank costs one file hash
+        and one ``count()`` at startup.
+
+        Returns:
+            dict with 'status' ('unchanged', 'indexed' or 'missing'),
+            'count', and the sync counters when indexing ran.
+        """
+        path = Path(path or settings.QUESTION_BANK_PATH)
+        if not path.exists():
+            return {"status": "missing", "count": self.get_question_count()}
+
+        with _question_bank_lock:
+            raw = path.read_bytes()
+            source_sha = hashlib.sha256(raw).hexdigest()
+            manifest = self._read_manifest()
+            if (not force and manifest
+                    and manifest.get("version") == QUESTION_BANK_MANIFEST_VERSION
+                    and manifest.get("source_sha256") == source_sha
+                    and manifest.get("embedding_model") == settings.EMBEDDING_MODEL_NAME
+                    and manifest.get("count") == self.collection.count()):
+                self._indexed = manifest["count"] > 0
+                return {"status": "unchanged", "count": manifest["count"]}
+
+            count = self.index_questions(json.loads(raw))
+            self._write_manifest({
+                "version": QUESTION_BANK_MANIFEST_VERSION,
+                "source_sha256": source_sha,
+                "embedding_model": settings.EMBEDDING_MODEL_NAME,
+                "count": count,
+                "indexed_at": time.time(),
+            })
+            return {"status": "indexed", "count": count, **self.last_sync}
+
+    def _recreate_collection(self) -> None:
         try:
             self.client.delete_collection(name="question_bank")
         except (ValueError, Exception):
@@ -169,48 +300,38 @@ class QuestionBankRAG:
             name="question_bank",
             metadata={"hnsw:space": "cosine"},
         )
+        self._indexed = False
+        self._memory_index = None
 
-        total = 0
-        for i in range(0, len(questions), batch_size):
-            batch = questions[i:i + batch_size]
-
-            documents = []
-            metadatas = []
-            ids = []
-
-            for j, q in enumerate(batch):
-                q_text = q.get("question", "")
-                if not q_text or len(q_text.strip()) < 10:
-                    continue
-
-                doc_text = q_text
-                documents.append(doc_text)
-
-                metadatas.append({
-                    "answer": q.get("answer", "")[:1500],
-                    "category": q.get("category", "general_technical"),
-                    "difficulty": q.get("difficulty", "medium"),
-                    "tags": json.dumps(q.get("tags", [])),
-                    "company": q.get("company", "generic"),
-                    "evaluation_points": json.dumps(q.get("evaluation_points", [])),
-                    "source": q.get("source", "unknown"),
-                })
-
-                ids.append(f"qb_{i + j}")
-
-            if documents:
-                embeddings = self.embedding_model.encode(documents).tolist()
-                self.collection.add(
-                    embeddings=embeddings,
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids,
-                )
-                total += len(documents)
-
-        self._indexed = True
-        logger.info(f"Indexed {total} questions into question_bank collection")
-        return total
+    @staticmethod
+    def _read_manifest() -> dict | None:
+        try:
+            with open(QUESTION_BANK_MANIFEST_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _write_manifest(manifest: dict) -> None:
+        tmp = QUESTION_BANK_MANIFEST_PATH.with_suffix(".tmp")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp, QUESTION_BANK_MANIFEST_PATH)
+        except OSError as e:
+            logger.warning(f"Failed to write question bank manifest: {e}")
+
+    def _get_memory_index(self) -> QuestionBankIndex | None:
+        """Return the in-process index, building it on first use."""
+        if self._memory_index is not None or not settings.ENABLE_QUESTION_BANK_MEMORY_INDEX:
+            return self._memory_index
+        with self._memory_index_lock:
+            if self._memory_index is None and self.is_indexed:
+                try:
+                    self._memory_index = QuestionBankIndex.from_collection(self.collection)
+                except Exception as e:
+                    logger.warning(f"In-memory question index unavailable, using ChromaDB: {e}")
+        return self._memory_index
 
     def retrieve_questions(
         self,
@@ -232,6 +353,14 @@ class QuestionBankRAG:
         Returns:
             List of dicts with question, answer, metadata.
         """
+        memory_index = self._get_memory_index()
+        if memory_index is not None:
+            query_embedding = self.embedding_model.encode(query)
+            return memory_index.search(
+                query_embedding, top_k=top_k, category=category,
+                difficulty=difficulty, exclude_ids=exclude_ids,
+            )
+
         if not self.is_indexed:
             logger.warning("Question bank not indexed yet")
             return []
@@ -329,4 +458,6 @@ class QuestionBankRAG:
 
     def get_question_count(self) -> int:
         """Return total questions in the index."""
+        if self._memory_index is not None:
+            return len(self._memory_index)
         return self.collection.count() if self._indexed else 0
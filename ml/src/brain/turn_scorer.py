@@ -0,0 +1,204 @@
+"""Background per-turn answer scoring.
+
+Every answer is scored with ``QuestionEvaluator.evaluate_answer`` right
+after the interviewer has replied, while the candidate reads or thinks.
+The end-of-session report then only reduces the stored scores plus a short
+digest, instead of sending the whole transcript to the LLM in one prompt
+that grows with interview length.
+
+Scoring runs on one process-wide worker at idle priority. Before each
+request it waits for no live interview reply to be streaming from Ollama
+(``llm_engine.wait_until_idle``), but only up to
+``TURN_SCORE_MAX_IDLE_WAIT_SECONDS``: with several concurrent sessions Ollama
+is rarely fully idle, and an unbounded wait would stall scoring. When a
+session's report is collected, its queued jobs jump the queue and skip the
+idle wait.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Optional
+
+from config import settings
+from src.brain.question_evaluator import QuestionEvaluator
+
+logger = logging.getLogger("TurnScorer")
+
+MAX_DIGEST_QUESTION_CHARS = 200
+MAX_DIGEST_ANSWER_CHARS = 300
+URGENT, NORMAL = 0, 1  # queue priorities
+
+
+class TurnScorer:
+    """Idle-priority queue of ``evaluate_answer`` jobs shared by all sessions."""
+
+    def __init__(self, llm_model=None, evaluator: QuestionEvaluator | None = None) -> None:
+        """
+        Args:
+            llm_model: Client with ``create_chat_completion`` (default: an
+                       ``OllamaClient``, created on the first job).
+            evaluator: Scoring prompts and weights (default ``QuestionEvaluator``).
+        """
+        self._llm = llm_model
+        self.evaluator = evaluator or QuestionEvaluator()
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._order = itertools.count()  # FIFO within a priority
+        self._queued: dict[Future, tuple] = {}  # jobs not yet picked up
+        self._queued_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from src.brain.llm_engine import OllamaClient
+            self._llm = OllamaClient()
+        return self._llm
+
+    def submit(self, question: str, answer: str,
+               question_context: dict | None = None) -> Future:
+        """Queue one answer for scoring.
+
+        Args:
+            question: The interviewer's question the candidate answered.
+            answer: The candidate's answer.
+            question_context: Question-bank entry the question came from, if
+                              any (supplies the ideal answer and criteria).
+
+        Returns:
+            Future resolving to the ``evaluate_answer`` dict, with the
+            (truncated) ``question`` and ``answer`` attached for the digest.
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        job = (question, answer, question_context or {}, future)
+        with self._queued_lock:
+            self._queued[future] = job
+        self._queue.put((NORMAL, next(self._order), job))
+        return future
+
+    def expedite(self, futures: list[Future]) -> int:
+        """Move still-queued jobs to the front; they skip the idle wait.
+
+        Called when a session's report is being collected.
+
+        Returns:
+            Number of jobs expedited.
+        """
+        with self._queued_lock:
+            jobs = [self._queued[f] for f in futures if f in self._queued]
+        for job in jobs:
+            # The NORMAL entry stays in the heap; whichever copy comes out
+            # first runs the job and the other is skipped.
+            self._queue.put((URGENT, next(self._order), job))
+        return len(jobs)
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued but not yet picked up."""
+        with self._queued_lock:
+            return len(self._queued)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="turn-scorer", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        from src.brain.llm_engine import wait_until_idle
+        while True:
+            priority, _, (question, answer, context, future) = self._queue.get()
+            with self._queued_lock:
+                if self._queued.pop(future, None) is None:
+                    continue  # already picked up through its other queue entry
+            if not future.set_running_or_notify_cancel():
+                continue
+            if priority != URGENT:
+                wait_until_idle(settings.TURN_SCORE_MAX_IDLE_WAIT_SECONDS)
+            try:
+                result = self.evaluator.evaluate_answer(
+                    question=context.get("question") or question,
+                    candidate_answer=answer,
+                    ideal_answer=context.get("ideal_answer", ""),
+                    evaluation_points=context.get("evaluation_points", []),
+                    llm_model=self.llm,
+                )
+            except BaseException as e:
+                future.set_exception(e)
+                continue
+            result["question"] = question[:MAX_DIGEST_QUESTION_CHARS]
+            result["answer"] = answer[:MAX_DIGEST_ANSWER_CHARS]
+            logger.info(f"Scored turn: {result.get('weighted_score', 0)}/10 ({self.pending} queued)")
+            future.set_result(result)
+
+
+def collect_scores(futures: list[Future], timeout: float) -> list[dict]:
+    """Wait up to ``timeout`` seconds in total for queued scores.
+
+    Jobs of the shared scorer that are still queued are expedited first.
+    Jobs still queued at the deadline are cancelled; their answers appear
+    unscored in the report digest instead of holding up the report.
+    """
+    if _global_turn_scorer is not None:
+        _global_turn_scorer.expedite(futures)
+    deadline = time.monotonic() + timeout
+    scores = []
+    for future in futures:
+        try:
+            scores.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeout:
+            future.cancel()
+        except Exception as e:
+            logger.warning(f"Turn scoring failed: {e}")
+    return scores
+
+
+def turn_digest(history: list[dict], per_question_scores: list[dict]) -> list[str]:
+    """One compact line per answered question, for the report summarization.
+
+    Scored answers contribute their scores and feedback; answers that were
+    never scored (e.g. still queued at the end) fall back to truncated text.
+    """
+    scores_by_answer = {s.get("answer"): s for s in per_question_scores}
+    lines = []
+    question = ""
+    for msg in history:
+        if msg["role"] == "assistant":
+            question = msg["content"]
+            continue
+        if msg["role"] != "user" or not question:
+            continue  # the synthetic opening prompt precedes any question
+        answer = msg["content"]
+        q = question[:MAX_DIGEST_QUESTION_CHARS]
+        score = scores_by_answer.get(answer[:MAX_DIGEST_ANSWER_CHARS])
+        if score is None:
+            lines.append(f"Q{len(lines) + 1}: {q}\n  Answer (unscored): {answer[:MAX_DIGEST_ANSWER_CHARS]}")
+        else:
+            lines.append(
+                f"Q{len(lines) + 1}: {q}\n"
+                f"  Score {score.get('weighted_score', 0)}/10 (technical {score.get('technical_accuracy', 0)}, "
+                f"clarity {score.get('clarity', 0)}, communication {score.get('communication', 0)})\n"
+                f"  Strengths: {'; '.join(score.get('strengths', [])) or '-'}\n"
+                f"  Weaknesses: {'; '.join(score.get('weaknesses', [])) or '-'}"
+            )
+    return lines
+
+
+_global_turn_scorer: Optional[TurnScorer] = None
+_turn_scorer_lock = threading.Lock()
+
+
+def get_turn_scorer() -> TurnScorer:
+    """Return singleton TurnScorer instance."""
+    global _global_turn_scorer
+    if _global_turn_scorer is None:
+        with _turn_scorer_lock:
+            if _global_turn_scorer is None:
+                _global_turn_scorer = TurnScorer()
+    return _global_turn_scorer
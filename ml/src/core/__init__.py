@@ -1,5 +1,7 @@
 from src.core.ats_checker import ATSChecker
 from src.core.cache_manager import CacheManager, get_cache_manager
+from src.core.embedding_batcher import EmbeddingBatcher, get_embedding_batcher
+from src.core.embedding_registry import EmbeddingRegistry, get_embedding_registry
 from src.core.interview_manager import InterviewManager
 from src.core.jd_loader import JDLoader
 from src.core.resume_loader import ResumeLoader
@@ -8,9 +10,13 @@ from src.core.session_state import SessionState
 __all__ = [
     "ATSChecker",
     "CacheManager",
+    "EmbeddingBatcher",
+    "EmbeddingRegistry",
     "InterviewManager",
     "JDLoader",
     "ResumeLoader",
     "SessionState",
     "get_cache_manager",
+    "get_embedding_batcher",
+    "get_embedding_registry",
 ]
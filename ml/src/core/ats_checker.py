@@ -9,12 +9,11 @@ from pathlib import Path
 
 import numpy as np
 import spacy
-import torch
-from sentence_transformers import SentenceTransformer
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 from src.core.cache_manager import get_cache_manager
+from src.core.embedding_batcher import get_embedding_batcher
 
 logger = logging.getLogger("ATSChecker")
 
@@ -31,8 +30,7 @@ class ATSChecker:
                 "Please install it: python -m spacy download en_core_web_sm"
             ) from e
 
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.semantic_model = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2', device=device)
+        self.semantic_model = get_embedding_batcher()
         self.llm_model = llm_model
         self.cache = get_cache_manager()
 
@@ -3,12 +3,14 @@ import json
 import logging
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
 import numpy as np
 
 from config import settings
+from src.core.vector_store import VectorStore
 
 logger = logging.getLogger("CacheManager")
 
@@ -16,12 +18,23 @@ DEFAULT_CACHE_TTL = 86400  # 24 hours
 
 
 class CacheManager:
-    """Thread-safe, TTL-based cache for embeddings and LLM results."""
+    """Thread-safe, TTL-based cache for embeddings and LLM results.
+
+    Embeddings go to a bounded in-memory LRU backed by one memory-mapped
+    ``VectorStore`` per vector width; LLM results are small JSON files.
+    An embedding's TTL runs from when it was first written, wherever it is
+    later read from; the on-disk stores evict in write order across
+    processes (see ``vector_store``).
+    """
 
     def __init__(self, cache_dir: str | Path | None = None) -> None:
         self.cache_dir = Path(cache_dir) if cache_dir else settings.BASE_DIR / "data" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.embedding_cache: dict[str, dict] = {}
+        # Hot in-memory LRU in front of the memory-mapped vector stores
+        self.embedding_cache: OrderedDict[str, dict] = OrderedDict()
+        self.memory_cache_size = settings.EMBEDDING_MEMORY_CACHE_SIZE
+        self._stores: dict[int, VectorStore] = {}
+        self._stores_discovered = False
         self.llm_cache: dict[str, dict] = {}
         self.cache_ttl = DEFAULT_CACHE_TTL
         self._lock = threading.RLock()
@@ -29,52 +42,149 @@ class CacheManager:
     def _hash_content(self, content: str) -> str:
         return hashlib.sha256(content.encode('utf-8')).hexdigest()
 
+    # ── Embeddings ────────────────────────────────────────────────
+
     def get_embedding_cache(self, text: str) -> Optional[np.ndarray]:
         """Retrieve cached embedding for text, or None if expired/missing."""
-        cache_key = self._hash_content(text)
+        return self.get_embedding_cache_many([text])[0]
+
+    def set_embedding_cache(self, text: str, embedding: Any) -> None:
+        """Store embedding in memory and in the on-disk vector store."""
+        self.set_embedding_cache_many([text], [embedding])
+
+    def get_embedding_cache_many(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        """Batch lookup: one result (array or None) per text, in order."""
+        keys = [self._hash_content(t) for t in texts]
+        results: list[Optional[np.ndarray]] = [None] * len(keys)
+        now = time.time()
 
         with self._lock:
-            if cache_key in self.embedding_cache:
-                cached_data = self.embedding_cache[cache_key]
-                if time.time() - cached_data['timestamp'] < self.cache_ttl:
-                    return cached_data['embedding']
-                del self.embedding_cache[cache_key]
+            for i, key in enumerate(keys):
+                cached = self.embedding_cache.get(key)
+                if cached is None:
+                    continue
+                if now - cached['timestamp'] < self.cache_ttl:
+                    self.embedding_cache.move_to_end(key)
+                    results[i] = cached['embedding']
+                else:
+                    del self.embedding_cache[key]
 
-        cache_file = self.cache_dir / f"emb_{cache_key}.json"
-        if cache_file.exists():
-            try:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                    if time.time() - data['timestamp'] < self.cache_ttl:
-                        embedding = np.array(data['embedding'])
-                        with self._lock:
-                            self.embedding_cache[cache_key] = {
-                                'embedding': embedding,
-                                'timestamp': data['timestamp'],
-                            }
-                        return embedding
-            except (json.JSONDecodeError, KeyError, FileNotFoundError, OSError):
-                logger.debug(f"Failed to read embedding cache file: {cache_file}")
-        return None
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            for store in self._vector_stores():
+                pending = [i for i in missing if results[i] is None]
+                if not pending:
+                    break
+                try:
+                    found = store.get_entries([bytes.fromhex(keys[i]) for i in pending],
+                                              ttl=self.cache_ttl)
+                except OSError as e:
+                    logger.debug(f"Vector store read failed: {e}")
+                    continue
+                for i, entry in zip(pending, found):
+                    if entry is not None:
+                        results[i], written_at = entry
+                        self._remember_embedding(keys[i], results[i], written_at)
 
-    def set_embedding_cache(self, text: str, embedding: Any) -> None:
-        """Store embedding in memory and disk cache."""
-        cache_key = self._hash_content(text)
-        embedding_array = embedding if isinstance(embedding, np.ndarray) else np.array(embedding)
-        embedding_list = embedding_array.tolist()
+        for i in missing:
+            if results[i] is None:
+                results[i] = self._migrate_legacy_embedding(keys[i])
+        return results
+
+    def set_embedding_cache_many(self, texts: list[str], embeddings: Any) -> None:
+        """Batch store; rows of ``embeddings`` align with ``texts``."""
+        keys = [self._hash_content(t) for t in texts]
+        arrays = [e if isinstance(e, np.ndarray) else np.array(e) for e in embeddings]
+        for key, embedding in zip(keys, arrays):
+            self._remember_embedding(key, embedding)
+
+        by_dim: dict[int, list[int]] = {}
+        for i, embedding in enumerate(arrays):
+            by_dim.setdefault(embedding.size, []).append(i)
+        for dim, idxs in by_dim.items():
+            try:
+                self._vector_store(dim).put_many(
+                    [bytes.fromhex(keys[i]) for i in idxs],
+                    np.stack([arrays[i].reshape(-1) for i in idxs]),
+                    ttl=self.cache_ttl,
+                )
+            except OSError as e:
+                logger.warning(f"Failed to write embedding cache: {e}")
 
+    def _remember_embedding(self, key: str, embedding: np.ndarray,
+                            timestamp: float | None = None) -> None:
+        """Keep ``embedding`` in memory; ``timestamp`` is its original write time."""
         with self._lock:
-            self.embedding_cache[cache_key] = {
-                'embedding': embedding_array,
-                'timestamp': time.time(),
+            self.embedding_cache[key] = {
+                'embedding': embedding,
+                'timestamp': time.time() if timestamp is None else timestamp,
             }
+            self.embedding_cache.move_to_end(key)
+            while len(self.embedding_cache) > self.memory_cache_size:
+                self.embedding_cache.popitem(last=False)
 
-        cache_file = self.cache_dir / f"emb_{cache_key}.json"
+    def _vector_store(self, dim: int) -> VectorStore:
+        store = self._stores.get(dim)
+        if store is None:
+            with self._lock:
+                store = self._stores.get(dim)
+                if store is None:
+                    store = VectorStore(
+                        self.cache_dir, dim,
+                        dtype=settings.EMBEDDING_CACHE_DTYPE,
+                        max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                    )
+                    self._stores[dim] = store
+        return store
+
+    def _vector_stores(self) -> list[VectorStore]:
+        """Open stores, including ones written earlier or by other processes.
+
+        The directory is listed once; after that only stores this process
+        writes are added.
+        """
+        if not self._stores_discovered:
+            suffix = f"_{np.dtype(settings.EMBEDDING_CACHE_DTYPE).name}.idx"
+            try:
+                names = [p.name for p in self.cache_dir.glob(f"emb_*{suffix}")]
+            except OSError:
+                names = []
+            for name in names:
+                dim = name[len("emb_"):-len(suffix)]
+                if dim.isdigit():
+                    try:
+                        self._vector_store(int(dim))
+                    except OSError as e:
+                        logger.debug(f"Cannot open vector store {name}: {e}")
+            self._stores_discovered = True
+        return list(self._stores.values())
+
+    def _migrate_legacy_embedding(self, key: str) -> Optional[np.ndarray]:
+        """Read a pre-vector-store ``emb_<sha>.json`` entry, moving it into the store."""
+        cache_file = self.cache_dir / f"emb_{key}.json"
+        if not cache_file.exists():
+            return None
         try:
-            with open(cache_file, 'w') as f:
-                json.dump({'embedding': embedding_list, 'timestamp': time.time()}, f)
-        except (OSError, IOError) as e:
-            logger.warning(f"Failed to write embedding cache: {e}")
+            with open(cache_file, 'r') as f:
+                data = json.load(f)
+            cache_file.unlink()
+        except (json.JSONDecodeError, OSError):
+            logger.debug(f"Failed to read embedding cache file: {cache_file}")
+            return None
+        written_at = data.get('timestamp', 0)
+        if time.time() - written_at >= self.cache_ttl:
+            return None
+        embedding = np.array(data['embedding'], dtype=np.float32)
+        self._remember_embedding(key, embedding, written_at)
+        try:
+            self._vector_store(embedding.size).put_many(
+                [bytes.fromhex(key)], embedding.reshape(1, -1),
+                timestamps=[written_at], ttl=self.cache_ttl)
+        except OSError as e:
+            logger.debug(f"Failed to migrate embedding cache entry: {e}")
+        return embedding
+
+    # ── LLM results ───────────────────────────────────────────────
 
     def get_llm_cache(self, resume_text: str, jd_text: str) -> Optional[dict]:
         """Retrieve cached LLM result for resume+JD pair."""
@@ -124,6 +234,11 @@ class CacheManager:
         with self._lock:
             self.embedding_cache.clear()
             self.llm_cache.clear()
+        for store in self._vector_stores():
+            try:
+                store.clear()
+            except OSError as e:
+                logger.warning(f"Failed to clear vector store {store.data_path}: {e}")
         for cache_file in self.cache_dir.glob("*.json"):
             try:
                 cache_file.unlink()
@@ -0,0 +1,213 @@
+"""Dynamic micro-batching for sentence embeddings.
+
+Interview sessions mostly embed one short query at a time (a follow-up
+question lookup, a JD query, an ATS snippet). Run one by one, each call
+pays a full forward pass. ``EmbeddingBatcher`` collects the requests that
+arrive within a few milliseconds of each other, encodes them as one padded
+batch on a single worker thread, and resolves each caller's future with
+its rows.
+
+``encode`` mirrors ``SentenceTransformer.encode``, so the batcher can be
+used wherever the engines previously held the model directly.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from config import settings
+from src.core.embedding_registry import EmbeddingRegistry, get_embedding_registry
+
+logger = logging.getLogger("EmbeddingBatcher")
+
+_STOP = object()
+
+
+@dataclass
+class _EncodeRequest:
+    texts: list[str]
+    future: Future = field(default_factory=Future)
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent encode calls into shared batches."""
+
+    def __init__(self, registry: EmbeddingRegistry | None = None,
+                 model_name: str | None = None,
+                 max_batch_size: int = settings.EMBEDDING_BATCH_MAX_SIZE,
+                 max_wait_ms: float = settings.EMBEDDING_BATCH_MAX_WAIT_MS) -> None:
+        """
+        Args:
+            registry: Source of the shared encoder. Defaults to the global one.
+            model_name: Model id (defaults to the configured encoder).
+            max_batch_size: Texts per batch. Requests at least this large
+                            skip the queue and encode on the caller's thread.
+            max_wait_ms: How long the first request in a batch waits for
+                         company before the batch runs.
+        """
+        self.registry = registry or get_embedding_registry()
+        self.model_name = model_name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._requests_total = 0
+        self._texts_total = 0
+        self._batches_total = 0
+        self._batched_texts_total = 0
+        self._bypassed_total = 0
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def submit(self, texts: list[str]) -> Future:
+        """Queue ``texts`` for the next batch.
+
+        Returns:
+            Future resolving to a float32 array of shape (len(texts), dim).
+        """
+        request = _EncodeRequest(list(texts))
+        with self._stats_lock:
+            self._requests_total += 1
+            self._texts_total += len(request.texts)
+
+        if not request.texts:
+            request.future.set_result(np.empty((0, 0), dtype=np.float32))
+            return request.future
+
+        if len(request.texts) >= self.max_batch_size:
+            # Bulk work (indexing) is already a full batch; queueing it would
+            # only delay the small interactive queries behind it.
+            with self._stats_lock:
+                self._bypassed_total += 1
+            try:
+                request.future.set_result(self._encode(request.texts))
+            except Exception as e:
+                request.future.set_exception(e)
+            return request.future
+
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def encode(self, sentences: str | list[str], **kwargs) -> np.ndarray:
+        """Blocking, ``SentenceTransformer.encode``-compatible entry point.
+
+        Extra keyword arguments (``batch_size``, ``convert_to_tensor``,
+        ``show_progress_bar``) are accepted for compatibility and ignored;
+        batching is decided by the service.
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        embeddings = self.submit(texts).result()
+        return embeddings[0] if single else embeddings
+
+    def stats(self) -> dict:
+        """Batch-occupancy and throughput counters since startup."""
+        with self._stats_lock:
+            batches = self._batches_total
+            avg_batch = self._batched_texts_total / batches if batches else 0.0
+            return {
+                "requests_total": self._requests_total,
+                "texts_total": self._texts_total,
+                "batches_total": batches,
+                "bypassed_total": self._bypassed_total,
+                "avg_batch_size": round(avg_batch, 2),
+                "avg_occupancy": round(min(avg_batch / self.max_batch_size, 1.0), 3),
+                "queue_depth": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+    def close(self) -> None:
+        """Stop the worker after it drains the queued requests."""
+        with self._start_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join(timeout=5)
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        wait_s = self.max_wait_ms / 1000
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.perf_counter() + wait_s
+            while size < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stopping = True
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_EncodeRequest]) -> None:
+        # Concurrent sessions often ask the same thing (e.g. the default
+        # "general interview questions" query); encode each text once.
+        unique = list(dict.fromkeys(t for request in batch for t in request.texts))
+        try:
+            embeddings = self._encode(unique)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(unique)} failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self._batches_total += 1
+            self._batched_texts_total += len(unique)
+
+        row = {text: i for i, text in enumerate(unique)}
+        for request in batch:
+            request.future.set_result(embeddings[[row[t] for t in request.texts]])
+
+    def _encode(self, texts: list[str]) -> np.ndarray:
+        return self.registry.encode(
+            texts, model_name=self.model_name, batch_size=self.max_batch_size,
+        )
+
+
+_global_batcher: Optional[EmbeddingBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Return singleton EmbeddingBatcher for the configured encoder."""
+    global _global_batcher
+    if _global_batcher is None:
+        with _batcher_lock:
+            if _global_batcher is None:
+                _global_batcher = EmbeddingBatcher()
+    return _global_batcher
@@ -0,0 +1,132 @@
+"""Process-wide registry of sentence-embedding models.
+
+Every component that embeds text (JD RAG, question bank, ATS semantic
+scoring) asks the registry for its encoder instead of constructing a
+``SentenceTransformer`` itself, so each model is read from disk once per
+process and shared by every thread and interview session.
+
+The read path is lock-free: loaded models live in a dict that is replaced
+wholesale (copy-on-write) under the load lock, so a lookup is a single
+atomic ``dict.get``. Only the first request for a model takes the lock.
+"""
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger("EmbeddingRegistry")
+
+DEFAULT_ENCODE_BATCH_SIZE = 32
+
+
+class EmbeddingRegistry:
+    """Loads each embedding model once and hands out the shared instance."""
+
+    def __init__(self, device: str | None = None) -> None:
+        self.device = device or settings.EMBEDDING_DEVICE
+        self._models: dict[str, object] = {}
+        self._load_lock = threading.Lock()
+
+    def get(self, model_name: str | None = None):
+        """Return the shared encoder for ``model_name``, loading it on first use.
+
+        Args:
+            model_name: Hugging Face model id. Defaults to
+                        ``settings.EMBEDDING_MODEL_NAME``.
+
+        Returns:
+            The loaded ``SentenceTransformer``.
+        """
+        name = model_name or settings.EMBEDDING_MODEL_NAME
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._load_lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load_model(name)
+                # Publish a new dict so lock-free readers never observe a
+                # dict that is being mutated.
+                self._models = {**self._models, name: model}
+        return model
+
+    def encode(self, texts: str | list[str], model_name: str | None = None,
+               batch_size: int = DEFAULT_ENCODE_BATCH_SIZE,
+               normalize: bool = False) -> np.ndarray:
+        """Embed ``texts`` with the shared encoder.
+
+        Args:
+            texts: A string or list of strings.
+            model_name: Model id (defaults to the configured encoder).
+            batch_size: Texts per forward pass.
+            normalize: L2-normalize the output rows.
+
+        Returns:
+            float32 array of shape (n, dim), or (dim,) for a single string.
+        """
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        if not batch:
+            return np.empty((0, 0), dtype=np.float32)
+
+        embeddings = self.get(model_name).encode(
+            batch,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=normalize,
+            show_progress_bar=False,
+        ).astype(np.float32, copy=False)
+        return embeddings[0] if single else embeddings
+
+    def warm_up(self, model_names: list[str] | None = None) -> list[str]:
+        """Load the given models (default: the configured encoder) ahead of use.
+
+        A short dummy encode also initialises the tokenizer and kernels, so
+        the first real request pays neither cost.
+
+        Returns:
+            Names of the models that are loaded afterwards.
+        """
+        warmed = []
+        for name in model_names or [settings.EMBEDDING_MODEL_NAME]:
+            try:
+                self.encode(["warm up"], model_name=name)
+                warmed.append(name)
+            except Exception as e:
+                logger.warning(f"Embedding warm-up failed for {name}: {e}")
+        return warmed
+
+    def is_loaded(self, model_name: str | None = None) -> bool:
+        return (model_name or settings.EMBEDDING_MODEL_NAME) in self._models
+
+    def loaded_models(self) -> list[str]:
+        return list(self._models)
+
+    def _load_model(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+
+        logger.info(f"Loading embedding model {model_name} on {self.device}")
+        return SentenceTransformer(model_name, device=self.device)
+
+
+_global_registry: Optional[EmbeddingRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_embedding_registry() -> EmbeddingRegistry:
+    """Return singleton EmbeddingRegistry instance."""
+    global _global_registry
+    if _global_registry is None:
+        with _registry_lock:
+            if _global_registry is None:
+                _global_registry = EmbeddingRegistry()
+    return _global_registry
+
+
+def get_embedding_model(model_name: str | None = None):
+    """Shortcut for ``get_embedding_registry().get(model_name)``."""
+    return get_embedding_registry().get(model_name)
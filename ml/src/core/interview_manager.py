@@ -1,8 +1,10 @@
 """Interview Manager — orchestrates audio, LLM, TTS, proctoring, and evaluation."""
+import functools
 import json
 import logging
+import random
+import threading
 import time
-from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
@@ -14,17 +16,50 @@ from src.brain.llm_engine import LLMEngine
 from src.brain.rag_engine import RAGEngine, QuestionBankRAG
 from src.brain.skill_extractor import SkillExtractor
 from src.brain.question_evaluator import QuestionEvaluator
+from src.brain.turn_scorer import collect_scores, get_turn_scorer
 from src.brain.decision_engine import DecisionEngine
 from src.core.ats_checker import ATSChecker
 from src.core.jd_loader import JDLoader
 from src.core.resume_loader import ResumeLoader
 from src.core.session_state import SessionState
+from src.core.turn_prefetch import TurnPrefetcher
 from src.ears.stt_engine import STTEngine
 from src.ears.vad import VoiceRecorder
 from src.voice.tts_engine import TTSEngine
 
 logger = logging.getLogger("InterviewManager")
 
+# Interview type → valid question categories, to prevent type bleed (None = all)
+TYPE_CATEGORY_MAP = {
+    "technical":  ["dsa", "os", "database", "backend", "ml", "general_technical"],
+    "behavioral": ["behavioral"],
+    "hr":         ["behavioral"],  # fallback to behavioral for HR
+    "combined":   None,
+}
+
+# Scripted interviewer lines, spoken verbatim in every session (pre-synthesized by _prewarm_speech)
+OPENING_GREETING = "Hello, let's begin the interview."
+OPENING_FALLBACK_QUESTION = "Could you start by walking me through your background?"
+CONFIRM_EXIT = "Are you sure you want to end the interview?"
+ENDING_SESSION = "Ending session."
+RESUMING_SESSION = "Resuming the interview."
+TOXICITY_TERMINATION = (
+    "This interview is being terminated due to repeated inappropriate language. "
+    "Please maintain professionalism in future interviews."
+)
+
+
+def session_greeting(difficulty: str) -> str:
+    return f"Hello! I am ready for the {difficulty} interview. Let's begin."
+
+
+def toxicity_warning(count: int, limit: int) -> str:
+    return (
+        f"Warning {count}/{limit}: "
+        "Please maintain a professional tone. "
+        "One more violation will end this interview."
+    )
+
 _proctoring_available = False
 if settings.ENABLE_PROCTORING:
     try:
@@ -88,6 +123,7 @@ class InterviewManager:
 
         self.next_turn_audio = None
         self.audio_responses = []
+        self._pending_scores = []
         self.detected_language = settings.DEFAULT_INTERVIEW_LANGUAGE
         self._toxicity_warnings = 0
         self._max_toxicity_warnings = 2
@@ -348,18 +384,13 @@ class InterviewManager:
         if settings.ENABLE_QUESTION_BANK:
             try:
                 self.question_bank = QuestionBankRAG()
-                if self.question_bank.is_indexed:
-                    logger.info(f"Question bank loaded: {self.question_bank.get_question_count()} questions")
+                # No-op when the manifest matches question_bank.json;
+                # otherwise only new/changed questions are embedded.
+                result = self.question_bank.ensure_indexed()
+                if result["status"] == "missing":
+                    logger.info("No question_bank.json found — run ingest_datasets.py first")
                 else:
-                    # Try to index from question_bank.json
-                    if settings.QUESTION_BANK_PATH.exists():
-                        import json as _json
-                        with open(settings.QUESTION_BANK_PATH, 'r', encoding='utf-8') as f:
-                            questions = _json.load(f)
-                        count = self.question_bank.index_questions(questions)
-                        logger.info(f"Indexed {count} questions from question bank")
-                    else:
-                        logger.info("No question_bank.json found — run ingest_datasets.py first")
+                    logger.info(f"Question bank {result['status']}: {result['count']} questions")
             except Exception as e:
                 logger.warning(f"Question bank init failed: {e}")
                 self.question_bank = None
@@ -387,6 +418,100 @@ class InterviewManager:
         else:
             print(f"\n[intrv.ai]: {text}")
 
+    def _prewarm_speech(self, opening_context: dict | None) -> None:
+        """Synthesize scripted lines and question-bank questions into the TTS cache.
+
+        Runs in the background, opener first. The cache persists across
+        sessions, so after the first session these lines play without any
+        synthesis latency.
+        """
+        service = getattr(self.voice_engine, 'service', None)
+        if service is None:
+            return  # e.g. Coqui, which has no cache
+
+        def submit():
+            opening = (opening_context or {}).get("question") or OPENING_FALLBACK_QUESTION
+            texts = [OPENING_GREETING, opening, CONFIRM_EXIT, ENDING_SESSION, RESUMING_SESSION,
+                     TOXICITY_TERMINATION]
+            texts += [toxicity_warning(n, self._max_toxicity_warnings)
+                      for n in range(1, self._max_toxicity_warnings)]
+            texts += self._bank_questions(settings.TTS_PREWARM_MAX_QUESTIONS)
+            service.prewarm(texts)
+
+        threading.Thread(target=submit, daemon=True).start()
+
+    def _bank_questions(self, limit: int) -> list[str]:
+        """Question-bank questions for this session's difficulty and type, read verbatim."""
+        if not self.question_bank:
+            return []
+        try:
+            with open(settings.QUESTION_BANK_PATH, 'r', encoding='utf-8') as f:
+                questions = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Question bank unreadable for TTS prewarm: {e}")
+            return []
+
+        difficulty = self.state.difficulty.lower()
+        allowed_categories = TYPE_CATEGORY_MAP.get(self.state.interview_type, None)
+        texts = []
+        for q in questions:
+            if q.get("difficulty", "medium") != difficulty:
+                continue
+            if allowed_categories and q.get("category", "general_technical") not in allowed_categories:
+                continue
+            if q.get("question"):
+                texts.append(q["question"])
+                if len(texts) >= limit:
+                    break
+        return texts
+
+    @staticmethod
+    def _persist_turn_audio(audio: np.ndarray, turn: int) -> None:
+        """Write a turn's recording to data/temp on a background thread."""
+        def write():
+            try:
+                temp_dir = settings.BASE_DIR / "data" / "temp"
+                temp_dir.mkdir(parents=True, exist_ok=True)
+                sf.write(str(temp_dir / f"input_{turn}.wav"), audio, 16000)
+            except (OSError, RuntimeError) as e:
+                logger.warning(f"Could not persist turn {turn} audio: {e}")
+
+        threading.Thread(target=write, daemon=True).start()
+
+    def _retrieve_new_topic(self, query: str, category: str | None,
+                            difficulty: str) -> list[dict]:
+        """Question-bank candidates for a new topic, preferring ``category``."""
+        exclude_ids = list(self.state.asked_question_ids)
+        results = []
+        if category:
+            results = self.question_bank.retrieve_questions(
+                query=query,
+                difficulty=difficulty.lower(),
+                category=category,
+                top_k=5,
+                exclude_ids=exclude_ids,
+            )
+        if not results:
+            results = self.question_bank.retrieve_questions(
+                query=query,
+                difficulty=difficulty.lower(),
+                top_k=5,
+                exclude_ids=exclude_ids,
+            )
+        return results
+
+    def _start_prefetch(self) -> TurnPrefetcher:
+        """Prepare the next turn while the candidate answers (see ``TurnPrefetcher``)."""
+        retrieve = None
+        if self.question_bank and self.question_bank.is_indexed:
+            combined_skills = self.state.resume_skills + getattr(self.state, 'jd_skills', [])
+            query = random.choice(combined_skills) if combined_skills else "general software engineering"
+            allowed_categories = TYPE_CATEGORY_MAP.get(self.state.interview_type)
+            category = random.choice(allowed_categories) if allowed_categories else None
+            retrieve = functools.partial(self._retrieve_new_topic, query, category)
+        warm = functools.partial(self.brain.warm_prefix, self.state.difficulty) if self.brain else None
+        return TurnPrefetcher(retrieve, self.decision_engine.reachable_difficulties(), warm).start()
+
     def start_session(self):
         self._configure_session()
 
@@ -396,27 +521,31 @@ class InterviewManager:
 
         print(f"--- Interview Session Started (ID: {self.state.session_id}) ---")
 
-        # Greeting
-        self._speak(f"Hello! I am ready for the {self.state.difficulty} interview. Let's begin.")
+        # Pick the opening question first so it synthesizes while the greeting plays
+        opening_context = self._select_opening_question()
+        self._prewarm_speech(opening_context)
 
-        (settings.BASE_DIR / "data" / "temp").mkdir(parents=True, exist_ok=True)
+        # Greeting
+        self._speak(session_greeting(self.state.difficulty))
 
-        # Generate opening question based on resume/JD
-        self._generate_opening_question()
+        # Opening question based on resume/JD
+        self._speak_opening_question(opening_context)
 
         while self.state.is_active:
+            prefetch = None
             try:
                 print(f"\n[Status] Listening...")
+                prefetch = self._start_prefetch()
                 audio_data = self.recorder.listen_and_record(prepend_audio=self.next_turn_audio)
                 self.next_turn_audio = None
 
                 if audio_data is None or len(audio_data) == 0:
                     continue
 
-                temp_wav = settings.BASE_DIR / "data" / "temp" / f"input_{self.state.question_count}.wav"
-                sf.write(str(temp_wav), audio_data, 16000)
+                if settings.PERSIST_TURN_AUDIO:
+                    self._persist_turn_audio(audio_data, self.state.question_count)
 
-                user_text, detected_lang = self.ears.transcribe(str(temp_wav), language=None)
+                user_text, detected_lang = self.ears.transcribe_array(audio_data, language=None, vad_filter=True)
                 self.detected_language = detected_lang
 
                 # Release Whisper's CUDA tensors so Ollama can use that VRAM for gemma4
@@ -444,63 +573,47 @@ class InterviewManager:
                     is_exit_command = True
 
                 if is_exit_command:
-                    self._speak("Are you sure you want to end the interview?")
+                    self._speak(CONFIRM_EXIT)
 
                     print(">> Waiting for confirmation...")
 
                     confirm_audio = self.recorder.listen_and_record()
-                    if confirm_audio is not None and len(confirm_audio) > 0:
-                        sf.write(str(temp_wav), confirm_audio, 16000)
-                    else:
+                    if confirm_audio is None or len(confirm_audio) == 0:
                         print("No audio recorded, assuming exit.")
                         break
 
-                    confirm_text, _ = self.ears.transcribe(str(temp_wav))
+                    confirm_text, _ = self.ears.transcribe_array(confirm_audio, vad_filter=True)
                     confirm_text = confirm_text.lower()
                     print(f"[Confirmation]: {confirm_text}")
 
                     if any(x in confirm_text for x in ["yes", "yeah", "sure", "correct", "end", "right", "bye"]):
-                        self._speak("Ending session.")
+                        self._speak(ENDING_SESSION)
                         break
                     else:
-                        self._speak("Resuming the interview.")
+                        self._speak(RESUMING_SESSION)
                         continue
 
                 # ── Toxicity check BEFORE sending to LLM ──
                 if self._is_toxic(user_text):
                     self._toxicity_warnings += 1
                     if self._toxicity_warnings >= self._max_toxicity_warnings:
-                        self._speak(
-                            "This interview is being terminated due to repeated inappropriate language. "
-                            "Please maintain professionalism in future interviews."
-                        )
+                        self._speak(TOXICITY_TERMINATION)
                         print(f"[!] Session auto-ended: {self._toxicity_warnings} toxicity warnings")
                         break
                     else:
-                        self._speak(
-                            f"Warning {self._toxicity_warnings}/{self._max_toxicity_warnings}: "
-                            "Please maintain a professional tone. "
-                            "One more violation will end this interview."
-                        )
+                        self._speak(toxicity_warning(self._toxicity_warnings, self._max_toxicity_warnings))
                         continue
 
-                # 1. Evaluate previous RAG answer if there was a context
-                # DISABLED: the user requested to stop per-question evaluation to reduce LLM load
+                # 1. Remember what was answered; it is scored in the background
+                # (idle priority) once the next question is underway
+                answered_question = self._last_question()
+                answered_context = self.state.current_question_context
                 if self.state.current_question_context and self.question_evaluator:
                     # Clear context so we don't hold onto it
                     self.state.current_question_context = {}
 
-                # 2. Decide next action & fetch RAG question
-                # Map interview type → valid question categories to prevent type bleed
-                _TYPE_CATEGORY_MAP = {
-                    "technical":  ["dsa", "os", "database", "backend", "ml", "general_technical"],
-                    "behavioral": ["behavioral"],
-                    "hr":         ["behavioral"],  # fallback to behavioral for HR
-                    "combined":   None,             # no filter – allow all
-                }
-                import random
+                # 2. Decide next action & fetch RAG question (prefetched while listening)
                 question_context = None
-                allowed_categories = _TYPE_CATEGORY_MAP.get(self.state.interview_type, None)
 
                 # Get dynamic decision from Intelligent Decision Engine
                 decision = self.decision_engine.evaluate(user_text, self.state.difficulty)
@@ -509,36 +622,7 @@ class InterviewManager:
 
                 if self.question_bank and self.question_bank.is_indexed:
                     if action == self.decision_engine.ACTION_RAG_NEW_TOPIC:
-                        combined_skills = self.state.resume_skills + getattr(self.state, 'jd_skills', [])
-                        if combined_skills:
-                            query_str = random.choice(combined_skills)
-                        else:
-                            query_str = "general software engineering"
-
-                        # Try each allowed category; pick best hit
-                        if allowed_categories:
-                            cat = random.choice(allowed_categories)
-                            results = self.question_bank.retrieve_questions(
-                                query=query_str,
-                                difficulty=self.state.difficulty.lower(),
-                                category=cat,
-                                top_k=5,
-                                exclude_ids=self.state.asked_question_ids,
-                            )
-                            if not results:
-                                results = self.question_bank.retrieve_questions(
-                                    query=query_str,
-                                    difficulty=self.state.difficulty.lower(),
-                                    top_k=5,
-                                    exclude_ids=self.state.asked_question_ids,
-                                )
-                        else:
-                            results = self.question_bank.retrieve_questions(
-                                query=query_str,
-                                difficulty=self.state.difficulty.lower(),
-                                top_k=5,
-                                exclude_ids=self.state.asked_question_ids,
-                            )
+                        results = prefetch.candidates(self.state.difficulty)
                         if results:
                             question_context = random.choice(results)
                         else:
@@ -596,9 +680,14 @@ class InterviewManager:
                     print(f"[Error] LLM crashed: {llm_e}")
                     self._generate_opening_question()  # Emergency fallback
                         
-                self.audio_responses.append(str(temp_wav))
+                self.audio_responses.append(audio_data)
                 self.state.question_count += 1
 
+                if settings.ENABLE_PER_QUESTION_EVAL and answered_question:
+                    self._pending_scores.append(
+                        get_turn_scorer().submit(answered_question, user_text, answered_context)
+                    )
+
             except KeyboardInterrupt:
                 print("\n[!] Interview interrupted by user")
                 break
@@ -607,22 +696,22 @@ class InterviewManager:
                 import traceback
                 traceback.print_exc()
                 break
+            finally:
+                # Runs on every continue/break too: an abandoned turn's
+                # retrieval and warm-up must not hold up the next turn's.
+                if prefetch is not None:
+                    prefetch.cancel()
 
         self.end_session()
 
     def _generate_opening_question(self) -> None:
         """Generate the first interview question based on resume/JD context."""
-        
-        # Map interview type → opening question category filter
-        _TYPE_CATEGORY_MAP = {
-            "technical":  ["dsa", "os", "database", "backend", "ml", "general_technical"],
-            "behavioral": ["behavioral"],
-            "hr":         ["behavioral"],
-            "combined":   None,
-        }
-        import random
+        self._speak_opening_question(self._select_opening_question())
+
+    def _select_opening_question(self) -> dict | None:
+        """Pick the opening question-bank entry (None without a question bank)."""
         question_context = None
-        allowed_categories = _TYPE_CATEGORY_MAP.get(self.state.interview_type, None)
+        allowed_categories = TYPE_CATEGORY_MAP.get(self.state.interview_type, None)
 
         if self.question_bank and self.question_bank.is_indexed:
             combined_skills = self.state.resume_skills + getattr(self.state, 'jd_skills', [])
@@ -656,22 +745,26 @@ class InterviewManager:
                 self.state.asked_question_ids.append(question_context["id"])
                 self.state.current_question_context = question_context
 
+        return question_context
+
+    def _speak_opening_question(self, question_context: dict | None) -> None:
+        """Speak the scripted opener and record it in the LLM history."""
         print("[Status] Preparing first question...")
         
         # Bypass LLM generation entirely for the first question to achieve instant startup
         def instant_question_generator():
-            yield "Hello, let's begin the interview. "
+            yield OPENING_GREETING + " "
             if question_context and "question" in question_context:
                 yield question_context["question"] + " "
             else:
-                yield "Could you start by walking me through your background? "
+                yield OPENING_FALLBACK_QUESTION + " "
 
         # Eagerly evaluate the string so we can inject it into the LLM history
-        first_q_str = "Hello, let's begin the interview. "
+        first_q_str = OPENING_GREETING + " "
         if question_context and "question" in question_context:
             first_q_str += question_context["question"]
         else:
-            first_q_str += "Could you start by walking me through your background?"
+            first_q_str += OPENING_FALLBACK_QUESTION
 
         if self.brain:
             # Gemma4 requires conversations to start with a 'user' message.
@@ -686,6 +779,29 @@ class InterviewManager:
 
     # ── End Session ───────────────────────────────────────────────
 
+    def _last_question(self) -> str:
+        """The most recent interviewer message, i.e. what the candidate just answered."""
+        for msg in reversed(self.brain.get_history() if self.brain else []):
+            if msg['role'] == 'assistant':
+                return msg['content']
+        return ""
+
+    def _analyze_speech(self, history: list[dict]) -> dict | None:
+        """Batched emotion + prosody analysis over every recorded turn."""
+        if not (self.sentiment_analyzer and self.audio_responses):
+            return None
+        print("[Report] Analyzing sentiment and speech quality...")
+        # Filter out the synthetic opener
+        user_turns = [msg for msg in history if msg['role'] == 'user' and msg['content'] != "Begin the interview."]
+        turns = [(audio, turn['content']) for audio, turn in zip(self.audio_responses, user_turns)
+                 if len(audio)]
+        if not turns:
+            return None
+        from src.ears.sentiment_analyzer import summarize_session
+        return summarize_session(self.sentiment_analyzer.analyze_batch(
+            [audio for audio, _ in turns], [text for _, text in turns]
+        ))
+
     def end_session(self):
         print("\n--- Session Ended ---")
 
@@ -697,50 +813,38 @@ class InterviewManager:
 
         try:
             history = self.brain.get_history()
+            self.state.per_question_scores.extend(
+                collect_scores(self._pending_scores, settings.TURN_SCORE_WAIT_SECONDS)
+            )
+            self._pending_scores = []
 
+            # LLM evaluation, speech analysis and proctoring aggregation are
+            # independent; run them side by side rather than back to back.
             print(f"\n[Report] Generating evaluation report...")
-            report = self.evaluator.generate_report(
-                history,
-                per_question_scores=self.state.per_question_scores or None,
-            )
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                report_future = executor.submit(
+                    self.evaluator.generate_report,
+                    history,
+                    per_question_scores=self.state.per_question_scores or None,
+                )
+                speech_future = executor.submit(self._analyze_speech, history)
+                proctoring_future = (
+                    executor.submit(self.proctoring.get_violations_summary)
+                    if self.proctoring else None
+                )
+                report = report_future.result()
             report["transcript"] = history
 
-            if self.sentiment_analyzer and self.audio_responses:
-                try:
-                    print("[Report] Analyzing sentiment and speech quality...")
-                    sentiment_results = []
-                    # Filter out the synthetic opener
-                    user_turns = [msg for msg in history if msg['role'] == 'user' and msg['content'] != "Begin the interview."]
-                    
-                    for i, audio_path in enumerate(self.audio_responses):
-                        if i < len(user_turns) and Path(audio_path).exists():
-                            result = self.sentiment_analyzer.analyze_full(audio_path, user_turns[i]['content'])
-                            sentiment_results.append(result)
-
-                    if sentiment_results:
-                        avg_confidence = np.mean([r['confidence_score'] for r in sentiment_results])
-                        all_emotions = {}
-                        for r in sentiment_results:
-                            for emotion, score in r['emotions'].items():
-                                all_emotions[emotion] = all_emotions.get(emotion, 0) + score
-
-                        dominant_emotion = max(all_emotions.items(), key=lambda x: x[1])[0] if all_emotions else "neutral"
-                        total_fillers = sum(r['fillers']['total_fillers'] for r in sentiment_results)
-                        avg_wpm = np.mean([r['speech_metrics'].get('wpm', 0) for r in sentiment_results])
-
-                        report["sentiment_analysis"] = {
-                            "average_confidence": round(avg_confidence, 2),
-                            "dominant_emotion": dominant_emotion,
-                            "speaking_pace_wpm": round(avg_wpm, 1),
-                            "total_filler_words": total_fillers,
-                            "detailed_results": sentiment_results,
-                        }
-                except Exception as e:
-                    logger.warning(f"Sentiment analysis failed: {e}")
+            try:
+                sentiment_analysis = speech_future.result()
+                if sentiment_analysis:
+                    report["sentiment_analysis"] = sentiment_analysis
+            except Exception as e:
+                logger.warning(f"Sentiment analysis failed: {e}")
 
             if self.proctoring:
                 try:
-                    violations_summary = self.proctoring.get_violations_summary()
+                    violations_summary = proctoring_future.result()
                     report["proctoring"] = violations_summary
 
                     # Print enriched risk summary
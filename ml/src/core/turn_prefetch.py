@@ -0,0 +1,80 @@
+"""Speculative preparation of the next interview turn.
+
+The next question depends on the candidate's answer: ``DecisionEngine``
+either drills down or moves to a new question-bank topic at a new
+difficulty. The branches that don't depend on the answer's text can be
+prepared while the candidate is still speaking:
+
+- question-bank candidates for every difficulty the decision can land on;
+- Ollama's KV cache for the system prompt plus the history window, which
+  every branch shares.
+
+Once the decision is known, the chosen branch is already prepared. The
+turn then costs little more than the LLM decode.
+"""
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Iterable
+
+logger = logging.getLogger("TurnPrefetch")
+
+PREFETCH_WAIT_SECONDS = 2.0  # max wait for an in-flight prefetch before retrieving directly
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="turn-prefetch")
+
+
+class TurnPrefetcher:
+    """Prefetch for one turn. Create it when listening starts, read it after the decision."""
+
+    def __init__(self, retrieve: Callable[[str], list[dict]] | None,
+                 difficulties: Iterable[str],
+                 warm: Callable[[], None] | None = None) -> None:
+        """
+        Args:
+            retrieve: ``difficulty -> candidates`` for a new topic (None
+                      without a question bank).
+            difficulties: Difficulties the next decision can produce.
+            warm: Prefills the LLM prompt prefix.
+        """
+        self._retrieve = retrieve
+        self._difficulties = sorted(set(difficulties))
+        self._warm = warm
+        self._candidates: dict[str, Future] = {}
+        self._warm_future: Future | None = None
+
+    def start(self) -> "TurnPrefetcher":
+        """Launch the prefetch jobs in the background; returns self."""
+        if self._warm is not None:
+            self._warm_future = _executor.submit(self._warm)
+        if self._retrieve is not None:
+            for difficulty in self._difficulties:
+                self._candidates[difficulty] = _executor.submit(self._retrieve, difficulty)
+        return self
+
+    def candidates(self, difficulty: str) -> list[dict]:
+        """New-topic candidates for ``difficulty``.
+
+        Served from the prefetch when available; otherwise (difficulty not
+        prefetched, prefetch failed or still running after
+        ``PREFETCH_WAIT_SECONDS``) retrieved directly.
+        """
+        if self._retrieve is None:
+            return []
+        future = self._candidates.get(difficulty)
+        if future is not None:
+            try:
+                results = future.result(timeout=PREFETCH_WAIT_SECONDS)
+                logger.debug(f"Prefetch hit for {difficulty}: {len(results)} candidates")
+                return results
+            except FutureTimeout:
+                logger.info("Prefetch still running; retrieving directly")
+            except Exception as e:
+                logger.warning(f"Prefetch failed: {e}")
+        return self._retrieve(difficulty)
+
+    def cancel(self) -> None:
+        """Drop jobs that haven't started (e.g. the turn was abandoned)."""
+        for future in self._candidates.values():
+            future.cancel()
+        if self._warm_future is not None:
+            self._warm_future.cancel()
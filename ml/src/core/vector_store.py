@@ -0,0 +1,270 @@
+"""Append-only, memory-mapped store of fixed-width embedding vectors.
+
+One store holds vectors of a single width and dtype in two files:
+
+- ``<stem>.vec``: raw rows, ``dim * itemsize`` bytes each, appended in
+  write order and read through ``np.memmap``.
+- ``<stem>.idx``: fixed 48-byte records (sha256 digest, row, timestamp),
+  appended after the row they point to.
+
+Opening a store reads the index file in one go, so startup cost does not
+grow with the number of files. Several processes can share a store: writers
+take an exclusive ``fcntl`` lock, and readers take a shared lock whenever
+they pick up other processes' appends. Compaction rewrites both files and
+atomically swaps them in. Readers notice the inode change and reload.
+
+Eviction is least-recently-used only within one open store: reads reorder
+the in-memory index but are not written back, so after a reopen, and across
+processes, entries are evicted in write order (FIFO), and an entry read on
+every turn is still evicted once it is the oldest write. This is a deliberate
+deviation from LRU: persisting recency would turn every cache hit into a
+locked index append. TTLs always count from the write timestamp, so reading
+an entry never extends its lifetime; an expired key is re-appended when it
+is written again, and compaction drops expired rows.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: locking is per-process only
+    fcntl = None
+
+logger = logging.getLogger("VectorStore")
+
+INDEX_RECORD = np.dtype([("key", "S32"), ("row", "<i8"), ("ts", "<f8")])
+COMPACT_KEEP_RATIO = 0.75
+
+
+class VectorStore:
+    """Size-bounded vector store keyed by 32-byte digests.
+
+    Evicts least-recently-used entries as seen by this instance, falling
+    back to write order for entries it has not read (see module docstring).
+    """
+
+    def __init__(self, directory: str | Path, dim: int, dtype: str = "float16",
+                 max_entries: int = 50000) -> None:
+        """
+        Args:
+            directory: Existing directory holding the store files.
+            dim: Vector width.
+            dtype: On-disk element type (``float16`` or ``float32``).
+            max_entries: Entry count that triggers compaction down to
+                         ``COMPACT_KEEP_RATIO`` of the bound.
+        """
+        self.directory = Path(directory)
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.max_entries = max_entries
+        self.row_bytes = dim * self.dtype.itemsize
+
+        stem = f"emb_{dim}_{self.dtype.name}"
+        self.data_path = self.directory / f"{stem}.vec"
+        self.index_path = self.directory / f"{stem}.idx"
+        self.lock_path = self.directory / f"{stem}.lock"
+
+        # digest → (row, write timestamp), in least- to most-recently-used order
+        # for this instance; loaded from disk in write order
+        self._index: OrderedDict[bytes, tuple[int, float]] = OrderedDict()
+        self._index_offset = 0
+        self._file_ids: tuple | None = None
+        self._mmap: np.memmap | None = None
+        self._mapped_rows = 0
+        self._lock = threading.RLock()
+
+        with self._lock, self._file_lock(shared=True):
+            self._refresh_locked()
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def get_many(self, keys: list[bytes], ttl: float | None = None) -> list[np.ndarray | None]:
+        """Look up vectors by digest. Returns float32 copies or None per key."""
+        return [None if entry is None else entry[0] for entry in self.get_entries(keys, ttl)]
+
+    def get_entries(self, keys: list[bytes],
+                    ttl: float | None = None) -> list[tuple[np.ndarray, float] | None]:
+        """Like ``get_many``, but each hit is ``(vector, write timestamp)``."""
+        with self._lock:
+            if any(k not in self._index for k in keys):
+                # Another process may have written them since our last look.
+                with self._file_lock(shared=True):
+                    self._refresh_locked()
+
+            now = time.time()
+            results = []
+            for key in keys:
+                hit = self._index.get(key)
+                if hit is None or hit[0] >= self._mapped_rows:
+                    results.append(None)
+                    continue
+                row, ts = hit
+                if ttl is not None and now - ts >= ttl:
+                    results.append(None)
+                    continue
+                self._index.move_to_end(key)
+                results.append((np.array(self._mmap[row], dtype=np.float32), ts))
+            return results
+
+    def put_many(self, keys: list[bytes], vectors: np.ndarray,
+                 timestamps: list[float] | None = None,
+                 ttl: float | None = None) -> int:
+        """Append vectors for keys not already stored. Returns rows written.
+
+        ``timestamps`` carries over original write times (e.g. when migrating
+        older cache entries); new entries are stamped with the current time.
+        With ``ttl``, keys whose stored entry has expired are written again
+        (the new index record supersedes the old one), and compaction
+        triggered by this write drops expired rows.
+        """
+        vectors = np.asarray(vectors, dtype=self.dtype).reshape(-1, self.dim)
+        now = time.time()
+        if timestamps is None:
+            timestamps = [now] * len(vectors)
+        with self._lock, self._file_lock(shared=False):
+            self._refresh_locked()
+            fresh = {}
+            for key, vec, ts in zip(keys, vectors, timestamps):
+                hit = self._index.get(key)
+                if (hit is None or hit[0] >= self._mapped_rows
+                        or (ttl is not None and now - hit[1] >= ttl)):
+                    fresh[key] = (vec, ts)
+            if not fresh:
+                return 0
+
+            with open(self.data_path, "ab") as data:
+                size = data.seek(0, os.SEEK_END)
+                if size % self.row_bytes:
+                    # A writer died mid-row; drop the torn tail.
+                    size -= size % self.row_bytes
+                    data.truncate(size)
+                first_row = size // self.row_bytes
+                data.write(np.ascontiguousarray([vec for vec, _ in fresh.values()]).tobytes())
+
+            records = np.zeros(len(fresh), dtype=INDEX_RECORD)
+            records["key"] = list(fresh)
+            records["row"] = np.arange(first_row, first_row + len(fresh))
+            records["ts"] = [ts for _, ts in fresh.values()]
+            # Rows first, then the index: readers never see a record whose
+            # row is not on disk yet.
+            with open(self.index_path, "ab") as index:
+                index.write(records.tobytes())
+
+            self._refresh_locked()
+            if len(self._index) > self.max_entries:
+                self._compact_locked(ttl)
+            return len(fresh)
+
+    def compact(self, ttl: float | None = None) -> None:
+        """Rewrite the store keeping the most recently used live entries.
+
+        Recency is this instance's view (see module docstring).
+        """
+        with self._lock, self._file_lock(shared=False):
+            self._refresh_locked()
+            self._compact_locked(ttl)
+
+    def clear(self) -> None:
+        """Delete the store files."""
+        with self._lock, self._file_lock(shared=False):
+            for path in (self.index_path, self.data_path):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            self._reset()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    @contextmanager
+    def _file_lock(self, shared: bool):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a+") as fh:
+            fcntl.flock(fh, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _reset(self) -> None:
+        self._index.clear()
+        self._index_offset = 0
+        self._file_ids = None
+        self._mmap = None
+        self._mapped_rows = 0
+
+    def _refresh_locked(self) -> None:
+        """Pick up appended records and rows (caller holds a file lock)."""
+        try:
+            index_stat = self.index_path.stat()
+            data_stat = self.data_path.stat()
+        except FileNotFoundError:
+            self._reset()
+            return
+
+        file_ids = (index_stat.st_ino, data_stat.st_ino)
+        if file_ids != self._file_ids or index_stat.st_size < self._index_offset:
+            # Compacted or cleared by another process.
+            self._reset()
+            self._file_ids = file_ids
+
+        usable = index_stat.st_size - (index_stat.st_size % INDEX_RECORD.itemsize)
+        if usable > self._index_offset:
+            with open(self.index_path, "rb") as index:
+                index.seek(self._index_offset)
+                records = np.frombuffer(index.read(usable - self._index_offset),
+                                        dtype=INDEX_RECORD)
+            for key, row, ts in zip(records["key"].tolist(), records["row"].tolist(),
+                                    records["ts"].tolist()):
+                # numpy strips trailing NULs from S32; pad back to 32 bytes.
+                key = key.ljust(32, b"\0")
+                self._index[key] = (row, ts)
+                self._index.move_to_end(key)
+            self._index_offset = usable
+
+        rows = data_stat.st_size // self.row_bytes
+        if rows > self._mapped_rows:
+            self._mmap = np.memmap(self.data_path, dtype=self.dtype, mode="r",
+                                   shape=(rows, self.dim))
+            self._mapped_rows = rows
+
+    def _compact_locked(self, ttl: float | None = None) -> None:
+        """Rewrite both files with the newest entries (exclusive lock held)."""
+        now = time.time()
+        live = [
+            (key, row, ts) for key, (row, ts) in self._index.items()
+            if row < self._mapped_rows and (ttl is None or now - ts < ttl)
+        ]
+        keep = live[-int(self.max_entries * COMPACT_KEEP_RATIO):] if live else []
+
+        tmp_data = self.data_path.with_suffix(".vec.tmp")
+        tmp_index = self.index_path.with_suffix(".idx.tmp")
+        records = np.zeros(len(keep), dtype=INDEX_RECORD)
+        if keep:
+            records["key"] = [k for k, _, _ in keep]
+            records["row"] = np.arange(len(keep))
+            records["ts"] = [ts for _, _, ts in keep]
+            rows = self._mmap[[row for _, row, _ in keep]]
+        else:
+            rows = np.empty((0, self.dim), dtype=self.dtype)
+        tmp_data.write_bytes(np.ascontiguousarray(rows).tobytes())
+        tmp_index.write_bytes(records.tobytes())
+        os.replace(tmp_data, self.data_path)
+        os.replace(tmp_index, self.index_path)
+
+        logger.info(f"Compacted {self.data_path.name}: "
+                    f"{len(self._index)} → {len(keep)} entries")
+        self._reset()
+        self._refresh_locked()
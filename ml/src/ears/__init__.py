@@ -1,5 +1,7 @@
 from src.ears.sentiment_analyzer import SentimentAnalyzer
 from src.ears.stt_engine import STTEngine
+from src.ears.streaming_stt import StreamingTranscriber
+from src.ears.stt_service import STTService, get_stt_service
 from src.ears.vad import VoiceRecorder
 
-__all__ = ["SentimentAnalyzer", "STTEngine", "VoiceRecorder"]
+__all__ = ["SentimentAnalyzer", "STTEngine", "StreamingTranscriber", "STTService", "get_stt_service", "VoiceRecorder"]
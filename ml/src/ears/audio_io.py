@@ -0,0 +1,91 @@
+"""In-memory audio decoding.
+
+Uploads and WebSocket blobs are decoded straight from memory into a
+16 kHz mono float32 array. The same array is then handed to Whisper, the
+emotion model and the speech metrics, so nothing is written to disk or
+decoded twice.
+
+- WAV/FLAC/OGG-Vorbis already at the target rate go through libsndfile,
+  which is the cheapest path.
+- Everything else (browser webm/opus, mp4/m4a, mp3, or a rate that needs
+  resampling) goes through PyAV via ``faster_whisper.decode_audio``. PyAV
+  reads from an in-memory file object.
+"""
+import io
+import logging
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger("AudioIO")
+
+TARGET_SAMPLE_RATE = 16000
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
+# Containers libsndfile can read, identified by magic bytes.
+_SNDFILE_MAGIC = (b"RIFF", b"fLaC", b"OggS")
+
+
+def decode_audio(source, sample_rate: int = TARGET_SAMPLE_RATE) -> np.ndarray:
+    """Decode audio into a mono float32 array at ``sample_rate``.
+
+    Args:
+        source: Encoded audio as ``bytes``/``bytearray``/``memoryview``, a file
+                path, or an already-decoded array (assumed to be at
+                ``sample_rate``; it is only converted to mono float32).
+        sample_rate: Output rate.
+
+    Returns:
+        1-D float32 array (empty for empty input).
+
+    Raises:
+        ValueError: If the input is too large or cannot be decoded.
+    """
+    if isinstance(source, np.ndarray):
+        audio = source.astype(np.float32, copy=False)
+        return audio.mean(axis=1) if audio.ndim > 1 else audio
+
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.stat().st_size > MAX_AUDIO_BYTES:
+            raise ValueError(f"Audio file too large: {path.stat().st_size} bytes")
+        return _decode_stream(path, lambda: open(path, "rb"), sample_rate)
+
+    data = memoryview(source)
+    if data.nbytes == 0:
+        return np.empty(0, dtype=np.float32)
+    if data.nbytes > MAX_AUDIO_BYTES:
+        raise ValueError(f"Audio too large: {data.nbytes} bytes")
+    return _decode_stream("<memory>", lambda: io.BytesIO(data), sample_rate)
+
+
+def _decode_stream(label, open_stream, sample_rate: int) -> np.ndarray:
+    with open_stream() as stream:
+        head = stream.read(4)
+        stream.seek(0)
+        if head in _SNDFILE_MAGIC:
+            audio = _decode_sndfile(stream, sample_rate)
+            if audio is not None:
+                return audio
+            stream.seek(0)
+        try:
+            from faster_whisper import decode_audio as av_decode
+        except ImportError as e:
+            raise ValueError("Compressed audio needs faster-whisper (PyAV) installed") from e
+        try:
+            return np.asarray(av_decode(stream, sampling_rate=sample_rate), dtype=np.float32)
+        except Exception as e:
+            raise ValueError(f"Could not decode audio from {label}: {e}") from e
+
+
+def _decode_sndfile(stream, sample_rate: int) -> np.ndarray | None:
+    """libsndfile fast path; None if the file needs resampling or isn't readable."""
+    try:
+        import soundfile as sf
+        audio, rate = sf.read(stream, dtype="float32", always_2d=False)
+    except Exception as e:
+        logger.debug(f"libsndfile could not read stream, falling back to PyAV: {e}")
+        return None
+    if rate != sample_rate:
+        return None
+    return audio.mean(axis=1) if audio.ndim > 1 else audio
@@ -5,6 +5,7 @@ from typing import Optional
 import torch
 import numpy as np
 import librosa
+from scipy.signal import resample_poly
 from transformers import Wav2Vec2ForSequenceClassification, Wav2Vec2FeatureExtractor
 
 from config import settings
@@ -15,6 +16,16 @@ SAMPLE_RATE = 16000
 MIN_AUDIO_DURATION = 1.0
 MIN_ENERGY_THRESHOLD = 0.001
 MIN_PREDICTION_CONFIDENCE = 0.2
+EMOTION_BATCH_SIZE = 8
+
+# Pitch tracking runs at SAMPLE_RATE / PITCH_DECIMATION (8 kHz): plenty for
+# speech F0, at half the samples YIN has to scan.
+PITCH_DECIMATION = 2
+PITCH_FMIN = 65.0
+PITCH_FMAX = 400.0
+PITCH_FRAME_LENGTH = 512  # 64 ms at 8 kHz: > two periods of PITCH_FMIN
+PITCH_HOP_LENGTH = 160  # 20 ms
+VOICED_RMS_THRESHOLD = 0.01
 
 
 class SentimentAnalyzer:
@@ -39,78 +50,129 @@ class SentimentAnalyzer:
             self.feature_extractor = None
             self.model = None
 
-    def analyze_emotion(self, audio_path: str) -> dict[str, float]:
-        """Detect emotions from audio using Wav2Vec2."""
-        if not self.model:
-            return {"neutral": 1.0}
+    @staticmethod
+    def _load_waveform(audio) -> np.ndarray:
+        """Return mono float32 audio at SAMPLE_RATE from a path or a decoded array.
 
-        try:
-            import soundfile as sf
+        Arrays are assumed to already be at SAMPLE_RATE (see ``decode_audio``).
+        """
+        if isinstance(audio, np.ndarray):
+            waveform = audio.astype(np.float32, copy=False)
+            return waveform.mean(axis=1) if waveform.ndim > 1 else waveform
 
-            waveform, sample_rate = sf.read(audio_path, dtype='float32')
+        import soundfile as sf
+        waveform, sample_rate = sf.read(audio, dtype='float32')
+        if len(waveform.shape) > 1:
+            waveform = np.mean(waveform, axis=1)
+        if sample_rate != SAMPLE_RATE:
+            waveform = librosa.resample(waveform, orig_sr=sample_rate, target_sr=SAMPLE_RATE)
+        return waveform
 
-            duration = len(waveform) / sample_rate
-            if duration < MIN_AUDIO_DURATION:
-                logger.warning(f"Audio too short ({duration:.2f}s), skipping emotion analysis")
-                return {"neutral": 1.0}
+    # ── Emotion ───────────────────────────────────────────────────
+
+    def analyze_emotion(self, audio: str | np.ndarray) -> dict[str, float]:
+        """Detect emotions from audio (file path or 16 kHz waveform) using Wav2Vec2."""
+        try:
+            waveform = self._load_waveform(audio)
+        except (OSError, RuntimeError, ValueError) as e:
+            logger.error(f"Emotion analysis failed: {e}")
+            return {"neutral": 1.0}
+        return self._emotions_batch([waveform])[0]
 
-            if len(waveform.shape) > 1:
-                waveform = np.mean(waveform, axis=1)
+    def _emotions_batch(self, waveforms: list[np.ndarray]) -> list[dict[str, float]]:
+        """Emotion distributions for several waveforms, inferred in padded batches.
 
-            if sample_rate != SAMPLE_RATE:
-                waveform = librosa.resample(waveform, orig_sr=sample_rate, target_sr=SAMPLE_RATE)
+        Clips too short or too quiet to classify get ``{"neutral": 1.0}``
+        without touching the model. The rest are sorted by length so each
+        batch pads as little as possible.
+        """
+        results: list[dict[str, float]] = [{"neutral": 1.0} for _ in waveforms]
+        if not self.model:
+            return results
 
-            energy = np.sqrt(np.mean(waveform ** 2))
+        eligible = []
+        for i, waveform in enumerate(waveforms):
+            duration = len(waveform) / SAMPLE_RATE
+            if duration < MIN_AUDIO_DURATION:
+                logger.warning(f"Audio too short ({duration:.2f}s), skipping emotion analysis")
+                continue
+            energy = float(np.sqrt(np.mean(waveform ** 2)))
             if energy < MIN_ENERGY_THRESHOLD:
                 logger.warning(f"Audio has very low energy ({energy:.6f}), likely silence")
-                return {"neutral": 1.0}
+                continue
+            eligible.append(i)
+        eligible.sort(key=lambda i: len(waveforms[i]))
 
-            inputs = self.feature_extractor(
-                waveform,
-                sampling_rate=SAMPLE_RATE,
-                return_tensors="pt",
-                padding=True
-            )
+        for start in range(0, len(eligible), EMOTION_BATCH_SIZE):
+            batch = eligible[start:start + EMOTION_BATCH_SIZE]
+            try:
+                inputs = self.feature_extractor(
+                    [waveforms[i] for i in batch],
+                    sampling_rate=SAMPLE_RATE,
+                    return_tensors="pt",
+                    padding=True,
+                    return_attention_mask=True,
+                )
+                with torch.no_grad():
+                    logits = self.model(**inputs).logits
+                    probs = torch.nn.functional.softmax(logits, dim=-1)
+            except (OSError, RuntimeError, ValueError) as e:
+                logger.error(f"Emotion analysis failed: {e}")
+                continue
 
-            with torch.no_grad():
-                logits = self.model(**inputs).logits
-                probs = torch.nn.functional.softmax(logits, dim=-1)[0]
+            for row, i in zip(probs, batch):
+                if float(row.max()) < MIN_PREDICTION_CONFIDENCE:
+                    logger.warning(f"Model predictions seem random (max prob: {float(row.max()):.3f})")
+                    continue
+                results[i] = {label: float(row[idx]) for idx, label in enumerate(self.emotion_labels)}
+                logger.debug(f"Emotion analysis: {results[i]}")
+        return results
 
-            if float(probs.max()) < MIN_PREDICTION_CONFIDENCE:
-                logger.warning(f"Model predictions seem random (max prob: {float(probs.max()):.3f})")
-                return {"neutral": 1.0}
+    # ── Prosody ───────────────────────────────────────────────────
 
-            emotions = {label: float(probs[idx]) for idx, label in enumerate(self.emotion_labels)}
-            logger.debug(f"Emotion analysis: {emotions}")
-            return emotions
+    def calculate_speech_metrics(self, audio: str | np.ndarray, transcript: str) -> dict[str, float]:
+        """Calculate WPM, jitter, and shimmer from audio (file path or 16 kHz waveform)."""
+        try:
+            return self._speech_metrics(self._load_waveform(audio), transcript)
         except (OSError, RuntimeError, ValueError) as e:
-            logger.error(f"Emotion analysis failed: {e}")
-            return {"neutral": 1.0}
+            logger.error(f"Speech metrics calculation failed: {e}")
+            return {"wpm": 0, "jitter": 0, "shimmer": 0}
 
-    def calculate_speech_metrics(self, audio_path: str, transcript: str) -> dict[str, float]:
-        """Calculate WPM, jitter, and shimmer from audio."""
-        try:
-            y, sr = librosa.load(audio_path, sr=SAMPLE_RATE)
-            duration = librosa.get_duration(y=y, sr=sr)
+    @staticmethod
+    def _speech_metrics(y: np.ndarray, transcript: str) -> dict[str, float]:
+        """WPM, pitch jitter and loudness shimmer from one pass over the waveform.
 
-            word_count = len(transcript.split())
-            wpm = (word_count / duration) * 60 if duration > 0 else 0
+        Pitch is tracked with YIN on a ``PITCH_DECIMATION``-times decimated
+        copy, which covers the speech F0 range at a fraction of the cost of
+        ``piptrack`` over the full-rate spectrogram. Frame RMS on the same
+        grid gives shimmer and a voicing gate for the pitch values.
+        """
+        duration = len(y) / SAMPLE_RATE
+        word_count = len(transcript.split())
+        wpm = (word_count / duration) * 60 if duration > 0 else 0
 
-            pitches, _ = librosa.piptrack(y=y, sr=sr)
-            pitch_values = pitches[pitches > 0]
-            jitter = float(np.std(pitch_values) / (np.mean(pitch_values) + 1e-6)) if len(pitch_values) > 1 else 0.0
+        jitter = shimmer = 0.0
+        sr = SAMPLE_RATE // PITCH_DECIMATION
+        y_low = resample_poly(y, 1, PITCH_DECIMATION).astype(np.float32)
+        if len(y_low) >= PITCH_FRAME_LENGTH:
+            frames = librosa.util.frame(y_low, frame_length=PITCH_FRAME_LENGTH,
+                                        hop_length=PITCH_HOP_LENGTH)
+            rms = np.sqrt(np.mean(frames ** 2, axis=0))
+            if len(rms) > 1:
+                shimmer = float(np.std(rms) / (np.mean(rms) + 1e-6))
 
-            rms = librosa.feature.rms(y=y)[0]
-            shimmer = float(np.std(rms) / (np.mean(rms) + 1e-6)) if len(rms) > 1 else 0.0
+            f0 = librosa.yin(y_low, fmin=PITCH_FMIN, fmax=PITCH_FMAX, sr=sr,
+                             frame_length=PITCH_FRAME_LENGTH, hop_length=PITCH_HOP_LENGTH,
+                             center=False)
+            voiced = f0[rms[:len(f0)] >= VOICED_RMS_THRESHOLD]
+            if len(voiced) > 1:
+                jitter = float(np.std(voiced) / (np.mean(voiced) + 1e-6))
 
-            return {
-                "wpm": round(wpm, 1),
-                "jitter": round(jitter, 4),
-                "shimmer": round(shimmer, 4),
-            }
-        except (OSError, RuntimeError, ValueError) as e:
-            logger.error(f"Speech metrics calculation failed: {e}")
-            return {"wpm": 0, "jitter": 0, "shimmer": 0}
+        return {
+            "wpm": round(wpm, 1),
+            "jitter": round(jitter, 4),
+            "shimmer": round(shimmer, 4),
+        }
 
     def detect_fillers(self, transcript: str) -> dict:
         """Count filler words in transcript."""
@@ -127,12 +189,46 @@ class SentimentAnalyzer:
 
         return {"total_fillers": total_fillers, "filler_breakdown": filler_count}
 
-    def analyze_full(self, audio_path: str, transcript: str) -> dict:
+    # ── Full pipeline ─────────────────────────────────────────────
+
+    def analyze_full(self, audio: str | np.ndarray, transcript: str) -> dict:
         """Run full sentiment pipeline: emotion + speech metrics + fillers."""
-        emotions = self.analyze_emotion(audio_path)
-        speech_metrics = self.calculate_speech_metrics(audio_path, transcript)
-        fillers = self.detect_fillers(transcript)
+        return self.analyze_batch([audio], [transcript])[0]
 
+    def analyze_batch(self, audios: list, transcripts: list[str]) -> list[dict]:
+        """Analyze every turn of a session together.
+
+        Each clip is decoded once, and that waveform feeds both the prosody
+        metrics and a single batched emotion-model pass over all turns.
+
+        Args:
+            audios: File paths or 16 kHz waveforms, one per turn.
+            transcripts: Matching transcripts.
+
+        Returns:
+            One ``analyze_full``-shaped dict per turn.
+        """
+        waveforms = []
+        for audio in audios:
+            try:
+                waveforms.append(self._load_waveform(audio))
+            except (OSError, RuntimeError, ValueError) as e:
+                logger.error(f"Could not load audio for analysis: {e}")
+                waveforms.append(np.zeros(0, dtype=np.float32))
+
+        emotions_per_turn = self._emotions_batch(waveforms)
+        results = []
+        for waveform, transcript, emotions in zip(waveforms, transcripts, emotions_per_turn):
+            try:
+                speech_metrics = self._speech_metrics(waveform, transcript)
+            except (RuntimeError, ValueError) as e:
+                logger.error(f"Speech metrics calculation failed: {e}")
+                speech_metrics = {"wpm": 0, "jitter": 0, "shimmer": 0}
+            results.append(self._summarize(emotions, speech_metrics, self.detect_fillers(transcript)))
+        return results
+
+    @staticmethod
+    def _summarize(emotions: dict, speech_metrics: dict, fillers: dict) -> dict:
         dominant_emotion = max(emotions.items(), key=lambda x: x[1])[0]
 
         confidence_score = 0.5
@@ -148,3 +244,21 @@ class SentimentAnalyzer:
             "fillers": fillers,
             "confidence_score": max(0, min(1, confidence_score)),
         }
+
+
+def summarize_session(results: list[dict]) -> dict | None:
+    """Aggregate per-turn ``analyze_batch`` results into the report section."""
+    if not results:
+        return None
+    all_emotions: dict[str, float] = {}
+    for r in results:
+        for emotion, score in r['emotions'].items():
+            all_emotions[emotion] = all_emotions.get(emotion, 0) + score
+
+    return {
+        "average_confidence": round(float(np.mean([r['confidence_score'] for r in results])), 2),
+        "dominant_emotion": max(all_emotions.items(), key=lambda x: x[1])[0] if all_emotions else "neutral",
+        "speaking_pace_wpm": round(float(np.mean([r['speech_metrics'].get('wpm', 0) for r in results])), 1),
+        "total_filler_words": sum(r['fillers']['total_fillers'] for r in results),
+        "detailed_results": results,
+    }
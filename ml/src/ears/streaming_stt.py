@@ -0,0 +1,202 @@
+"""Incremental speech-to-text over a live PCM stream.
+
+Audio arrives as small 16-bit PCM frames while the candidate speaks.
+``StreamingTranscriber`` splits the stream into utterance segments using a
+cheap energy VAD:
+
+- A segment closes after ``STT_SEGMENT_SILENCE_MS`` of silence, or when it
+  reaches ``STT_MAX_SEGMENT_SECONDS``. Each closed segment is decoded once
+  with the full beam and its text is committed.
+- While a segment is still open it is re-decoded greedily every
+  ``STT_PARTIAL_INTERVAL_MS`` of new audio. The result is a partial
+  transcript that the UI can show.
+
+By the time the speaker stops, every earlier segment is already
+committed. Only the short trailing segment still needs a final decode.
+
+``append`` is cheap and may be called from the event loop. ``decode_pending``
+and ``finish`` run Whisper and belong on a worker thread.
+"""
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger("StreamingSTT")
+
+SUPPORTED_ENCODINGS = ("pcm_s16le",)
+VAD_FRAME_MS = 30
+PREROLL_MS = 300  # audio kept from before speech onset so first syllables survive
+MIN_PARTIAL_SECONDS = 0.3
+PARTIAL_BEAM_SIZE = 1
+FINAL_BEAM_SIZE = 5
+
+
+class StreamingTranscriber:
+    """VAD-segmented, incrementally decoded transcription of one utterance stream."""
+
+    def __init__(self, stt_engine, sample_rate: int = settings.STT_STREAM_SAMPLE_RATE,
+                 language: str | None = None, encoding: str = "pcm_s16le") -> None:
+        """
+        Args:
+            stt_engine: ``STTEngine`` (anything with ``transcribe_array``).
+            sample_rate: Rate of the incoming mono PCM.
+            language: Force language (None = detect on the first segment, then keep).
+            encoding: Frame encoding, one of ``SUPPORTED_ENCODINGS``.
+
+        Raises:
+            ValueError: For unsupported encodings (e.g. Opus; decode it client-side).
+        """
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f'Unsupported audio encoding "{encoding}". '
+                             f'Stream 16-bit mono PCM ("pcm_s16le").')
+        self.stt = stt_engine
+        self.sample_rate = sample_rate
+        self.language = language
+
+        self._frame_samples = max(1, sample_rate * VAD_FRAME_MS // 1000)
+        self._silence_limit = sample_rate * settings.STT_SEGMENT_SILENCE_MS // 1000
+        self._max_segment = int(sample_rate * settings.STT_MAX_SEGMENT_SECONDS)
+        self._partial_interval = sample_rate * settings.STT_PARTIAL_INTERVAL_MS // 1000
+
+        self._lock = threading.Lock()         # audio buffers (append vs. decode)
+        self._decode_lock = threading.Lock()  # one Whisper call at a time
+        self._pending_bytes = b""
+        self._frame_tail = np.empty(0, dtype=np.float32)
+        self._preroll: deque[np.ndarray] = deque(maxlen=max(1, PREROLL_MS // VAD_FRAME_MS))
+        self._current: list[np.ndarray] = []
+        self._current_samples = 0
+        self._in_speech = False
+        self._silence_samples = 0
+        self._since_partial = 0
+        self._closed: list[np.ndarray] = []
+
+        self._committed: list[str] = []
+        self._partial = ""
+        self._speech: list[np.ndarray] = []  # committed segments, for post-session analysis
+        self.total_samples = 0
+
+    # ── Ingest (cheap) ────────────────────────────────────────────
+
+    def append(self, pcm: bytes) -> bool:
+        """Add little-endian int16 mono PCM.
+
+        Returns:
+            True when a decode is due (a segment closed or enough new speech
+            arrived for a fresh partial); call ``decode_pending`` then.
+        """
+        with self._lock:
+            data = self._pending_bytes + pcm
+            usable = len(data) - (len(data) % 2)
+            self._pending_bytes = data[usable:]
+            samples = np.frombuffer(data[:usable], dtype="<i2").astype(np.float32) / 32768.0
+            self.total_samples += len(samples)
+
+            samples = np.concatenate([self._frame_tail, samples])
+            n_frames = len(samples) // self._frame_samples
+            self._frame_tail = samples[n_frames * self._frame_samples:]
+            if n_frames:
+                frames = samples[:n_frames * self._frame_samples].reshape(n_frames, -1)
+                energy = np.sqrt(np.mean(frames ** 2, axis=1))
+                for frame, loud in zip(frames, energy >= settings.STT_VAD_ENERGY_THRESHOLD):
+                    self._ingest_frame_locked(frame, bool(loud))
+
+            return bool(self._closed) or (
+                self._in_speech and self._since_partial >= self._partial_interval
+            )
+
+    def _ingest_frame_locked(self, frame: np.ndarray, loud: bool) -> None:
+        if not self._in_speech:
+            if not loud:
+                self._preroll.append(frame)
+                return
+            self._in_speech = True
+            self._current = list(self._preroll)
+            self._current_samples = sum(len(f) for f in self._current)
+            self._preroll.clear()
+
+        self._current.append(frame)
+        self._current_samples += len(frame)
+        self._since_partial += len(frame)
+        self._silence_samples = 0 if loud else self._silence_samples + len(frame)
+
+        if self._silence_samples >= self._silence_limit or self._current_samples >= self._max_segment:
+            self._close_segment_locked()
+
+    def _close_segment_locked(self) -> None:
+        if self._current:
+            self._closed.append(np.concatenate(self._current))
+        self._current = []
+        self._current_samples = 0
+        self._in_speech = False
+        self._silence_samples = 0
+        self._since_partial = 0
+
+    # ── Decode (blocking, worker thread) ──────────────────────────
+
+    def decode_pending(self) -> str:
+        """Commit closed segments and refresh the partial for the open one.
+
+        Returns:
+            Committed text plus the current partial hypothesis.
+        """
+        with self._decode_lock:
+            with self._lock:
+                closed, self._closed = self._closed, []
+                open_audio = np.concatenate(self._current) if self._current else None
+                self._since_partial = 0
+
+            self._commit(closed)
+            partial = ""
+            if open_audio is not None and len(open_audio) >= MIN_PARTIAL_SECONDS * self.sample_rate:
+                partial = self._decode(open_audio, PARTIAL_BEAM_SIZE)
+            self._partial = partial
+            return self.text
+
+    def finish(self) -> str:
+        """Flush the trailing segment and return the final transcript."""
+        with self._decode_lock:
+            with self._lock:
+                if self._frame_tail.size and self._in_speech:
+                    self._current.append(self._frame_tail)
+                self._frame_tail = np.empty(0, dtype=np.float32)
+                self._close_segment_locked()
+                closed, self._closed = self._closed, []
+
+            self._commit(closed)
+            self._partial = ""
+            text = self.text
+            logger.info(f"Stream finished: {self.total_samples / self.sample_rate:.1f}s audio, "
+                        f"{len(self._committed)} segments, {len(text)} chars")
+            return text
+
+    @property
+    def text(self) -> str:
+        """Committed text followed by the latest partial, if any."""
+        parts = self._committed + ([self._partial] if self._partial else [])
+        return " ".join(parts).strip()[:5000]
+
+    def speech_audio(self) -> np.ndarray:
+        """All committed speech segments, concatenated (silence between them dropped)."""
+        if not self._speech:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate(self._speech)
+
+    def _commit(self, segments: list[np.ndarray]) -> None:
+        self._speech.extend(segments)
+        for segment in segments:
+            text = self._decode(segment, FINAL_BEAM_SIZE)
+            if text:
+                self._committed.append(text)
+
+    def _decode(self, audio: np.ndarray, beam_size: int) -> str:
+        text, language = self.stt.transcribe_array(
+            audio, language=self.language, beam_size=beam_size,
+            sample_rate=self.sample_rate,
+        )
+        if self.language is None and text:
+            self.language = language  # skip re-detection on later segments
+        return text
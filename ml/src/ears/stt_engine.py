@@ -1,10 +1,13 @@
 import logging
+import numpy as np
 from faster_whisper import WhisperModel
 from config import settings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("STTEngine")
 
+WHISPER_SAMPLE_RATE = 16000
+
 class STTEngine:
     """Speech-to-Text engine using Faster Whisper."""
 
@@ -14,7 +17,9 @@ class STTEngine:
             self.model = WhisperModel(
                 settings.STT_MODEL_SIZE, 
                 device=settings.STT_DEVICE, 
-                compute_type="float16" if settings.STT_DEVICE == "cuda" else "int8"
+                compute_type="float16" if settings.STT_DEVICE == "cuda" else "int8",
+                # parallel decodes from STTService worker threads
+                num_workers=1 if settings.STT_DEVICE == "cuda" else settings.STT_WORKERS,
             )
             logger.info("Whisper Loaded Successfully.")
         except Exception as e:
@@ -65,3 +70,49 @@ class STTEngine:
         except Exception as e:
             logger.exception(f"Transcription failed for {audio_path}: {e}")
             return "", "en"
+
+    def transcribe_bytes(self, data: bytes, language: str | None = None) -> tuple[str, str]:
+        """Transcribe an encoded clip (webm/opus/wav/...) held in memory."""
+        from src.ears.audio_io import decode_audio
+        try:
+            audio = decode_audio(data, WHISPER_SAMPLE_RATE)
+        except ValueError as e:
+            logger.warning(f"Audio decode failed: {e}")
+            return "", "en"
+        return self.transcribe_array(audio, language=language, vad_filter=True)
+
+    def transcribe_array(self, audio: np.ndarray, language: str | None = None,
+                         beam_size: int = 5, sample_rate: int = WHISPER_SAMPLE_RATE,
+                         vad_filter: bool = False) -> tuple[str, str]:
+        """Transcribe in-memory mono float32 audio and return (text, detected_language).
+
+        Streaming segments are already speech, so they skip the VAD filter,
+        and their partial hypotheses decode greedily (``beam_size=1``).
+        Whole recorded answers pass ``vad_filter=True``, the same as
+        ``transcribe``.
+        """
+        if audio is None or len(audio) == 0:
+            return "", language or "en"
+
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if sample_rate != WHISPER_SAMPLE_RATE:
+            n_out = int(len(audio) * WHISPER_SAMPLE_RATE / sample_rate)
+            audio = np.interp(
+                np.linspace(0, len(audio) - 1, n_out), np.arange(len(audio)), audio
+            ).astype(np.float32)
+
+        try:
+            segments, info = self.model.transcribe(
+                audio,
+                language=language,
+                beam_size=beam_size,
+                condition_on_previous_text=False,
+                vad_filter=vad_filter,
+                vad_parameters=dict(min_silence_duration_ms=500) if vad_filter else None,
+            )
+            text = " ".join([segment.text for segment in segments]).strip()
+            detected_language = info.language if hasattr(info, 'language') else "en"
+            return text[:5000], detected_language
+        except Exception as e:
+            logger.exception(f"In-memory transcription failed ({len(audio)} samples): {e}")
+            return "", language or "en"
@@ -0,0 +1,242 @@
+"""Process-wide speech-to-text service.
+
+One ``STTService`` owns the Whisper model for the whole process and serves
+every session from a shared priority queue:
+
+- ``PRIORITY_LIVE``: final decodes the candidate is waiting on (end of an
+  answer).
+- ``PRIORITY_PARTIAL``: in-progress partial hypotheses, which only drive
+  the live caption.
+- ``PRIORITY_BACKGROUND``: post-session analysis; runs only when nothing
+  interactive is queued.
+
+Decodes run on ``STT_WORKERS`` threads against a single model. CTranslate2
+releases the GIL and runs concurrent calls on its own worker replicas
+(``num_workers``). On CUDA one worker owns the GPU so decodes never contend
+for VRAM.
+
+The service has the same ``transcribe``/``transcribe_bytes``/``transcribe_array``
+signatures as ``STTEngine``, so it can be used anywhere an engine is expected.
+"""
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger("STTService")
+
+PRIORITY_LIVE = 0
+PRIORITY_PARTIAL = 5
+PRIORITY_BACKGROUND = 10
+METRICS_WINDOW = 200  # recent jobs used for latency / RTF averages
+
+
+class STTService:
+    """Priority-queued Whisper inference shared by all sessions."""
+
+    def __init__(self, engine_factory: Callable | None = None,
+                 workers: int | None = None) -> None:
+        """
+        Args:
+            engine_factory: Builds the engine (default ``STTEngine``); called
+                            once, on the first request.
+            workers: Concurrent decodes (default ``settings.STT_WORKERS``,
+                     forced to 1 on CUDA).
+        """
+        if engine_factory is None:
+            from src.ears.stt_engine import STTEngine
+            engine_factory = STTEngine
+        if workers is None:
+            workers = 1 if settings.STT_DEVICE == "cuda" else settings.STT_WORKERS
+        self._engine_factory = engine_factory
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        self.workers = max(1, workers)
+
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._pending = {PRIORITY_LIVE: 0, PRIORITY_PARTIAL: 0, PRIORITY_BACKGROUND: 0}
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._waits: deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._rtfs: deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    # ── Engine-compatible API ─────────────────────────────────────
+
+    @property
+    def engine(self):
+        """The underlying ``STTEngine``, loaded on first use."""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._engine_factory()
+        return self._engine
+
+    def transcribe(self, audio_path: str, language: str | None = None,
+                   priority: int = PRIORITY_LIVE) -> tuple[str, str]:
+        """Queue a file transcription and wait for (text, detected_language)."""
+        return self.submit(
+            "transcribe", audio_path, language=language, priority=priority
+        ).result()
+
+    def transcribe_bytes(self, data: bytes, language: str | None = None,
+                         priority: int = PRIORITY_LIVE) -> tuple[str, str]:
+        """Decode an encoded clip on the calling thread, then queue its transcription.
+
+        Decoding happens before queueing, so workers spend their time on the
+        model and the job's audio length is known for RTF stats.
+        """
+        from src.ears.audio_io import decode_audio
+        try:
+            audio = decode_audio(data)
+        except ValueError as e:
+            logger.warning(f"Audio decode failed: {e}")
+            return "", "en"
+        return self.transcribe_array(audio, language=language, vad_filter=True,
+                                     priority=priority)
+
+    def transcribe_array(self, audio: np.ndarray, language: str | None = None,
+                         beam_size: int = 5, sample_rate: int = 16000,
+                         vad_filter: bool = False,
+                         priority: int | None = None) -> tuple[str, str]:
+        """Queue an in-memory transcription and wait for (text, detected_language).
+
+        Greedy decodes (``beam_size=1``) are partial hypotheses and default to
+        ``PRIORITY_PARTIAL``; anything else defaults to ``PRIORITY_LIVE``.
+        """
+        if priority is None:
+            priority = PRIORITY_PARTIAL if beam_size == 1 else PRIORITY_LIVE
+        return self.submit(
+            "transcribe_array", audio, language=language, beam_size=beam_size,
+            sample_rate=sample_rate, vad_filter=vad_filter, priority=priority,
+            audio_seconds=len(audio) / sample_rate if sample_rate else None,
+        ).result()
+
+    # ── Queue ─────────────────────────────────────────────────────
+
+    def submit(self, method: str, *args, priority: int = PRIORITY_LIVE,
+               audio_seconds: float | None = None, **kwargs) -> Future:
+        """Queue ``engine.<method>(*args, **kwargs)``.
+
+        Args:
+            method: Engine method name (``transcribe`` or ``transcribe_array``).
+            priority: Lower runs first; FIFO within a priority.
+            audio_seconds: Audio length, if known, for real-time-factor stats.
+
+        Returns:
+            Future resolving to the engine method's return value.
+        """
+        if self._closed:
+            raise RuntimeError("STTService is closed")
+        self._ensure_workers()
+        future: Future = Future()
+        with self._stats_lock:
+            self._pending[priority] = self._pending.get(priority, 0) + 1
+        self._queue.put((priority, next(self._seq), time.perf_counter(),
+                         method, args, kwargs, audio_seconds, future))
+        return future
+
+    def stats(self) -> dict:
+        """Queue depth per priority, latency and real-time factor."""
+        with self._stats_lock:
+            waits = list(self._waits)
+            rtfs = list(self._rtfs)
+            return {
+                "workers": self.workers,
+                "engine_loaded": self._engine is not None,
+                "queue_depth": sum(self._pending.values()),
+                "queue_depth_by_priority": {
+                    "live": self._pending.get(PRIORITY_LIVE, 0),
+                    "partial": self._pending.get(PRIORITY_PARTIAL, 0),
+                    "background": self._pending.get(PRIORITY_BACKGROUND, 0),
+                },
+                "in_flight": self._in_flight,
+                "completed_total": self._completed,
+                "failed_total": self._failed,
+                "avg_queue_wait_ms": round(1000 * sum(waits) / len(waits), 1) if waits else 0.0,
+                "avg_rtf": round(sum(rtfs) / len(rtfs), 3) if rtfs else None,
+                "max_rtf": round(max(rtfs), 3) if rtfs else None,
+            }
+
+    def close(self) -> None:
+        """Stop the workers after the queued jobs drain."""
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put((float("inf"), next(self._seq), 0.0, None, (), {}, None, None))
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self._threads = []
+
+    # ── Workers ───────────────────────────────────────────────────
+
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"stt-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            logger.info(f"STT service started with {self.workers} worker(s)")
+
+    def _worker(self) -> None:
+        while True:
+            priority, _, queued_at, method, args, kwargs, audio_seconds, future = self._queue.get()
+            if method is None:
+                return
+            started = time.perf_counter()
+            with self._stats_lock:
+                self._pending[priority] -= 1
+                self._in_flight += 1
+                self._waits.append(started - queued_at)
+
+            if not future.set_running_or_notify_cancel():
+                with self._stats_lock:
+                    self._in_flight -= 1
+                continue
+            try:
+                result = getattr(self.engine, method)(*args, **kwargs)
+            except BaseException as e:
+                with self._stats_lock:
+                    self._in_flight -= 1
+                    self._failed += 1
+                future.set_exception(e)
+                continue
+
+            elapsed = time.perf_counter() - started
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._completed += 1
+                if audio_seconds:
+                    self._rtfs.append(elapsed / audio_seconds)
+            future.set_result(result)
+
+
+_global_stt_service: Optional[STTService] = None
+_stt_service_lock = threading.Lock()
+
+
+def get_stt_service() -> STTService:
+    """Return singleton STTService instance."""
+    global _global_stt_service
+    if _global_stt_service is None:
+        with _stt_service_lock:
+            if _global_stt_service is None:
+                _global_stt_service = STTService()
+    return _global_stt_service
@@ -1,4 +1,5 @@
 from src.eyes.proctoring_engine import ProctoringEngine
 from src.eyes.proctoring_monitor import ProctoringMonitor
+from src.eyes.remote_proctoring import RemoteProctoringMonitor
 
-__all__ = ["ProctoringEngine", "ProctoringMonitor"]
+__all__ = ["ProctoringEngine", "ProctoringMonitor", "RemoteProctoringMonitor"]
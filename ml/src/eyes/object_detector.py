@@ -1,4 +1,10 @@
-"""YOLOv8-nano object detector for proctoring — detects phones, books, earpieces, and secondary screens."""
+"""YOLOv8-nano object detector for proctoring — detects phones, books, earpieces, and secondary screens.
+
+``YOLO_BACKEND`` selects the inference runtime: PyTorch, or a CPU export to
+ONNX Runtime / OpenVINO created beside ``YOLO_MODEL_PATH`` on first use.
+Exports use a dynamic batch axis so ``detect_batch`` can run several frames
+in one call. If the export fails (runtime not installed), PyTorch is used.
+"""
 import logging
 from pathlib import Path
 from typing import Optional
@@ -18,6 +24,12 @@ PROCTORING_CLASSES = {
     26: "handbag",
 }
 
+# Exported model locations for each non-PyTorch backend (as written by ultralytics)
+EXPORT_PATHS = {
+    "onnx": lambda pt: pt.with_suffix(".onnx"),
+    "openvino": lambda pt: pt.parent / f"{pt.stem}_openvino_model",
+}
+
 # Classes that specifically indicate earpiece / audio cheating
 EARPIECE_INDICATOR_CLASSES = {
     67: "cell phone",  # phone near ear
@@ -31,7 +43,12 @@ class ObjectDetector:
     Filters detections to only proctoring-relevant object classes.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, backend: str | None = None) -> None:
+        """
+        Args:
+            backend: "torch", "onnx" or "openvino" (default ``YOLO_BACKEND``).
+        """
+        self.backend = backend or settings.YOLO_BACKEND
         self._model = None
         self._available = False
         self._load_model()
@@ -58,6 +75,8 @@ class ObjectDetector:
                     shutil.move(str(src), str(model_path))
                     logger.info(f"Model saved to {model_path}")
 
+            if self.backend in EXPORT_PATHS:
+                self._model = self._load_export(YOLO, model_path)
             self._available = True
         except ImportError:
             logger.warning("ultralytics not installed — object detection disabled. pip install ultralytics")
@@ -66,6 +85,21 @@ class ObjectDetector:
             logger.error(f"YOLO model load failed: {e}")
             self._available = False
 
+    def _load_export(self, yolo_cls, model_path: Path):
+        """Load (exporting first if needed) the CPU runtime model, or keep PyTorch."""
+        exported = EXPORT_PATHS[self.backend](model_path)
+        try:
+            if not exported.exists():
+                logger.info(f"Exporting {model_path.name} for {self.backend}...")
+                exported = Path(self._model.export(format=self.backend, dynamic=True))
+            model = yolo_cls(str(exported), task="detect")
+            logger.info(f"Loaded {self.backend} YOLO model from {exported}")
+            return model
+        except Exception as e:
+            logger.warning(f"YOLO {self.backend} backend unavailable ({e}) — using PyTorch")
+            self.backend = "torch"
+            return self._model
+
     @property
     def is_available(self) -> bool:
         return self._available
@@ -76,43 +110,54 @@ class ObjectDetector:
         Returns:
             List of dicts with: class_name, class_id, confidence, bbox (x1,y1,x2,y2)
         """
-        if not self._available or self._model is None:
-            return []
+        return self.detect_batch([frame])[0]
+
+    def detect_batch(self, frames: list[np.ndarray]) -> list[list[dict]]:
+        """Run detection on several frames in one inference call.
+
+        Returns:
+            One detection list per frame, in order (empty lists on failure).
+        """
+        if not self._available or self._model is None or not frames:
+            return [[] for _ in frames]
 
         try:
             results = self._model(
-                frame,
+                frames,
                 conf=settings.YOLO_CONFIDENCE_THRESHOLD,
                 verbose=False,
                 stream=False,
             )
+            return [self._parse_result(r) for r in results]
 
-            detections = []
-            for r in results:
-                boxes = r.boxes
-                if boxes is None:
-                    continue
+        except Exception as e:
+            logger.error(f"YOLO detection error: {e}")
+            return [[] for _ in frames]
 
-                for box in boxes:
-                    class_id = int(box.cls[0])
-                    if class_id not in PROCTORING_CLASSES:
-                        continue
+    @staticmethod
+    def _parse_result(result) -> list[dict]:
+        """Keep the proctoring-relevant boxes of one frame's result."""
+        detections = []
+        boxes = result.boxes
+        if boxes is None:
+            return detections
 
-                    conf = float(box.conf[0])
-                    x1, y1, x2, y2 = box.xyxy[0].tolist()
+        for box in boxes:
+            class_id = int(box.cls[0])
+            if class_id not in PROCTORING_CLASSES:
+                continue
 
-                    detections.append({
-                        "class_id": class_id,
-                        "class_name": PROCTORING_CLASSES[class_id],
-                        "confidence": round(conf, 3),
-                        "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                    })
+            conf = float(box.conf[0])
+            x1, y1, x2, y2 = box.xyxy[0].tolist()
 
-            return detections
+            detections.append({
+                "class_id": class_id,
+                "class_name": PROCTORING_CLASSES[class_id],
+                "confidence": round(conf, 3),
+                "bbox": [int(x1), int(y1), int(x2), int(y2)],
+            })
 
-        except Exception as e:
-            logger.error(f"YOLO detection error: {e}")
-            return []
+        return detections
 
     def detect_phone_near_ear(self, detections: list[dict], face_bbox: Optional[tuple] = None) -> bool:
         """Check if a phone detection overlaps with the ear region of the face.
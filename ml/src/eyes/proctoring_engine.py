@@ -7,15 +7,29 @@ Detects:
 - Mouth movement (lip landmarks)
 - Earpiece indicators (ear-region analysis)
 - Prohibited objects (phone, book, laptop via YOLOv8-nano)
+
+Only the detector stages that can produce an enabled violation type
+(``PROCTORING_VIOLATIONS``) run. YOLO, the most expensive stage, runs every
+``PROCTORING_OBJECT_DETECTION_INTERVAL`` frames or when the face count
+changes; its detections are reused in between.
+
+Whole-frame work (RGB conversion, FaceMesh, YOLO) runs on a copy downscaled
+once to ``PROCTORING_ANALYSIS_WIDTH`` into a reused buffer. The landmark
+stages keep reading the full-resolution frame, but only around the face
+landmarks, so their thresholds behave exactly as at capture resolution.
 """
 import logging
-from typing import Optional
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterable, Optional
 
 import cv2
 import mediapipe as mp
 import numpy as np
 
 from config import settings
+from src.eyes.object_detector import PROCTORING_CLASSES
 
 logger = logging.getLogger("ProctoringEngine")
 
@@ -37,17 +51,56 @@ MOUTH_RIGHT = 308
 LEFT_EAR_LANDMARKS = [234, 227, 137, 177]
 RIGHT_EAR_LANDMARKS = [454, 447, 366, 401]
 
+# ── Detector stages ───────────────────────────────────────────────
+# Violation types each stage can produce, in evaluation order
+STAGE_VIOLATIONS = {
+    "faces": {"user_left", "multiple_people"},
+    "gaze": {"looking_down", "looking_away"},
+    "head_pose": {"head_tilted_down", "head_turned_away"},
+    "mouth": {"mouth_open"},
+    "earpiece": {"earpiece_suspected"},
+    "objects": {f"object_{name.replace(' ', '_')}" for name in PROCTORING_CLASSES.values()} | {"phone_near_ear"},
+}
+LANDMARK_STAGES = ("gaze", "head_pose", "mouth", "earpiece")
+
+
+def plan_stages(violations: Iterable[str]) -> tuple[str, ...]:
+    """Return the detector stages needed to report the given violation types.
+
+    Stages switched off in settings are left out. FaceMesh ("faces") runs
+    whenever a landmark stage does, since they all read its landmarks.
+    """
+    wanted = set(violations)
+    switched_off = {
+        "mouth": not settings.ENABLE_MOUTH_ANALYSIS,
+        "earpiece": not settings.ENABLE_EARPIECE_DETECTION,
+        "objects": not settings.ENABLE_OBJECT_DETECTION,
+    }
+    stages = {stage for stage, produced in STAGE_VIOLATIONS.items()
+              if produced & wanted and not switched_off.get(stage, False)}
+    if stages & set(LANDMARK_STAGES):
+        stages.add("faces")
+    return tuple(stage for stage in STAGE_VIOLATIONS if stage in stages)
+
 
 class ProctoringEngine:
     """Computer vision engine for interview proctoring using MediaPipe FaceMesh + YOLO."""
 
-    def __init__(self) -> None:
+    def __init__(self, violations: Iterable[str] | None = None) -> None:
+        """
+        Args:
+            violations: Violation types to report (default ``PROCTORING_VIOLATIONS``).
+        """
+        self.violations = frozenset(violations if violations is not None else settings.PROCTORING_VIOLATIONS)
+        self.stages = plan_stages(self.violations)
+        refine_landmarks = "gaze" in self.stages  # iris landmarks are only read by gaze
+
         try:
             from mediapipe.python.solutions import face_mesh as mp_face_mesh
             self.mp_face_mesh = mp_face_mesh
             self.face_mesh = self.mp_face_mesh.FaceMesh(
                 max_num_faces=2,
-                refine_landmarks=True,
+                refine_landmarks=refine_landmarks,
                 min_detection_confidence=0.5,
                 min_tracking_confidence=0.5
             )
@@ -55,7 +108,7 @@ class ProctoringEngine:
             self.mp_face_mesh = mp.solutions.face_mesh
             self.face_mesh = self.mp_face_mesh.FaceMesh(
                 max_num_faces=2,
-                refine_landmarks=True,
+                refine_landmarks=refine_landmarks,
                 min_detection_confidence=0.5,
                 min_tracking_confidence=0.5
             )
@@ -69,8 +122,22 @@ class ProctoringEngine:
         # Object detector (lazy-loaded)
         self._object_detector = None
         self._object_detection_enabled = settings.ENABLE_OBJECT_DETECTION
+        self._objects_interval = max(1, settings.PROCTORING_OBJECT_DETECTION_INTERVAL)
+        self._frames_since_objects = self._objects_interval
+        self._last_objects: list[dict] = []
+        self._last_face_count: int | None = None
 
-        logger.info("Proctoring engine initialized")
+        # Analysis-resolution buffers, reused while the frame size is unchanged
+        self.analysis_width = settings.PROCTORING_ANALYSIS_WIDTH
+        self._analysis_buffer: np.ndarray | None = None
+        self._rgb_buffer: np.ndarray | None = None
+
+        # Per-stage timing
+        self._frames = 0
+        self._stage_calls: dict[str, int] = defaultdict(int)
+        self._stage_seconds: dict[str, float] = defaultdict(float)
+
+        logger.info(f"Proctoring engine initialized (stages: {', '.join(self.stages) or 'none'})")
 
     # ── Object Detector (lazy) ────────────────────────────────────
 
@@ -78,8 +145,8 @@ class ProctoringEngine:
     def object_detector(self):
         if self._object_detector is None and self._object_detection_enabled:
             try:
-                from src.eyes.object_detector import ObjectDetector
-                self._object_detector = ObjectDetector()
+                from src.eyes.vision_service import get_vision_service
+                self._object_detector = get_vision_service()  # one batched model for all sessions
                 if not self._object_detector.is_available:
                     self._object_detector = None
                     self._object_detection_enabled = False
@@ -91,7 +158,10 @@ class ProctoringEngine:
     # ── Face Detection ────────────────────────────────────────────
 
     def detect_faces(self, frame: np.ndarray) -> tuple[int, Optional[list]]:
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # FaceMesh copies its input, so the RGB buffer can be reused next frame
+        if self._rgb_buffer is None or self._rgb_buffer.shape != frame.shape:
+            self._rgb_buffer = np.empty_like(frame)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
         results = self.face_mesh.process(rgb_frame)
 
         if not results.multi_face_landmarks:
@@ -321,31 +391,111 @@ class ProctoringEngine:
         ys = [lm.y * h for lm in face_landmarks.landmark]
         return (int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)))
 
+    # ── Analysis Resolution ───────────────────────────────────────
+
+    def _to_analysis_resolution(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale into the reused buffer if wider than ``analysis_width``."""
+        h, w = frame.shape[:2]
+        if w <= self.analysis_width:
+            return frame
+        size = (self.analysis_width, max(1, round(h * self.analysis_width / w)))
+        if self._analysis_buffer is None or self._analysis_buffer.shape[:2] != (size[1], size[0]):
+            self._analysis_buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        cv2.resize(frame, size, dst=self._analysis_buffer, interpolation=cv2.INTER_AREA)
+        return self._analysis_buffer
+
+    # ── Stage Timing ──────────────────────────────────────────────
+
+    @contextmanager
+    def _timed(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stage_calls[stage] += 1
+            self._stage_seconds[stage] += time.perf_counter() - started
+
+    def get_stage_stats(self) -> dict:
+        """Per-stage call counts and wall time since the engine was created."""
+        return {
+            "frames": self._frames,
+            "stages": {
+                stage: {
+                    "calls": self._stage_calls[stage],
+                    "total_ms": round(self._stage_seconds[stage] * 1000, 1),
+                    "mean_ms": round(self._stage_seconds[stage] * 1000 / self._stage_calls[stage], 2),
+                }
+                for stage in ("downscale", *self.stages) if self._stage_calls[stage]
+            },
+        }
+
+    # ── Object Detection Cadence ──────────────────────────────────
+
+    def _detect_objects(self, frame: np.ndarray, face_count: int | None) -> list[dict]:
+        """Run YOLO when due or when the face count changed, else reuse the last detections."""
+        self._frames_since_objects += 1
+        due = self._frames_since_objects >= self._objects_interval
+        if (due or face_count != self._last_face_count) and self.object_detector:
+            with self._timed("objects"):
+                self._last_objects = self.object_detector.detect(frame)
+            self._frames_since_objects = 0
+        self._last_face_count = face_count
+        return self._last_objects
+
+    def _add_object_violations(self, violations: list[str], metadata: dict,
+                               frame: np.ndarray, face_landmarks=None) -> None:
+        obj_detections = self._detect_objects(frame, metadata.get("face_count"))
+        if not obj_detections:
+            return
+        metadata["objects"] = obj_detections
+        for det in obj_detections:
+            viol_name = f"object_{det['class_name'].replace(' ', '_')}"
+            if viol_name not in violations:
+                violations.append(viol_name)
+
+        if face_landmarks is None or "phone_near_ear" not in self.violations:
+            return
+        if not any(det["class_name"] == "cell phone" for det in obj_detections):
+            return
+        # Phone-near-ear check (supplements earpiece heuristic)
+        face_bbox = self.get_face_bbox(face_landmarks, frame.shape)
+        if self.object_detector and self.object_detector.detect_phone_near_ear(obj_detections, face_bbox):
+            if "earpiece_suspected" not in violations:
+                violations.append("phone_near_ear")
+
     # ── Main Analysis ─────────────────────────────────────────────
 
     def analyze_frame(self, frame: np.ndarray) -> tuple[list[str], dict]:
-        """Analyze a single frame for all proctoring violations.
+        """Analyze a single frame for the enabled proctoring violations.
+
+        FaceMesh and YOLO see the frame at analysis resolution; landmark
+        stages read the full-resolution ``frame``.
 
         Returns:
             (violations_list, metadata_dict)
         """
         violations = []
         metadata = {}
+        self._frames += 1
+        with self._timed("downscale"):
+            small = self._to_analysis_resolution(frame)
+
+        if "faces" not in self.stages:
+            if "objects" in self.stages:
+                self._add_object_violations(violations, metadata, small)
+            return [v for v in violations if v in self.violations], metadata
 
-        face_count, landmarks = self.detect_faces(frame)
+        with self._timed("faces"):
+            face_count, landmarks = self.detect_faces(small)
         metadata["face_count"] = face_count
 
         if face_count == 0:
             violations.append("user_left")
             metadata["gaze"] = "unknown"
             # Still run object detection even without face
-            if self.object_detector:
-                obj_detections = self.object_detector.detect(frame)
-                if obj_detections:
-                    metadata["objects"] = obj_detections
-                    for det in obj_detections:
-                        violations.append(f"object_{det['class_name'].replace(' ', '_')}")
-            return violations, metadata
+            if "objects" in self.stages:
+                self._add_object_violations(violations, metadata, small)
+            return [v for v in violations if v in self.violations], metadata
 
         if face_count > 1:
             violations.append("multiple_people")
@@ -353,67 +503,56 @@ class ProctoringEngine:
         face_landmarks = landmarks[0]
 
         # ── Gaze ──
-        gaze, h_ratio, v_ratio = self.calculate_gaze_direction(face_landmarks, frame.shape)
-        metadata["gaze"] = gaze
-        metadata["gaze_ratios"] = {"horizontal": round(h_ratio, 3), "vertical": round(v_ratio, 3)}
+        if "gaze" in self.stages:
+            with self._timed("gaze"):
+                gaze, h_ratio, v_ratio = self.calculate_gaze_direction(face_landmarks, frame.shape)
+            metadata["gaze"] = gaze
+            metadata["gaze_ratios"] = {"horizontal": round(h_ratio, 3), "vertical": round(v_ratio, 3)}
 
-        if gaze == "down":
-            violations.append("looking_down")
-        elif gaze in ["left", "right"]:
-            violations.append("looking_away")
+            if gaze == "down":
+                violations.append("looking_down")
+            elif gaze in ["left", "right"]:
+                violations.append("looking_away")
 
         # ── Head Pose ──
-        try:
-            pitch, yaw, roll = self.calculate_head_pose(face_landmarks, frame.shape)
-            metadata["head_pose"] = {"pitch": round(pitch, 1), "yaw": round(yaw, 1), "roll": round(roll, 1)}
+        if "head_pose" in self.stages:
+            try:
+                with self._timed("head_pose"):
+                    pitch, yaw, roll = self.calculate_head_pose(face_landmarks, frame.shape)
+                metadata["head_pose"] = {"pitch": round(pitch, 1), "yaw": round(yaw, 1), "roll": round(roll, 1)}
 
-            if pitch < HEAD_TILT_DOWN_THRESHOLD:
-                if "looking_down" not in violations:
-                    violations.append("head_tilted_down")
+                if pitch < HEAD_TILT_DOWN_THRESHOLD:
+                    if "looking_down" not in violations:
+                        violations.append("head_tilted_down")
 
-            if abs(yaw) > HEAD_YAW_THRESHOLD:
-                if "looking_away" not in violations:
-                    violations.append("head_turned_away")
-        except (cv2.error, ValueError, IndexError) as e:
-            logger.debug(f"Head pose estimation failed: {e}")
-            metadata["head_pose"] = {"pitch": 0, "yaw": 0, "roll": 0}
+                if abs(yaw) > HEAD_YAW_THRESHOLD:
+                    if "looking_away" not in violations:
+                        violations.append("head_turned_away")
+            except (cv2.error, ValueError, IndexError) as e:
+                logger.debug(f"Head pose estimation failed: {e}")
+                metadata["head_pose"] = {"pitch": 0, "yaw": 0, "roll": 0}
 
         # ── Mouth Movement ──
-        if settings.ENABLE_MOUTH_ANALYSIS:
-            mouth_data = self.analyze_mouth(face_landmarks, frame.shape)
+        if "mouth" in self.stages:
+            with self._timed("mouth"):
+                mouth_data = self.analyze_mouth(face_landmarks, frame.shape)
             metadata["mouth"] = mouth_data
             if mouth_data["is_mouth_open"]:
                 violations.append("mouth_open")
 
         # ── Earpiece Detection ──
-        if settings.ENABLE_EARPIECE_DETECTION:
-            earpiece_data = self.detect_earpiece(face_landmarks, frame)
+        if "earpiece" in self.stages:
+            with self._timed("earpiece"):
+                earpiece_data = self.detect_earpiece(face_landmarks, frame)
             metadata["earpiece"] = earpiece_data
             if earpiece_data["earpiece_detected"]:
                 violations.append("earpiece_suspected")
 
         # ── Object Detection (YOLO) ──
-        if self.object_detector:
-            obj_detections = self.object_detector.detect(frame)
-            if obj_detections:
-                metadata["objects"] = obj_detections
-                face_bbox = self.get_face_bbox(face_landmarks, frame.shape)
-
-                for det in obj_detections:
-                    viol_name = f"object_{det['class_name'].replace(' ', '_')}"
-                    if viol_name not in violations:
-                        violations.append(viol_name)
-
-                # Phone-near-ear check (supplements earpiece heuristic)
-                if self.object_detector.detect_phone_near_ear(obj_detections, face_bbox):
-                    if "earpiece_suspected" not in violations:
-                        violations.append("phone_near_ear")
-
-        # For the time being, keep only the requested violations
-        allowed_violations = {"user_left", "multiple_people"}
-        violations = [v for v in violations if v in allowed_violations]
-
-        return violations, metadata
+        if "objects" in self.stages:
+            self._add_object_violations(violations, metadata, small, face_landmarks)
+
+        return [v for v in violations if v in self.violations], metadata
 
     def cleanup(self) -> None:
         """Release MediaPipe resources."""
@@ -5,7 +5,7 @@ Key improvements over original:
 - Rolling-window RiskScorer instead of simple counters
 - Tiered alert escalation (info → warning → critical)
 - Rich HUD overlay with color-coded status indicators
-- Enhanced violation timeline for post-interview reports
+- Run-length violation timeline in a bounded ring buffer for post-interview reports
 """
 import cv2
 import threading
@@ -13,7 +13,7 @@ import time
 import logging
 import numpy as np
 from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 from src.eyes.proctoring_engine import ProctoringEngine
 from config import settings
@@ -53,21 +53,53 @@ COLOR_DARK_BG = (30, 30, 30)
 # ══════════════════════════════════════════════════════════════════
 
 @dataclass
-class ViolationEvent:
+class TimelineSegment:
+    """A run of same-type violations, each within the merge gap of the last."""
     violation_type: str
-    timestamp: float
-    weight: float
+    start: float
+    end: float
+    count: int = 1
+    weight: float = 0.0
     sustained: bool = False
-    duration: float = 0.0
+    duration: float = 0.0  # longest sustained duration reported in the run
+
+    def extend(self, other: "TimelineSegment") -> None:
+        self.start = min(self.start, other.start)
+        self.end = max(self.end, other.end)
+        self.count += other.count
+        self.weight += other.weight
+        self.sustained = self.sustained or other.sustained
+        self.duration = max(self.duration, other.duration)
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.violation_type,
+            "timestamp": self.start,
+            "end": self.end,
+            "count": self.count,
+            "duration": round(max(self.duration, self.end - self.start), 2),
+            "sustained": self.sustained,
+            "weight": round(self.weight, 2),
+        }
 
 
 class RiskScorer:
-    """Adaptive risk scorer using a time-windowed violation history."""
+    """Adaptive risk scorer using a time-windowed violation history.
+
+    The window keeps a running weight sum, so scoring is amortized O(1).
+    The session timeline is stored as run-length segments in a bounded
+    ring buffer, so multi-hour sessions use constant memory.
+    """
 
     def __init__(self, window_seconds: float = 30.0) -> None:
         self.window_seconds = window_seconds
-        self._events: deque[ViolationEvent] = deque()
-        self._all_events: list[ViolationEvent] = []
+        self._lock = threading.Lock()
+        self._events: deque[tuple[float, float]] = deque()  # (timestamp, weight) inside the window
+        self._window_weight = 0.0
+        self._segments: deque[TimelineSegment] = deque(maxlen=settings.PROCTORING_TIMELINE_MAX_SEGMENTS)
+        self._open_segments: dict[str, TimelineSegment] = {}
+        self._merge_seconds = settings.PROCTORING_TIMELINE_MERGE_SECONDS
+        self._segments_dropped = 0
         self.violation_counters: dict[str, int] = defaultdict(int)
         self._peak_risk: float = 0.0
 
@@ -76,33 +108,43 @@ class RiskScorer:
         if sustained:
             weight *= 1.5  # Sustained violations are more severe
 
-        event = ViolationEvent(
-            violation_type=violation_type,
-            timestamp=time.time(),
-            weight=weight,
-            sustained=sustained,
-            duration=duration,
-        )
-        self._events.append(event)
-        self._all_events.append(event)
-        self.violation_counters[violation_type] += 1
+        now = time.time()
+        with self._lock:
+            self._events.append((now, weight))
+            self._window_weight += weight
+            self.violation_counters[violation_type] += 1
+            self._record_segment(violation_type, now, weight, sustained, duration)
+
+    def _record_segment(self, violation_type: str, now: float, weight: float,
+                        sustained: bool, duration: float) -> None:
+        event = TimelineSegment(violation_type, now, now, weight=weight,
+                                sustained=sustained, duration=duration)
+        segment = self._open_segments.get(violation_type)
+        if segment is not None and now - segment.end <= self._merge_seconds:
+            segment.extend(event)
+            return
+
+        if len(self._segments) == self._segments.maxlen:
+            oldest = self._segments[0]
+            if self._open_segments.get(oldest.violation_type) is oldest:
+                del self._open_segments[oldest.violation_type]
+            self._segments_dropped += 1
+        self._segments.append(event)
+        self._open_segments[violation_type] = event
 
     def get_risk_score(self) -> float:
         """Calculate current risk score (0.0 - 1.0) from recent violations."""
-        self._prune_old_events()
-
-        if not self._events:
-            return 0.0
-
-        total_weight = sum(e.weight for e in self._events)
-        # Normalize: 5 weighted events in the window = score of 1.0
-        score = min(total_weight / 5.0, 1.0)
-        self._peak_risk = max(self._peak_risk, score)
-        return score
-
-    def get_alert_level(self) -> str:
-        """Get current alert level based on risk score."""
-        score = self.get_risk_score()
+        with self._lock:
+            self._prune_old_events()
+            # Normalize: 5 weighted events in the window = score of 1.0
+            score = min(self._window_weight / 5.0, 1.0)
+            self._peak_risk = max(self._peak_risk, score)
+            return score
+
+    def get_alert_level(self, score: float | None = None) -> str:
+        """Get alert level for ``score`` (default: the current risk score)."""
+        if score is None:
+            score = self.get_risk_score()
         thresholds = settings.RISK_ALERT_THRESHOLDS
 
         if score >= thresholds["critical"]:
@@ -115,8 +157,29 @@ class RiskScorer:
 
     def _prune_old_events(self) -> None:
         cutoff = time.time() - self.window_seconds
-        while self._events and self._events[0].timestamp < cutoff:
-            self._events.popleft()
+        while self._events and self._events[0][0] < cutoff:
+            self._window_weight -= self._events.popleft()[1]
+        if not self._events:
+            self._window_weight = 0.0  # drop accumulated float error
+
+    def get_timeline(self, max_buckets: int | None = None) -> list[dict]:
+        """Violation runs, merged per type into at most ``max_buckets`` time buckets."""
+        max_buckets = max_buckets or settings.PROCTORING_TIMELINE_REPORT_BUCKETS
+        with self._lock:
+            segments = [TimelineSegment(**vars(s)) for s in self._segments]
+        if len(segments) <= max_buckets:
+            return [s.to_dict() for s in segments]
+
+        first = segments[0].start
+        bucket_seconds = (segments[-1].end - first) / max_buckets or 1.0
+        merged: dict[tuple[str, int], TimelineSegment] = {}
+        for segment in segments:
+            key = (segment.violation_type, min(int((segment.start - first) / bucket_seconds), max_buckets - 1))
+            if key in merged:
+                merged[key].extend(segment)
+            else:
+                merged[key] = segment
+        return [s.to_dict() for s in sorted(merged.values(), key=lambda s: s.start)]
 
     def get_summary(self) -> dict:
         """Full summary for the final report."""
@@ -131,25 +194,15 @@ class RiskScorer:
         elif current_score >= settings.RISK_ALERT_THRESHOLDS["info"]:
             severity = "medium"
 
-        violation_timeline = [
-            {
-                "type": e.violation_type,
-                "timestamp": e.timestamp,
-                "duration": round(e.duration, 2),
-                "sustained": e.sustained,
-                "weight": round(e.weight, 2),
-            }
-            for e in self._all_events
-        ]
-
         return {
             "total_violations": total,
             "violation_counts": dict(self.violation_counters),
             "current_risk_score": round(current_score, 3),
             "peak_risk_score": round(self._peak_risk, 3),
             "severity": severity,
-            "alert_level": self.get_alert_level(),
-            "violation_timeline": violation_timeline,
+            "alert_level": self.get_alert_level(current_score),
+            "violation_timeline": self.get_timeline(),
+            "timeline_segments_dropped": self._segments_dropped,
         }
 
 
@@ -164,8 +217,8 @@ class ProctoringMonitor:
     Analysis runs at PROCTORING_FPS (5) to save CPU.
     """
 
-    def __init__(self) -> None:
-        self.engine = ProctoringEngine()
+    def __init__(self, engine: ProctoringEngine | None = None) -> None:
+        self.engine = engine or ProctoringEngine()
         self.is_running = False
         self.thread = None
         self.cap = None
@@ -252,9 +305,10 @@ class ProctoringMonitor:
                     # Process violations into risk scorer
                     self._process_violations(violations, current_time)
 
+                    score = self.risk_scorer.get_risk_score()
                     with self._lock:
-                        self._last_risk_score = self.risk_scorer.get_risk_score()
-                        self._last_alert_level = self.risk_scorer.get_alert_level()
+                        self._last_risk_score = score
+                        self._last_alert_level = self.risk_scorer.get_alert_level(score)
 
                 # Display video window with basic HUD
                 with self._lock:
@@ -325,7 +379,9 @@ class ProctoringMonitor:
 
     def get_violations_summary(self) -> dict:
         """Return the full risk-scored summary for the interview report."""
-        return self.risk_scorer.get_summary()
+        summary = self.risk_scorer.get_summary()
+        summary["stage_timings"] = self.engine.get_stage_stats()
+        return summary
 
     def stop(self) -> None:
         """Stop the proctoring monitor and release resources."""
@@ -0,0 +1,278 @@
+"""Proctoring from frames uploaded by the candidate's browser.
+
+In the web deployment the backend is headless and the camera lives in the
+browser, so ``ProctoringMonitor``'s webcam loop, consent prompt and preview
+window don't apply. Instead the client sends downscaled JPEG/WebP frames
+over the interview WebSocket at the rate negotiated in setup. Each frame is
+prefixed with ``FRAME_HEADER``: the b"PRCT" magic and a u32 sequence number.
+
+Frames are analyzed on a process-wide pool of ``PROCTORING_REMOTE_WORKERS``
+threads. To keep latency bounded, frames are dropped rather than queued.
+A frame is dropped when:
+
+- it arrives faster than the negotiated rate;
+- the session's previous frame is still being analyzed (FaceMesh keeps
+  per-session tracking state, so one session's frames are analyzed one at
+  a time, in order);
+- every worker is busy.
+
+Image dimensions are read from the JPEG/WebP header before decoding, so a
+small upload that declares a huge image is rejected without allocating it.
+"""
+import logging
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from config import settings
+from src.eyes.proctoring_engine import ProctoringEngine
+from src.eyes.proctoring_monitor import ProctoringMonitor
+
+logger = logging.getLogger("RemoteProctoring")
+
+FRAME_MAGIC = b"PRCT"
+FRAME_HEADER = struct.Struct("!4sI")
+FRAME_FORMATS = ("jpeg", "webp")
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+MIN_FPS = 0.2
+MIN_WIDTH = 160
+RATE_TOLERANCE = 0.8  # accept frames up to 20% early (client timer jitter)
+
+_executor = ThreadPoolExecutor(max_workers=settings.PROCTORING_REMOTE_WORKERS,
+                               thread_name_prefix="proctoring")
+_worker_slots = threading.BoundedSemaphore(settings.PROCTORING_REMOTE_WORKERS)
+
+
+def is_proctoring_frame(data: bytes) -> bool:
+    """Whether a binary WebSocket message is a proctoring frame."""
+    return data[:len(FRAME_MAGIC)] == FRAME_MAGIC
+
+
+def parse_frame(data: bytes) -> tuple[int, memoryview]:
+    """Split a client frame into (sequence number, encoded image).
+
+    Raises:
+        ValueError: If the frame is truncated or not a proctoring frame.
+    """
+    if len(data) <= FRAME_HEADER.size:
+        raise ValueError("Truncated proctoring frame")
+    magic, seq = FRAME_HEADER.unpack_from(data)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Not a proctoring frame")
+    return seq, memoryview(data)[FRAME_HEADER.size:]
+
+
+def image_size(payload) -> tuple[int, int]:
+    """Read (width, height) from a JPEG or WebP header without decoding.
+
+    Raises:
+        ValueError: If the payload is not a JPEG/WebP or its header is truncated.
+    """
+    data = memoryview(payload)
+    try:
+        if data[:2] == b"\xff\xd8":
+            return _jpeg_size(data)
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            return _webp_size(data)
+    except struct.error as e:
+        raise ValueError(f"Truncated image header: {e}") from None
+    raise ValueError("Unsupported image format")
+
+
+def _jpeg_size(data: memoryview) -> tuple[int, int]:
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            raise ValueError("Malformed JPEG marker")
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in (0x01, *range(0xD0, 0xD8)):  # standalone markers
+            pos += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack_from("!HH", data, pos + 5)
+            return width, height
+        (length,) = struct.unpack_from("!H", data, pos + 2)
+        pos += 2 + length
+    raise ValueError("JPEG frame header not found")
+
+
+def _webp_size(data: memoryview) -> tuple[int, int]:
+    chunk = bytes(data[12:16])
+    if chunk == b"VP8 ":
+        width, height = struct.unpack_from("<HH", data, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        (bits,) = struct.unpack_from("<I", data, 21)
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        w0, w1, w2, h0, h1, h2 = struct.unpack_from("<6B", data, 24)
+        return (w0 | w1 << 8 | w2 << 16) + 1, (h0 | h1 << 8 | h2 << 16) + 1
+    raise ValueError("Unknown WebP chunk")
+
+
+class RemoteProctoringMonitor(ProctoringMonitor):
+    """Risk-scored proctoring over client-uploaded frames (no server camera)."""
+
+    def __init__(self, fps: float | None = None, max_width: int | None = None,
+                 engine: ProctoringEngine | None = None) -> None:
+        """
+        Args:
+            fps: Frame rate requested by the client (clamped to
+                 ``PROCTORING_REMOTE_MAX_FPS``).
+            max_width: Widest frame the client intends to send (clamped to
+                       ``PROCTORING_REMOTE_MAX_WIDTH``).
+            engine: Frame analyzer (default ``ProctoringEngine``).
+        """
+        super().__init__(engine)
+        self.fps = min(max(float(fps or settings.PROCTORING_FPS), MIN_FPS),
+                       settings.PROCTORING_REMOTE_MAX_FPS)
+        self.max_width = min(max(int(max_width or settings.PROCTORING_REMOTE_MAX_WIDTH), MIN_WIDTH),
+                             settings.PROCTORING_REMOTE_MAX_WIDTH)
+        self._min_interval = RATE_TOLERANCE / self.fps
+        self._last_accepted = float("-inf")
+        self._analysis_lock = threading.Lock()  # one frame per session in flight
+        self._buffer: np.ndarray | None = None  # downscale target, reused across frames
+        self._last_sent: tuple | None = None
+        self._frames = {"received": 0, "analyzed": 0, "dropped_rate": 0,
+                        "dropped_busy": 0, "invalid": 0}
+
+    @property
+    def config(self) -> dict:
+        """Negotiated capture parameters, sent to the client."""
+        return {
+            "fps": self.fps,
+            "max_width": self.max_width,
+            "max_height": settings.PROCTORING_REMOTE_MAX_HEIGHT,
+            "formats": list(FRAME_FORMATS),
+            "max_frame_bytes": settings.PROCTORING_REMOTE_MAX_FRAME_BYTES,
+        }
+
+    def start(self) -> bool:
+        """Begin accepting frames. Consent is collected by the client."""
+        self.is_running = True
+        logger.info(f"Remote proctoring started ({self.fps:g} FPS, max width {self.max_width})")
+        return True
+
+    def submit_frame(self, data: bytes) -> Future | None:
+        """Queue one client frame for analysis, or drop it.
+
+        Cheap and non-blocking; call it from the event loop.
+
+        Returns:
+            Future resolving to a ``proctoring_update`` payload (or None when
+            nothing changed since the last update), or None if the frame was
+            dropped.
+        """
+        if not self.is_running:
+            return None
+        with self._lock:
+            self._frames["received"] += 1
+            if len(data) > settings.PROCTORING_REMOTE_MAX_FRAME_BYTES:
+                self._frames["invalid"] += 1
+                return None
+            now = time.monotonic()
+            if now - self._last_accepted < self._min_interval:
+                self._frames["dropped_rate"] += 1
+                return None
+            if not self._analysis_lock.acquire(blocking=False):
+                self._frames["dropped_busy"] += 1
+                return None
+            if not _worker_slots.acquire(blocking=False):
+                self._analysis_lock.release()
+                self._frames["dropped_busy"] += 1
+                return None
+            self._last_accepted = now
+
+        future = _executor.submit(self._analyze, data)
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future: Future) -> None:
+        _worker_slots.release()
+        self._analysis_lock.release()
+
+    def _analyze(self, data: bytes) -> dict | None:
+        try:
+            seq, payload = parse_frame(data)
+            frame = self._decode(payload)
+        except ValueError as e:
+            logger.debug(f"Rejected proctoring frame: {e}")
+            with self._lock:
+                self._frames["invalid"] += 1
+            return None
+
+        violations, metadata = self.engine.analyze_frame(frame)
+        self._process_violations(violations, time.time())
+        score = self.risk_scorer.get_risk_score()
+        alert = self.risk_scorer.get_alert_level(score)
+
+        with self._lock:
+            self._frames["analyzed"] += 1
+            self._last_violations = violations
+            self._last_metadata = metadata
+            self._last_risk_score = score
+            self._last_alert_level = alert
+
+        state = (tuple(sorted(violations)), alert)
+        if state == self._last_sent:
+            return None
+        self._last_sent = state
+        return {
+            "seq": seq,
+            "violations": violations,
+            "face_count": metadata.get("face_count", 0),
+            "risk_score": round(score, 3),
+            "alert_level": alert,
+        }
+
+    def _decode(self, payload) -> np.ndarray:
+        """Decode a JPEG/WebP frame, downscaling into the reused buffer if too wide.
+
+        Raises:
+            ValueError: If the header declares a size over the server caps,
+                        or the frame cannot be decoded.
+        """
+        width, height = image_size(payload)
+        if width > settings.PROCTORING_REMOTE_MAX_WIDTH or height > settings.PROCTORING_REMOTE_MAX_HEIGHT:
+            raise ValueError(f"Frame {width}x{height} exceeds the size limit")
+        frame = cv2.imdecode(np.frombuffer(payload, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise ValueError("Undecodable proctoring frame")
+        h, w = frame.shape[:2]
+        if w <= self.max_width:
+            return frame
+
+        size = (self.max_width, max(1, round(h * self.max_width / w)))
+        if self._buffer is None or self._buffer.shape[:2] != (size[1], size[0]):
+            self._buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        cv2.resize(frame, size, dst=self._buffer, interpolation=cv2.INTER_AREA)
+        return self._buffer
+
+    def get_violations_summary(self) -> dict:
+        """Risk-scored summary plus frame intake counters."""
+        summary = super().get_violations_summary()
+        with self._lock:
+            summary["frames"] = dict(self._frames)
+        return summary
+
+    def stop(self) -> None:
+        """Stop accepting frames and release the engine once in-flight analysis ends."""
+        if not self.is_running:
+            return
+        self.is_running = False
+        acquired = self._analysis_lock.acquire(timeout=3)
+        try:
+            self.engine.cleanup()
+        except (AttributeError, RuntimeError) as e:
+            logger.warning(f"Failed to cleanup proctoring engine: {e}")
+        finally:
+            if acquired:
+                self._analysis_lock.release()
+        logger.info(f"Remote proctoring stopped: {self._frames}")
@@ -0,0 +1,198 @@
+"""Shared, batched YOLO inference for all proctoring sessions.
+
+Each ``ProctoringEngine`` used to load its own YOLOv8-nano model, so N
+concurrent sessions meant N copies of the weights and N single-frame
+forward passes. ``VisionService`` owns one ``ObjectDetector`` per process.
+Sessions submit frames; a worker thread groups the frames that arrive within
+``YOLO_BATCH_MAX_WAIT_MS`` of each other into one batch and resolves each
+session's future with its own detections, which that session's engine folds
+into its violations (and so into its own ``RiskScorer``).
+
+FaceMesh stays per session: its graph carries tracking state from one frame
+to the next, so frames from different candidates cannot share an instance.
+
+``detect``, ``is_available`` and ``detect_phone_near_ear`` mirror
+``ObjectDetector``, so the engine uses the service in its place.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from config import settings
+from src.eyes.object_detector import ObjectDetector
+
+logger = logging.getLogger("VisionService")
+
+_STOP = object()
+
+
+@dataclass
+class _DetectRequest:
+    frame: np.ndarray
+    future: Future = field(default_factory=Future)
+
+
+class VisionService:
+    """Process-wide YOLO detector that batches frames across sessions."""
+
+    def __init__(self, detector: ObjectDetector | None = None,
+                 max_batch_size: int = settings.YOLO_BATCH_MAX_SIZE,
+                 max_wait_ms: float = settings.YOLO_BATCH_MAX_WAIT_MS) -> None:
+        """
+        Args:
+            detector: Shared detector. Loaded on first use if omitted.
+            max_batch_size: Frames per inference call.
+            max_wait_ms: How long the first frame in a batch waits for
+                         frames from other sessions before the batch runs.
+        """
+        self._detector = detector
+        self._detector_lock = threading.Lock()
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._frames_total = 0
+        self._batches_total = 0
+        self._batched_frames_total = 0
+        self._inference_seconds = 0.0
+
+    # ── ObjectDetector-compatible API ─────────────────────────────
+
+    @property
+    def detector(self) -> ObjectDetector:
+        if self._detector is None:
+            with self._detector_lock:
+                if self._detector is None:
+                    self._detector = ObjectDetector()
+        return self._detector
+
+    @property
+    def is_available(self) -> bool:
+        return self.detector.is_available
+
+    def detect(self, frame: np.ndarray) -> list[dict]:
+        """Blocking detection of one frame, batched with other sessions' frames."""
+        return self.submit(frame).result()
+
+    def detect_phone_near_ear(self, detections: list[dict], face_bbox: Optional[tuple] = None) -> bool:
+        return self.detector.detect_phone_near_ear(detections, face_bbox)
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def submit(self, frame: np.ndarray) -> Future:
+        """Queue ``frame`` for the next batch.
+
+        The caller must not modify ``frame`` until the future resolves.
+
+        Returns:
+            Future resolving to the frame's detections (see ``ObjectDetector.detect``).
+        """
+        request = _DetectRequest(frame)
+        with self._stats_lock:
+            self._frames_total += 1
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def stats(self) -> dict:
+        """Batch-occupancy and inference-time counters since startup."""
+        with self._stats_lock:
+            batches = self._batches_total
+            avg_batch = self._batched_frames_total / batches if batches else 0.0
+            return {
+                "backend": self._detector.backend if self._detector else settings.YOLO_BACKEND,
+                "frames_total": self._frames_total,
+                "batches_total": batches,
+                "avg_batch_size": round(avg_batch, 2),
+                "avg_occupancy": round(min(avg_batch / self.max_batch_size, 1.0), 3),
+                "avg_batch_ms": round(self._inference_seconds * 1000 / batches, 1) if batches else 0.0,
+                "queue_depth": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+            }
+
+    def close(self) -> None:
+        """Stop the worker after it drains the queued frames."""
+        with self._start_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join(timeout=5)
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="vision-service", daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        wait_s = self.max_wait_ms / 1000
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = time.perf_counter() + wait_s
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is _STOP:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: list[_DetectRequest]) -> None:
+        started = time.perf_counter()
+        try:
+            results = self.detector.detect_batch([request.frame for request in batch])
+        except Exception as e:
+            logger.error(f"YOLO batch of {len(batch)} failed: {e}")
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self._batches_total += 1
+            self._batched_frames_total += len(batch)
+            self._inference_seconds += time.perf_counter() - started
+
+        for request, detections in zip(batch, results):
+            request.future.set_result(detections)
+
+
+_global_service: Optional[VisionService] = None
+_service_lock = threading.Lock()
+
+
+def get_vision_service() -> VisionService:
+    """Return singleton VisionService shared by all proctoring sessions."""
+    global _global_service
+    if _global_service is None:
+        with _service_lock:
+            if _global_service is None:
+                _global_service = VisionService()
+    return _global_service
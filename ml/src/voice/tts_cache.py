@@ -0,0 +1,189 @@
+"""Content-addressed cache of synthesized utterances.
+
+Many interviewer utterances repeat verbatim across sessions: greetings, the
+scripted opener, exit confirmations, toxicity warnings and question-bank
+questions read out as-is. ``TTSCache`` stores their audio under a hash of
+(text, voice, backend, sample rate), so they play without a synthesis
+round-trip. Changing the voice or backend never serves stale audio.
+
+A byte-bounded in-memory LRU sits in front of one file per entry under
+``data/cache/tts``. The files survive restarts and are evicted least
+recently used first once ``TTS_CACHE_DISK_BYTES`` is exceeded.
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger("TTSCache")
+
+CODEC_SUFFIXES = ("mp3", "wav")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so "Hello.  " and "Hello." share an entry."""
+    return " ".join(text.split())
+
+
+class TTSCache:
+    """Byte-bounded memory LRU over a byte-bounded on-disk store."""
+
+    def __init__(self, cache_dir: str | Path | None = None,
+                 max_memory_bytes: int = settings.TTS_CACHE_MEMORY_BYTES,
+                 max_disk_bytes: int = settings.TTS_CACHE_DISK_BYTES) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else settings.BASE_DIR / "data" / "cache" / "tts"
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, tuple[Path, int]] | None = None  # key -> (file, size), oldest first
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(text: str, voice: str, backend: str, sample_rate: int) -> str:
+        """Cache key for ``text`` spoken by one backend configuration."""
+        content = f"{backend}\0{voice}\0{sample_rate}\0{normalize_text(text)}"
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def __contains__(self, key: str) -> bool:
+        """Whether ``key`` is cached, without reading its audio."""
+        with self._lock:
+            return key in self._memory or key in self._disk_index()
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        """Cached ``(audio, codec)`` for ``key``, or None."""
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return cached
+            entry = self._disk_index().get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+        path, _ = entry
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # recency for eviction across restarts
+        except OSError as e:
+            logger.debug(f"TTS cache read failed: {e}")
+            with self._lock:
+                self._forget_file(key)
+                self._misses += 1
+            return None
+
+        result = (audio, path.suffix[1:])
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._remember(key, result)
+            self._hits += 1
+        return result
+
+    def put(self, key: str, audio: bytes, codec: str) -> None:
+        """Store ``audio`` in memory and on disk, evicting the least recently used."""
+        with self._lock:
+            self._remember(key, (audio, codec))
+        if codec not in CODEC_SUFFIXES:
+            return
+
+        path = self.cache_dir / f"{key}.{codec}"
+        tmp = path.with_suffix(f".{codec}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(audio)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache: {e}")
+            return
+
+        with self._lock:
+            index = self._disk_index()
+            if key in index:
+                self._disk_bytes -= index[key][1]
+            index[key] = (path, len(audio))
+            index.move_to_end(key)
+            self._disk_bytes += len(audio)
+            while self._disk_bytes > self.max_disk_bytes and len(index) > 1:
+                old_key = next(iter(index))
+                old_path, _ = index[old_key]
+                try:
+                    old_path.unlink()
+                except OSError:
+                    pass
+                self._forget_file(old_key)
+
+    def stats(self) -> dict:
+        """Entry counts, sizes and hit rate."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk) if self._disk is not None else None,
+                "disk_bytes": self._disk_bytes if self._disk is not None else None,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            }
+
+    def clear(self) -> None:
+        """Drop every cached utterance, in memory and on disk."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for path, _ in self._disk_index().values():
+                try:
+                    path.unlink()
+                except OSError as e:
+                    logger.warning(f"Failed to delete TTS cache file {path}: {e}")
+            self._disk.clear()
+            self._disk_bytes = 0
+
+    # ── Internals (call with the lock held) ───────────────────────
+
+    def _remember(self, key: str, value: tuple[bytes, str]) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old[0])
+        if len(value[0]) > self.max_memory_bytes:
+            return
+        self._memory[key] = value
+        self._memory_bytes += len(value[0])
+        while self._memory_bytes > self.max_memory_bytes:
+            _, (audio, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(audio)
+
+    def _forget_file(self, key: str) -> None:
+        entry = self._disk_index().pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[1]
+
+    def _disk_index(self) -> OrderedDict[str, tuple[Path, int]]:
+        """Files on disk, oldest access first; scanned once, then kept in step."""
+        if self._disk is None:
+            entries = []
+            for suffix in CODEC_SUFFIXES:
+                try:
+                    paths = list(self.cache_dir.glob(f"*.{suffix}"))
+                except OSError:
+                    paths = []
+                for path in paths:
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, path.stem, path, st.st_size))
+            entries.sort()
+            self._disk = OrderedDict((key, (path, size)) for _, key, path, size in entries)
+            self._disk_bytes = sum(size for _, _, _, size in entries)
+        return self._disk
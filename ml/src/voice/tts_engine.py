@@ -3,14 +3,11 @@
 Uses Microsoft Edge's neural TTS voices via edge_tts library (free, no API key).
 Falls back to Piper TTS for offline use when internet is unavailable.
 """
-import asyncio
 import io
 import logging
-import os
-import tempfile
+import queue
+import threading
 import time
-import wave
-from pathlib import Path
 from typing import Generator
 
 import numpy as np
@@ -18,66 +15,23 @@ import sounddevice as sd
 import soundfile as sf
 
 from config import settings
+from src.voice.tts_service import TTSService, get_tts_service
 
 logger = logging.getLogger("TTSEngine")
 
-# Edge-TTS voice selection
-EDGE_VOICE = "en-US-GuyNeural"
-EDGE_VOICE_FALLBACKS = ["en-US-ChristopherNeural", "en-US-EricNeural", "en-US-AndrewNeural"]
-
-# Piper model config
-PIPER_MODEL_PATH = settings.TTS_MODEL_PATH
-
-# Attempt imports
-_edge_tts_available = False
-try:
-    import edge_tts
-    _edge_tts_available = True
-except ImportError:
-    logger.warning("edge-tts not installed. Install with: pip install edge-tts")
-
-_piper_available = False
-try:
-    from piper import PiperVoice
-    _piper_available = True
-except ImportError:
-    logger.warning("piper-tts not installed. Install with: pip install piper-tts")
-
 
 class TTSEngine:
     """Text-to-Speech engine with edge-tts (online) and piper (offline) backends."""
 
-    def __init__(self, vad_module=None) -> None:
+    def __init__(self, vad_module=None, service: TTSService | None = None) -> None:
+        """
+        Args:
+            vad_module: Recorder used for local barge-in and speaking/listening mode.
+            service: Synthesis backend (default: the process-wide ``TTSService``).
+        """
         self.vad = vad_module
-        self._piper_voice = None
-        self._edge_failed_count = 0
-        self._max_edge_failures = 5
-
-        # Ensure temp directory exists
-        self._temp_dir = settings.BASE_DIR / "data" / "temp"
-        self._temp_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create or get event loop for async edge-tts
-        try:
-            self._loop = asyncio.new_event_loop()
-        except Exception:
-            self._loop = asyncio.get_event_loop()
-
-        logger.info(f"TTS Engine initialized (edge-tts: {_edge_tts_available}, piper: {_piper_available})")
-
-    def _get_piper_voice(self):
-        """Lazy-load Piper voice model."""
-        if self._piper_voice is None and _piper_available:
-            model_path = PIPER_MODEL_PATH
-            if model_path.exists():
-                try:
-                    self._piper_voice = PiperVoice.load(str(model_path))
-                    logger.info(f"Piper voice loaded: {model_path.name}")
-                except Exception as e:
-                    logger.error(f"Failed to load Piper voice: {e}")
-            else:
-                logger.warning(f"Piper model not found at: {model_path}")
-        return self._piper_voice
+        self.service = service or get_tts_service()
+        logger.info(f"TTS Engine initialized ({', '.join(b.name for b in self.service.backends)})")
 
     # ── Public API ────────────────────────────────────────────────
 
@@ -98,72 +52,45 @@ class TTSEngine:
         self._synthesize_and_play(text)
 
     def speak_stream(self, text_generator: Generator) -> None:
-        """Stream sentences to TTS, synthesize concurrently, and play sequentially."""
-        import queue
-        import threading
+        """Stream sentences to TTS, synthesize concurrently, and play sequentially.
 
+        Each sentence is submitted to the TTS service as soon as it arrives,
+        so later sentences synthesize while earlier ones play.
+        """
         self._interrupted = False
         self.interrupt_event = threading.Event()
-        
-        text_queue = queue.Queue()
-        audio_queue = queue.Queue()
-        
-        # Thread 1: Synthesizer Worker
-        def synthesizer_worker():
-            while not self.interrupt_event.is_set():
-                try:
-                    text = text_queue.get(timeout=0.5)
-                    if text is None:  # EOF
-                        audio_queue.put(None)
-                        break
-                    
-                    audio_path = None
-                    if _edge_tts_available and self._edge_failed_count < self._max_edge_failures:
-                        audio_path = self._synthesize_edge(text)
-                        if not audio_path:
-                            self._edge_failed_count += 1
-                            
-                    if not audio_path and _piper_available:
-                        audio_path = self._synthesize_piper(text)
-                        
-                    if audio_path:
-                        audio_queue.put(audio_path)
-                    text_queue.task_done()
-                except queue.Empty:
-                    continue
 
-        # Thread 2: Player Worker
+        audio_queue = queue.Queue()  # synthesis futures, in sentence order
+
+        # Thread 1: Player Worker
         def player_worker():
             while not self.interrupt_event.is_set():
                 try:
-                    audio_path = audio_queue.get(timeout=0.5)
-                    if audio_path is None:  # EOF
-                        break
-                        
-                    if not self.interrupt_event.is_set():
-                        try:
-                            data, samplerate = sf.read(audio_path, dtype='float32')
-                            sd.play(data, samplerate=samplerate)
-                            # Wait loop that can be interrupted
-                            while sd.get_stream() and sd.get_stream().active and not self.interrupt_event.is_set():
-                                time.sleep(0.05)
-                            
-                            if self.interrupt_event.is_set():
-                                sd.stop()
-                        except Exception as e:
-                            logger.warning(f"Audio playback error: {e}")
-                            
-                        # Cleanup
-                        try:
-                            if os.path.exists(audio_path):
-                                os.remove(audio_path)
-                        except OSError:
-                            pass
-                    audio_queue.task_done()
+                    future = audio_queue.get(timeout=0.5)
                 except queue.Empty:
                     continue
+                if future is None:  # EOF
+                    break
 
-        # Thread 3: Barge-in Interrupt Listener
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"TTS synthesis error: {e}")
+                    result = None
+                if result and not self.interrupt_event.is_set():
+                    try:
+                        data, samplerate = sf.read(io.BytesIO(result[0]), dtype='float32')
+                        sd.play(data, samplerate=samplerate)
+                        # Wait loop that can be interrupted
+                        while sd.get_stream() and sd.get_stream().active and not self.interrupt_event.is_set():
+                            time.sleep(0.05)
+
+                        if self.interrupt_event.is_set():
+                            sd.stop()
+                    except Exception as e:
+                        logger.warning(f"Audio playback error: {e}")
+
+        # Thread 2: Barge-in Interrupt Listener
         def interrupt_listener():
             if not self.vad:
                 return
@@ -193,8 +120,7 @@ class TTSEngine:
                 logger.warning(f"Interrupt listener error: {e}")
 
         # Start workers
-        t1 = threading.Thread(target=synthesizer_worker, daemon=True)
-        t2 = threading.Thread(target=player_worker, daemon=True)
+        t1 = threading.Thread(target=player_worker, daemon=True)
         
         try:
             from config import settings
@@ -202,17 +128,16 @@ class TTSEngine:
         except ImportError:
             enable_barge_in = False
             
-        t3 = None
+        t2 = None
         if enable_barge_in:
-            t3 = threading.Thread(target=interrupt_listener, daemon=True)
+            t2 = threading.Thread(target=interrupt_listener, daemon=True)
         
         if self.vad:
             self.vad.set_mode('speaking')
             
         t1.start()
-        t2.start()
-        if t3:
-            t3.start()
+        if t2:
+            t2.start()
 
         # Producer Loop
         collected = []
@@ -225,16 +150,16 @@ class TTSEngine:
                     continue
                 print(sentence, end=" ", flush=True)
                 collected.append(sentence)
-                text_queue.put(sentence)
+                audio_queue.put(self.service.submit(sentence))
             print()
         except Exception as e:
             logger.error(f"Stream interrupted: {e}")
 
         # Signal completion
-        text_queue.put(None)
-        
-        # Wait for threads to complete cleanly if not interrupted
-        while t1.is_alive() or t2.is_alive():
+        audio_queue.put(None)
+
+        # Wait for playback to complete cleanly if not interrupted
+        while t1.is_alive():
             if self.interrupt_event.is_set():
                 break
             time.sleep(0.1)
@@ -244,10 +169,19 @@ class TTSEngine:
             
         return None
 
+    def synthesize_bytes(self, text: str) -> tuple[bytes, str] | None:
+        """Synthesize ``text`` in memory, without touching disk or speakers.
+
+        Returns:
+            (encoded audio, codec), with codec ``"mp3"`` (edge-tts) or
+            ``"wav"`` (piper), or None if no backend produced audio.
+        """
+        return self.service.synthesize(text)
+
     # ── Core Synthesis ────────────────────────────────────────────
 
     def _synthesize_and_play(self, text: str) -> None:
-        """Try edge-tts, fall back to piper, play audio."""
+        """Synthesize via the TTS service (edge-tts, then piper) and play."""
         if not text.strip():
             return
 
@@ -255,26 +189,9 @@ class TTSEngine:
             if self.vad:
                 self.vad.set_mode('speaking')
 
-            audio_path = None
-
-            # Primary: edge-tts (online, neural quality)
-            if _edge_tts_available and self._edge_failed_count < self._max_edge_failures:
-                audio_path = self._synthesize_edge(text)
-                if not audio_path:
-                    self._edge_failed_count += 1
-                    logger.warning(f"edge-tts failed ({self._edge_failed_count}/{self._max_edge_failures})")
-
-            # Fallback: piper (offline, still good quality)
-            if not audio_path and _piper_available:
-                audio_path = self._synthesize_piper(text)
-
-            # Play audio
-            if audio_path and os.path.exists(audio_path):
-                self._play_audio(audio_path)
-                try:
-                    os.remove(audio_path)
-                except OSError:
-                    pass
+            result = self.synthesize_bytes(text)
+            if result:
+                self._play_audio(result[0])
             else:
                 logger.debug("No TTS audio generated, continuing silently")
 
@@ -284,75 +201,11 @@ class TTSEngine:
             if self.vad:
                 self.vad.set_mode('listening')
 
-    def _synthesize_edge(self, text: str) -> str | None:
-        """Generate audio using edge-tts (Microsoft neural voices)."""
-        timestamp = int(time.time() * 1000000)
-        output_path = str(self._temp_dir / f"tts_{timestamp}.mp3")
-
-        try:
-            async def _generate():
-                communicate = edge_tts.Communicate(text, EDGE_VOICE)
-                await communicate.save(output_path)
-
-            self._loop.run_until_complete(_generate())
-
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 100:
-                logger.debug(f"edge-tts generated {os.path.getsize(output_path)}b")
-                return output_path
-
-        except Exception as e:
-            logger.warning(f"edge-tts synthesis failed: {e}")
-            # Try cleanup
-            try:
-                if os.path.exists(output_path):
-                    os.remove(output_path)
-            except OSError:
-                pass
-
-        return None
-
-    def _synthesize_piper(self, text: str) -> str | None:
-        """Generate audio using Piper TTS (offline neural)."""
-        voice = self._get_piper_voice()
-        if not voice:
-            return None
-
-        timestamp = int(time.time() * 1000000)
-        output_path = str(self._temp_dir / f"tts_{timestamp}.wav")
-
-        try:
-            # Piper outputs raw PCM, write to WAV
-            audio_bytes = io.BytesIO()
-            with wave.open(audio_bytes, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)  # 16-bit
-                wav_file.setframerate(voice.config.sample_rate)
-
-                for audio_chunk in voice.synthesize_stream_raw(text):
-                    wav_file.writeframes(audio_chunk)
-
-            with open(output_path, 'wb') as f:
-                f.write(audio_bytes.getvalue())
-
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 100:
-                logger.debug(f"piper generated {os.path.getsize(output_path)}b")
-                return output_path
-
-        except Exception as e:
-            logger.warning(f"Piper synthesis failed: {e}")
-            try:
-                if os.path.exists(output_path):
-                    os.remove(output_path)
-            except OSError:
-                pass
-
-        return None
-
-    def _play_audio(self, file_path: str) -> None:
-        """Play an audio file (MP3 or WAV) through speakers."""
+    def _play_audio(self, audio: bytes) -> None:
+        """Play encoded audio (MP3 or WAV) through speakers."""
         try:
-            data, samplerate = sf.read(file_path, dtype='float32')
+            data, samplerate = sf.read(io.BytesIO(audio), dtype='float32')
             sd.play(data, samplerate=samplerate)
             sd.wait()
         except Exception as e:
-            logger.warning(f"Audio playback failed: {e}")
\ No newline at end of file
+            logger.warning(f"Audio playback failed: {e}")
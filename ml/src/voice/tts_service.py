@@ -0,0 +1,399 @@
+"""Process-wide text-to-speech synthesis service.
+
+The old engine created its own event loop and held a lock around every
+sentence, so only one sentence was synthesized at a time. ``TTSService``
+instead runs one long-lived asyncio loop on a background thread, and every
+session and the CLI submit sentences to it:
+
+- Up to ``TTS_MAX_CONCURRENT`` sentences are synthesized at once. While
+  sentence 1 plays, sentences 2 and 3 are already being generated.
+- Audio is returned in memory as ``(bytes, codec)``, never via temp files.
+- Backends are tried in ``TTS_BACKENDS`` order. A backend that fails
+  ``TTS_MAX_BACKEND_FAILURES`` times in a row is skipped from then on (e.g.
+  edge-tts while offline).
+- Every result is stored in a ``TTSCache`` keyed by text, voice, backend and
+  sample rate. Repeated utterances return from the cache without touching
+  the loop. ``prewarm`` synthesizes known utterances ahead of time.
+
+Backends:
+
+- ``EdgeTTSBackend``: Microsoft neural voices (online, MP3). Runs natively on
+  the service loop.
+- ``PiperTTSBackend``: local ONNX voice (offline, WAV). Runs blocking on the
+  loop's executor, one call at a time.
+- ``StubTTSBackend``: a local stand-in that sleeps for a configurable
+  latency and returns a tone of speech-like length. Used for offline
+  benchmarks and tests (``TTS_BACKENDS = ("stub",)``).
+"""
+import asyncio
+import io
+import json
+import logging
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config import settings
+from src.voice.tts_cache import TTSCache
+
+logger = logging.getLogger("TTSService")
+
+EDGE_VOICE = "en-US-GuyNeural"
+EDGE_SAMPLE_RATE = 24000  # edge-tts default output: 24 kHz mono MP3
+PIPER_DEFAULT_SAMPLE_RATE = 22050
+MIN_AUDIO_BYTES = 100  # anything shorter is a failed synthesis
+METRICS_WINDOW = 200  # recent syntheses used for latency averages
+
+_edge_tts_available = False
+try:
+    import edge_tts
+    _edge_tts_available = True
+except ImportError:
+    logger.warning("edge-tts not installed. Install with: pip install edge-tts")
+
+_piper_available = False
+try:
+    from piper import PiperVoice
+    _piper_available = True
+except ImportError:
+    logger.warning("piper-tts not installed. Install with: pip install piper-tts")
+
+
+def _wav_bytes(frames: list[bytes], sample_rate: int) -> bytes:
+    """Wrap 16-bit mono PCM chunks in a WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)  # 16-bit
+        wav_file.setframerate(sample_rate)
+        for chunk in frames:
+            wav_file.writeframes(chunk)
+    return buffer.getvalue()
+
+
+# ── Backends ──────────────────────────────────────────────────────
+
+class EdgeTTSBackend:
+    """edge-tts (Microsoft neural voices, online)."""
+
+    name = "edge"
+    codec = "mp3"
+    sample_rate = EDGE_SAMPLE_RATE
+
+    def __init__(self, voice: str = EDGE_VOICE) -> None:
+        self.voice = voice
+
+    @property
+    def available(self) -> bool:
+        return _edge_tts_available
+
+    async def synthesize(self, text: str) -> bytes:
+        chunks = []
+        async for chunk in edge_tts.Communicate(text, self.voice).stream():
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+        return b"".join(chunks)
+
+
+class PiperTTSBackend:
+    """Piper TTS (offline neural). The voice model is loaded on first use."""
+
+    name = "piper"
+    codec = "wav"
+
+    def __init__(self, model_path=settings.TTS_MODEL_PATH) -> None:
+        self.model_path = model_path
+        self.voice = model_path.stem
+        self._voice = None
+        self._sample_rate: int | None = None
+        self._lock = threading.Lock()  # one ONNX session, one call at a time
+
+    @property
+    def available(self) -> bool:
+        return _piper_available and self.model_path.exists()
+
+    @property
+    def sample_rate(self) -> int:
+        """Output rate from the voice's ``.onnx.json`` config (no model load)."""
+        if self._sample_rate is None:
+            try:
+                config = json.loads(Path(f"{self.model_path}.json").read_text())
+                self._sample_rate = int(config["audio"]["sample_rate"])
+            except (OSError, ValueError, KeyError, TypeError):
+                self._sample_rate = PIPER_DEFAULT_SAMPLE_RATE
+        return self._sample_rate
+
+    async def synthesize(self, text: str) -> bytes:
+        return await asyncio.to_thread(self._synthesize_blocking, text)
+
+    def _synthesize_blocking(self, text: str) -> bytes:
+        with self._lock:
+            if self._voice is None:
+                self._voice = PiperVoice.load(str(self.model_path))
+                logger.info(f"Piper voice loaded: {self.model_path.name}")
+            voice = self._voice
+            return _wav_bytes(list(voice.synthesize_stream_raw(text)), voice.config.sample_rate)
+
+
+class StubTTSBackend:
+    """Offline stand-in with edge-tts-like timing, for benchmarks and tests."""
+
+    name = "stub"
+    codec = "wav"
+    voice = "stub"
+    available = True
+
+    def __init__(self, latency: float = 0.3, chars_per_second: float = 15.0,
+                 sample_rate: int = 16000) -> None:
+        """
+        Args:
+            latency: Simulated time to first audio per sentence (seconds).
+            chars_per_second: Speaking rate that determines the clip length.
+            sample_rate: Rate of the generated WAV.
+        """
+        self.latency = latency
+        self.chars_per_second = chars_per_second
+        self.sample_rate = sample_rate
+
+    async def synthesize(self, text: str) -> bytes:
+        await asyncio.sleep(self.latency)
+        n = max(1, int(len(text) / self.chars_per_second * self.sample_rate))
+        tone = 0.1 * np.sin(2 * np.pi * 220 * np.arange(n) / self.sample_rate)
+        return _wav_bytes([(tone * 32767).astype("<i2").tobytes()], self.sample_rate)
+
+
+BACKENDS = {
+    "edge": EdgeTTSBackend,
+    "piper": PiperTTSBackend,
+    "stub": StubTTSBackend,
+}
+
+
+# ── Service ───────────────────────────────────────────────────────
+
+class TTSService:
+    """Concurrent TTS on one long-lived event loop, shared by all sessions."""
+
+    def __init__(self, backends: list | None = None,
+                 max_concurrent: int = settings.TTS_MAX_CONCURRENT,
+                 timeout: float = settings.TTS_TIMEOUT_SECONDS,
+                 max_failures: int = settings.TTS_MAX_BACKEND_FAILURES,
+                 retry_after: float = settings.TTS_BACKEND_RETRY_SECONDS,
+                 cache: TTSCache | None = None) -> None:
+        """
+        Args:
+            backends: Backend instances in fallback order (default: built
+                      from ``settings.TTS_BACKENDS``).
+            max_concurrent: Sentences synthesized at once.
+            timeout: Per-backend deadline for one sentence (seconds).
+            max_failures: Consecutive failures after which a backend is skipped.
+            retry_after: Seconds a skipped backend sits out before one request
+                         tries it again; success clears its failure count.
+            cache: Utterance cache (default: ``TTSCache`` under data/cache/tts).
+        """
+        if backends is None:
+            backends = [BACKENDS[name]() for name in settings.TTS_BACKENDS]
+        self.backends = backends
+        self.cache = cache or TTSCache()
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout = timeout
+        self.max_failures = max_failures
+        self.retry_after = retry_after
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        self._stats_lock = threading.Lock()
+        self._failures = {b.name: 0 for b in backends}
+        self._retry_at = {b.name: 0.0 for b in backends}  # monotonic time of the next trial
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._latencies: deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    def submit(self, text: str) -> Future:
+        """Queue ``text`` for synthesis without waiting.
+
+        Cached utterances come back as an already-completed future.
+
+        Returns:
+            Future resolving to ``(audio, codec)`` or None if every backend failed.
+        """
+        backend = self._usable_backend()
+        cached = self.cache.get(self._cache_key(text, backend)) if backend is not None else None
+        if cached is not None:
+            future: Future = Future()
+            future.set_result(cached)
+            return future
+        return asyncio.run_coroutine_threadsafe(self._synthesize(text), self._ensure_loop())
+
+    def prewarm(self, texts) -> Future:
+        """Synthesize and cache ``texts`` in the background, one at a time.
+
+        Only one concurrency slot is used, so live sentences are not held up.
+        Texts that are already cached are skipped.
+
+        Returns:
+            Future resolving to the number of utterances newly cached.
+        """
+        return asyncio.run_coroutine_threadsafe(self._prewarm(list(texts)), self._ensure_loop())
+
+    def synthesize(self, text: str) -> tuple[bytes, str] | None:
+        """Synthesize ``text`` and wait for ``(audio, codec)`` (None on failure)."""
+        if not text.strip():
+            return None
+        return self.submit(text).result()
+
+    def stats(self) -> dict:
+        """Concurrency, failure counters and latency."""
+        with self._stats_lock:
+            latencies = list(self._latencies)
+            return {
+                "max_concurrent": self.max_concurrent,
+                "loop_running": self._loop is not None,
+                "backends": [
+                    {
+                        "name": b.name,
+                        "available": b.available,
+                        "consecutive_failures": self._failures[b.name],
+                        "skipped": self._failures[b.name] >= self.max_failures,
+                        "retry_in_seconds": round(max(self._retry_at[b.name] - time.monotonic(), 0.0), 1)
+                        if self._failures[b.name] >= self.max_failures else 0.0,
+                    }
+                    for b in self.backends
+                ],
+                "in_flight": self._in_flight,
+                "completed_total": self._completed,
+                "failed_total": self._failed,
+                "avg_synthesis_ms": round(1000 * sum(latencies) / len(latencies), 1) if latencies else 0.0,
+                "cache": self.cache.stats(),
+            }
+
+    def close(self) -> None:
+        """Stop the loop; queued syntheses are abandoned."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    # ── Loop ──────────────────────────────────────────────────────
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is not None:
+            return self._loop
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="tts-loop", daemon=True)
+                self._thread.start()
+                self._loop = loop
+                logger.info(f"TTS service started ({', '.join(b.name for b in self.backends)}; "
+                            f"{self.max_concurrent} concurrent)")
+        return self._loop
+
+    def _usable_backend(self):
+        """The backend the next synthesis would try first."""
+        for backend in self.backends:
+            if backend.available and self._failures[backend.name] < self.max_failures:
+                return backend
+        return None
+
+    def _claim_attempt(self, backend) -> bool:
+        """Whether this synthesis may try ``backend``.
+
+        A skipped backend is let through for a single trial once its retry
+        time has passed; the next trial is pushed back by ``retry_after``.
+        """
+        if not backend.available:
+            return False
+        with self._stats_lock:
+            if self._failures[backend.name] < self.max_failures:
+                return True
+            now = time.monotonic()
+            if now < self._retry_at[backend.name]:
+                return False
+            self._retry_at[backend.name] = now + self.retry_after
+            logger.info(f"Retrying skipped TTS backend {backend.name}")
+            return True
+
+    @staticmethod
+    def _cache_key(text: str, backend) -> str:
+        return TTSCache.key(text, backend.voice, backend.name, backend.sample_rate)
+
+    async def _prewarm(self, texts: list[str]) -> int:
+        cached = 0
+        for text in texts:
+            backend = self._usable_backend()
+            if backend is None:
+                break
+            if not text.strip() or self._cache_key(text, backend) in self.cache:
+                continue
+            if await self._synthesize(text) is not None:
+                cached += 1
+        logger.info(f"TTS prewarm cached {cached} of {len(texts)} utterances")
+        return cached
+
+    async def _synthesize(self, text: str) -> tuple[bytes, str] | None:
+        async with self._semaphore:
+            started = time.perf_counter()
+            with self._stats_lock:
+                self._in_flight += 1
+            try:
+                for backend in self.backends:
+                    if not self._claim_attempt(backend):
+                        continue
+                    try:
+                        audio = await asyncio.wait_for(backend.synthesize(text), self.timeout)
+                    except Exception as e:
+                        logger.warning(f"{backend.name} synthesis failed: {e!r}")
+                        audio = None
+
+                    if audio and len(audio) > MIN_AUDIO_BYTES:
+                        with self._stats_lock:
+                            self._failures[backend.name] = 0
+                            self._completed += 1
+                            self._latencies.append(time.perf_counter() - started)
+                        # Disk write off the loop; the result is returned right away
+                        asyncio.get_running_loop().run_in_executor(
+                            None, self.cache.put, self._cache_key(text, backend), audio, backend.codec)
+                        return audio, backend.codec
+                    with self._stats_lock:
+                        self._failures[backend.name] += 1
+                        if self._failures[backend.name] == self.max_failures:
+                            self._retry_at[backend.name] = time.monotonic() + self.retry_after
+                        logger.warning(f"{backend.name} failed "
+                                       f"({self._failures[backend.name]}/{self.max_failures})")
+
+                with self._stats_lock:
+                    self._failed += 1
+                logger.debug("No TTS audio generated")
+                return None
+            finally:
+                with self._stats_lock:
+                    self._in_flight -= 1
+
+
+_global_tts_service: Optional[TTSService] = None
+_tts_service_lock = threading.Lock()
+
+
+def get_tts_service() -> TTSService:
+    """Return singleton TTSService instance."""
+    global _global_tts_service
+    if _global_tts_service is None:
+        with _tts_service_lock:
+            if _global_tts_service is None:
+                _global_tts_service = TTSService()
+    return _global_tts_service
@@ -0,0 +1,151 @@
+"""Sentence-pipelined TTS for streaming replies to a remote client.
+
+As the LLM yields sentence fragments, ``SpeechStream`` synthesizes them and
+emits encoded audio as self-describing binary frames. The first sentence is
+spoken while the LLM is still generating the rest. Up to ``max_in_flight``
+sentences synthesize at once. Fragments that arrive while that window is
+full are merged into the next request, so a fast LLM costs fewer TTS
+round-trips instead of building a backlog.
+
+Frame layout (big-endian, ``FRAME_HEADER``)::
+
+    magic    4s   b"TTSA"
+    stream   u32  reply id; frames of an abandoned reply can be dropped
+    seq      u32  0, 1, 2, ... within a stream (play in this order)
+    codec    u8   CODEC_MP3 / CODEC_WAV (CODEC_NONE on the empty final frame)
+    flags    u8   FLAG_FINAL on the last frame of the stream
+    payload       one complete encoded audio file (one or more sentences)
+"""
+import asyncio
+import logging
+import struct
+from collections import deque
+from typing import AsyncGenerator, Callable, NamedTuple
+
+logger = logging.getLogger("TTSStream")
+
+FRAME_MAGIC = b"TTSA"
+FRAME_HEADER = struct.Struct("!4sIIBB")
+CODEC_NONE = 0
+CODEC_MP3 = 1
+CODEC_WAV = 2
+CODECS = {"mp3": CODEC_MP3, "wav": CODEC_WAV}
+FLAG_FINAL = 0x01
+
+
+class SpeechFrame(NamedTuple):
+    stream_id: int
+    seq: int
+    codec: int
+    final: bool
+    payload: bytes
+
+
+def encode_frame(stream_id: int, seq: int, payload: bytes,
+                 codec: int = CODEC_NONE, final: bool = False) -> bytes:
+    """Prefix ``payload`` with the binary frame header."""
+    header = FRAME_HEADER.pack(FRAME_MAGIC, stream_id, seq, codec, FLAG_FINAL if final else 0)
+    return header + payload
+
+
+def decode_frame(frame: bytes) -> SpeechFrame:
+    """Parse a frame produced by ``encode_frame``.
+
+    Raises:
+        ValueError: If the frame is truncated or not a TTS frame.
+    """
+    if len(frame) < FRAME_HEADER.size:
+        raise ValueError("Truncated TTS frame")
+    magic, stream_id, seq, codec, flags = FRAME_HEADER.unpack_from(frame)
+    if magic != FRAME_MAGIC:
+        raise ValueError("Not a TTS frame")
+    return SpeechFrame(stream_id, seq, codec, bool(flags & FLAG_FINAL),
+                       bytes(frame[FRAME_HEADER.size:]))
+
+
+class SpeechStream:
+    """Text in (``feed``/``close``), ordered audio frames out (``frames``)."""
+
+    def __init__(self, synthesize: Callable[[str], tuple[bytes, str] | None],
+                 stream_id: int = 0, max_in_flight: int = 3) -> None:
+        """
+        Args:
+            synthesize: Blocking ``text -> (audio, codec) | None``, e.g.
+                        ``TTSEngine.synthesize_bytes``. Runs on worker threads.
+            stream_id: Written into every frame header.
+            max_in_flight: Syntheses running at once for this stream.
+        """
+        self._synthesize = synthesize
+        self.stream_id = stream_id
+        self.max_in_flight = max(1, max_in_flight)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._seq = 0
+
+    def feed(self, text: str) -> None:
+        """Queue a text fragment for speaking (non-blocking)."""
+        if text and text.strip():
+            self._queue.put_nowait(text.strip())
+
+    def close(self) -> None:
+        """No more text; ``frames`` ends after speaking what is queued."""
+        self._queue.put_nowait(None)
+
+    async def frames(self) -> AsyncGenerator[bytes, None]:
+        """Yield encoded frames in order, ending with an empty final frame."""
+        in_flight: deque[tuple[int, asyncio.Task]] = deque()  # (fragments, synthesis)
+        getter: asyncio.Task | None = None
+        closed = False
+        try:
+            while in_flight or not closed:
+                if getter is None and not closed and len(in_flight) < self.max_in_flight:
+                    getter = asyncio.ensure_future(self._queue.get())
+
+                waits = {in_flight[0][1]} if in_flight else set()
+                if getter is not None:
+                    waits.add(getter)
+                done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+
+                if getter in done:
+                    closed = self._dispatch(getter.result(), in_flight)
+                    getter = None
+                while in_flight and in_flight[0][1].done():
+                    frame = self._frame(*in_flight.popleft())
+                    if frame is not None:
+                        yield frame
+        finally:
+            if getter is not None:
+                getter.cancel()
+            for _, task in in_flight:
+                task.cancel()
+
+        yield encode_frame(self.stream_id, self._seq, b"", final=True)
+
+    def _dispatch(self, text: str | None, in_flight: deque) -> bool:
+        """Start synthesizing ``text`` plus anything queued behind it; True once closed."""
+        if text is None:
+            return True
+        parts = [text]
+        closed = False
+        # Merge whatever the LLM produced while the window was full
+        while not self._queue.empty():
+            more = self._queue.get_nowait()
+            if more is None:
+                closed = True
+                break
+            parts.append(more)
+        task = asyncio.ensure_future(asyncio.to_thread(self._synthesize, " ".join(parts)))
+        in_flight.append((len(parts), task))
+        return closed
+
+    def _frame(self, fragments: int, task: asyncio.Task) -> bytes | None:
+        try:
+            result = task.result()
+        except Exception as e:
+            logger.warning(f"TTS synthesis failed, skipping {fragments} fragment(s): {e}")
+            return None
+        if result is None:
+            return None
+        audio, codec = result
+        frame = encode_frame(self.stream_id, self._seq, audio, CODECS.get(codec, CODEC_NONE))
+        self._seq += 1
+        return frame
@@ -70,7 +70,7 @@ class TestPromptManager:
     def test_rag_context_integration(self):
         from src.brain.prompt_manager import PromptManager
         mock_rag = MagicMock()
-        mock_rag.query_jd.return_value = ["Must have 5 years Python experience"]
+        mock_rag.query_jd_multi.return_value = ["Must have 5 years Python experience"]
         pm = PromptManager(rag_engine=mock_rag)
         assert pm.has_jd is True
         msgs = pm.build_messages([])
@@ -91,7 +91,7 @@ class TestPromptManager:
     def test_get_opening_prompt_with_jd_only(self):
         from src.brain.prompt_manager import PromptManager
         mock_rag = MagicMock()
-        mock_rag.query_jd.return_value = ["Senior Python Developer required"]
+        mock_rag.query_jd_multi.return_value = ["Senior Python Developer required"]
         pm = PromptManager(rag_engine=mock_rag)
         prompt = pm.get_opening_prompt()
         assert "job description" in prompt.lower()
@@ -141,5 +141,201 @@ class TestEvaluator:
         assert isinstance(report, dict)
 
 
+class TestTurnScoring:
+    """Tests for background per-turn scoring and the digest-based report."""
+
+    @staticmethod
+    def _scored(answer, tech=8, clarity=6, comm=7):
+        return {"technical_accuracy": tech, "clarity": clarity, "communication": comm,
+                "weighted_score": 7.2, "strengths": ["clear example"], "weaknesses": ["no metrics"],
+                "suggested_improvement": "Quantify impact.", "question": "Q?", "answer": answer}
+
+    def test_scoring_waits_for_live_generation(self):
+        import time
+        from src.brain.llm_engine import live_generation
+        from src.brain.turn_scorer import TurnScorer
+        evaluator = MagicMock()
+        evaluator.evaluate_answer.return_value = {"weighted_score": 5}
+        scorer = TurnScorer(llm_model=MagicMock(), evaluator=evaluator)
+
+        with live_generation():
+            future = scorer.submit("What is a mutex?", "A lock for shared state")
+            time.sleep(0.1)
+            evaluator.evaluate_answer.assert_not_called()
+        assert future.result(timeout=2)["answer"] == "A lock for shared state"
+
+    def test_idle_wait_is_bounded(self):
+        from src.brain.llm_engine import live_generation
+        from src.brain.turn_scorer import TurnScorer
+        evaluator = MagicMock()
+        evaluator.evaluate_answer.return_value = {"weighted_score": 5}
+        scorer = TurnScorer(llm_model=MagicMock(), evaluator=evaluator)
+
+        with patch("config.settings.TURN_SCORE_MAX_IDLE_WAIT_SECONDS", 0.1), live_generation():
+            future = scorer.submit("What is a mutex?", "A lock for shared state")
+            assert future.result(timeout=2)["weighted_score"] == 5
+
+    def test_expedited_job_skips_idle_wait(self):
+        from src.brain.llm_engine import live_generation
+        from src.brain.turn_scorer import TurnScorer
+        evaluator = MagicMock()
+        evaluator.evaluate_answer.return_value = {"weighted_score": 5}
+        scorer = TurnScorer(llm_model=MagicMock(), evaluator=evaluator)
+
+        with patch("config.settings.TURN_SCORE_MAX_IDLE_WAIT_SECONDS", 30), live_generation():
+            first = scorer.submit("Q1?", "A1")   # picked up, waits for idle
+            second = scorer.submit("Q2?", "A2")  # still queued
+            assert scorer.expedite([second]) == 1
+            assert second.result(timeout=2)["answer"] == "A2"
+            assert not first.done()
+        assert first.result(timeout=2)["answer"] == "A1"
+        assert evaluator.evaluate_answer.call_count == 2
+
+    def test_collect_scores_cancels_stragglers(self):
+        from concurrent.futures import Future
+        from src.brain.turn_scorer import collect_scores
+        done, queued = Future(), Future()
+        done.set_result({"weighted_score": 6})
+        assert collect_scores([done, queued], timeout=0.05) == [{"weighted_score": 6}]
+        assert queued.cancelled()
+
+    def test_report_reduces_turn_scores(self):
+        from src.brain.evaluator import Evaluator
+        llm = MagicMock()
+        llm.create_chat_completion.return_value = {"choices": [{"message": {"content": json.dumps(
+            {"mistakes": ["vague"], "ai_insight": "Solid fundamentals."})}}]}
+        long_answer = "I used a mutex " * 200
+        history = [
+            {"role": "user", "content": "Begin the interview."},
+            {"role": "assistant", "content": "What is a mutex?"},
+            {"role": "user", "content": long_answer},
+            {"role": "assistant", "content": "And a semaphore?"},
+            {"role": "user", "content": "A counter"},
+        ]
+        report = Evaluator(llm_model=llm).generate_report(
+            history, per_question_scores=[self._scored(long_answer[:300])]
+        )
+
+        prompt = llm.create_chat_completion.call_args.kwargs["messages"][0]["content"]
+        assert long_answer not in prompt and "Answer (unscored): A counter" in prompt
+        assert report["score"] == 72  # 8*0.5 + 6*0.3 + 7*0.2 = 7.2 out of 10
+        assert report["mistakes"] == ["vague"] and report["ai_insight"] == "Solid fundamentals."
+        assert report["question_bank_summary"]["total_questions"] == 1
+
+    def test_report_survives_summary_failure(self):
+        from src.brain.evaluator import Evaluator
+        llm = MagicMock()
+        llm.create_chat_completion.side_effect = RuntimeError("ollama down")
+        history = [{"role": "assistant", "content": "Q?"}, {"role": "user", "content": "an answer"}]
+        report = Evaluator(llm_model=llm).generate_report(
+            history, per_question_scores=[self._scored("an answer")]
+        )
+        assert report["score"] > 0
+        assert report["suggestions"] == ["Quantify impact."]
+        assert report["domain_rating"]["Technical"] == 80
+
+
+class TestLLMEngine:
+    """Tests for the Ollama transport — backoff, probe caching, async streaming."""
+
+    def _make_engine(self):
+        from src.brain.llm_engine import LLMEngine
+        engine = LLMEngine.__new__(LLMEngine)
+        engine.model = MagicMock(model_name="gemma4")
+        engine.prompt_manager = MagicMock()
+        engine.prompt_manager.build_messages.return_value = [{"role": "user", "content": "hi"}]
+        engine.history = []
+        engine._is_first_call = True
+        engine._async_model = None
+        engine._async_lock = None
+        return engine
+
+    def test_backoff_delay_is_bounded_and_grows(self):
+        from src.brain import llm_engine
+        for attempt in range(10):
+            ceiling = min(llm_engine.RETRY_MAX_DELAY, llm_engine.RETRY_BASE_DELAY * 2 ** attempt)
+            assert ceiling / 2 <= llm_engine.backoff_delay(attempt) <= ceiling
+
+    def test_model_probe_is_cached(self):
+        from src.brain import llm_engine
+        session = MagicMock()
+        session.get.return_value.json.return_value = {"models": [{"name": "gemma4:latest"}]}
+        with patch.object(llm_engine, "_get_http_session", return_value=session):
+            assert llm_engine.list_models(force=True) == ["gemma4:latest"]
+            llm_engine.OllamaClient("gemma4")
+            llm_engine.OllamaClient("gemma4")
+        session.get.assert_called_once()
+
+    def test_warm_prefix_matches_next_request(self):
+        from src.brain.prompt_manager import PromptManager
+        engine = self._make_engine()
+        engine.prompt_manager = PromptManager()
+        engine.model.create_chat_completion.return_value = {}
+        engine.history = [{"role": "user" if i % 2 else "assistant", "content": f"m{i}"}
+                          for i in range(15)]
+        engine.warm_prefix("Medium")
+
+        warmed = engine.model.create_chat_completion.call_args.kwargs["messages"]
+        next_request = engine.prompt_manager.build_messages(
+            engine.history + [{"role": "user", "content": "my answer"}], "Medium"
+        )
+        assert warmed == next_request[:-1]
+
+    def test_aiohttp_sessions_are_closed(self):
+        import asyncio
+        from src.brain import llm_engine
+        pytest.importorskip("aiohttp")
+
+        async def open_session():
+            return llm_engine._get_aiohttp_session()
+
+        finished = asyncio.run(open_session())  # its loop is closed by now
+        idle_loop = asyncio.new_event_loop()
+        try:
+            idle = idle_loop.run_until_complete(open_session())
+            llm_engine.close_aiohttp_sessions()
+        finally:
+            idle_loop.close()
+        assert finished.closed and idle.closed
+        assert not llm_engine._aiohttp_sessions
+
+    def test_agenerate_stream_fragments_and_history(self):
+        import asyncio
+
+        async def fake_stream(**kwargs):
+            for token in ["Hello", " there.", " How are", " you?"]:
+                yield {"message": {"content": token}, "done": False}
+            yield {"message": {"content": ""}, "done": True}
+
+        engine = self._make_engine()
+        engine._async_model = MagicMock()
+        engine._async_model.astream_chat.side_effect = fake_stream
+
+        async def collect():
+            return [f async for f in engine.agenerate_stream("hi")]
+
+        assert asyncio.run(collect()) == ["Hello there.", " How are you?"]
+        assert engine.history[-1] == {"role": "assistant", "content": "Hello there. How are you?"}
+
+    def test_agenerate_stream_falls_back_on_error(self):
+        import asyncio
+        from src.brain.llm_engine import FALLBACK_REPLY
+
+        async def failing_stream(**kwargs):
+            raise ConnectionError("ollama down")
+            yield  # pragma: no cover
+
+        engine = self._make_engine()
+        engine._async_model = MagicMock()
+        engine._async_model.astream_chat.side_effect = failing_stream
+
+        async def collect():
+            return [f async for f in engine.agenerate_stream("hi")]
+
+        assert asyncio.run(collect()) == [FALLBACK_REPLY]
+        assert engine.history[-1] == {"role": "assistant", "content": FALLBACK_REPLY}
+        assert len(engine.history) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
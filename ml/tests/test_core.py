@@ -1,4 +1,4 @@
-"""Tests for core module: SessionState, CacheManager, ResumeLoader, JDLoader."""
+"""Tests for core module: SessionState, CacheManager, embeddings, ResumeLoader, JDLoader."""
 import json
 import os
 import tempfile
@@ -103,6 +103,198 @@ class TestCacheManager:
         # Check in-memory cache uses sha256 key
         assert expected_hash in cm.embedding_cache
 
+    def test_embedding_batch_roundtrip_persists(self):
+        from src.core.cache_manager import CacheManager
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cm = CacheManager(cache_dir=tmpdir)
+            vecs = np.random.rand(3, 8).astype(np.float32)
+            cm.set_embedding_cache_many(["a", "b", "c"], vecs)
+
+            # A fresh instance (e.g. another worker process) reads from disk.
+            other = CacheManager(cache_dir=tmpdir)
+            results = other.get_embedding_cache_many(["a", "missing", "c"])
+            assert results[1] is None
+            assert np.allclose(results[0], vecs[0], atol=1e-3)
+            assert np.allclose(results[2], vecs[2], atol=1e-3)
+            assert not list(Path(tmpdir).glob("emb_*.json"))
+
+    def test_refresh_from_disk_keeps_write_timestamp(self):
+        from src.core.cache_manager import CacheManager
+        with tempfile.TemporaryDirectory() as tmpdir:
+            written_at = time.time() - 100
+            with patch("src.core.vector_store.time.time", return_value=written_at):
+                CacheManager(cache_dir=tmpdir).set_embedding_cache("a", np.ones(4))
+
+            reader = CacheManager(cache_dir=tmpdir)
+            reader.cache_ttl = 150
+            assert reader.get_embedding_cache("a") is not None
+            assert reader.embedding_cache[reader._hash_content("a")]["timestamp"] == written_at
+            # Reading it did not extend its TTL.
+            reader.cache_ttl = 50
+            assert reader.get_embedding_cache("a") is None
+
+    def test_expired_entry_is_rewritten(self):
+        from src.core.cache_manager import CacheManager
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with patch("src.core.vector_store.time.time", return_value=time.time() - 100):
+                CacheManager(cache_dir=tmpdir).set_embedding_cache("a", np.zeros(4))
+
+            writer = CacheManager(cache_dir=tmpdir)
+            writer.cache_ttl = 50
+            assert writer.get_embedding_cache("a") is None
+            writer.set_embedding_cache("a", np.ones(4))
+
+            reader = CacheManager(cache_dir=tmpdir)
+            reader.cache_ttl = 50
+            assert np.allclose(reader.get_embedding_cache("a"), np.ones(4), atol=1e-3)
+
+    def test_memory_cache_is_bounded(self):
+        cm, _ = self._make_cm()
+        cm.memory_cache_size = 2
+        for i in range(5):
+            cm.set_embedding_cache(f"t{i}", np.array([float(i)]))
+        assert len(cm.embedding_cache) == 2
+
+
+class TestVectorStore:
+    def test_roundtrip_and_dedup(self):
+        from src.core.vector_store import VectorStore
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = VectorStore(tmpdir, dim=4, dtype="float32")
+            keys = [bytes([i]) * 32 for i in range(3)]
+            vecs = np.arange(12, dtype=np.float32).reshape(3, 4)
+            assert store.put_many(keys, vecs) == 3
+            assert store.put_many(keys[:1], vecs[:1]) == 0
+            out = store.get_many(keys + [b"\xff" * 32])
+            assert out[3] is None
+            assert np.array_equal(np.stack(out[:3]), vecs)
+
+    def test_sees_appends_from_other_instance(self):
+        from src.core.vector_store import VectorStore
+        with tempfile.TemporaryDirectory() as tmpdir:
+            reader = VectorStore(tmpdir, dim=2)
+            writer = VectorStore(tmpdir, dim=2)
+            writer.put_many([b"k" * 32], np.ones((1, 2)))
+            assert np.allclose(reader.get_many([b"k" * 32])[0], [1.0, 1.0])
+
+    def test_compaction_bounds_size(self):
+        from src.core.vector_store import VectorStore
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = VectorStore(tmpdir, dim=2, max_entries=8)
+            for i in range(20):
+                store.put_many([i.to_bytes(32, "big")], np.full((1, 2), i))
+            assert len(store) <= 8
+            # Most recent entries survive compaction, with their values.
+            assert np.allclose(store.get_many([(19).to_bytes(32, "big")])[0], [19, 19])
+            reopened = VectorStore(tmpdir, dim=2, max_entries=8)
+            assert len(reopened) == len(store)
+
+    def test_put_keeps_given_timestamps(self):
+        from src.core.vector_store import VectorStore
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = VectorStore(tmpdir, dim=2)
+            store.put_many([b"k" * 32], np.ones((1, 2)), timestamps=[123.0])
+            vector, ts = store.get_entries([b"k" * 32])[0]
+            assert ts == 123.0 and np.allclose(vector, [1.0, 1.0])
+            assert store.get_many([b"k" * 32], ttl=60)[0] is None
+
+    def test_compaction_drops_expired_rows(self):
+        from src.core.vector_store import VectorStore
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = VectorStore(tmpdir, dim=2, max_entries=8)
+            stale = [i.to_bytes(32, "big") for i in range(6)]
+            store.put_many(stale, np.ones((6, 2)), timestamps=[0.0] * 6)
+            for i in range(6, 9):
+                store.put_many([i.to_bytes(32, "big")], np.full((1, 2), i), ttl=60)
+            assert len(store) == 3
+            assert store.get_many(stale[:1])[0] is None
+
+    def test_expired_entries_miss(self):
+        from src.core.vector_store import VectorStore
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = VectorStore(tmpdir, dim=2)
+            store.put_many([b"k" * 32], np.ones((1, 2)))
+            assert store.get_many([b"k" * 32], ttl=0)[0] is None
+
+
+class TestEmbeddingRegistry:
+    def _make_registry(self):
+        from src.core.embedding_registry import EmbeddingRegistry
+        fake_model = MagicMock()
+        fake_model.encode.side_effect = lambda batch, **kw: np.ones((len(batch), 4))
+        registry = EmbeddingRegistry(device="cpu")
+        registry._load_model = MagicMock(return_value=fake_model)
+        return registry, fake_model
+
+    def test_model_loaded_once(self):
+        registry, fake_model = self._make_registry()
+        assert registry.get("m") is fake_model
+        assert registry.get("m") is fake_model
+        registry._load_model.assert_called_once_with("m")
+
+    def test_concurrent_get_loads_once(self):
+        import threading
+        registry, _ = self._make_registry()
+        threads = [threading.Thread(target=registry.get, args=("m",)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert registry._load_model.call_count == 1
+
+    def test_encode_shapes(self):
+        registry, _ = self._make_registry()
+        assert registry.encode(["a", "b"], model_name="m").shape == (2, 4)
+        single = registry.encode("a", model_name="m")
+        assert single.shape == (4,)
+        assert single.dtype == np.float32
+
+    def test_warm_up(self):
+        registry, _ = self._make_registry()
+        assert registry.warm_up(["m"]) == ["m"]
+        assert registry.is_loaded("m")
+
+
+class TestEmbeddingBatcher:
+    def _make_batcher(self, **kwargs):
+        from src.core.embedding_batcher import EmbeddingBatcher
+        registry = MagicMock()
+        registry.encode.side_effect = lambda texts, **kw: np.array(
+            [[float(len(t)), 1.0] for t in texts], dtype=np.float32
+        )
+        return EmbeddingBatcher(registry=registry, **kwargs), registry
+
+    def test_encode_matches_sentence_transformer_shapes(self):
+        batcher, _ = self._make_batcher()
+        assert batcher.encode("abc").tolist() == [3.0, 1.0]
+        assert batcher.encode(["a", "bb"]).shape == (2, 2)
+        batcher.close()
+
+    def test_concurrent_requests_share_a_batch(self):
+        from concurrent.futures import ThreadPoolExecutor
+        batcher, registry = self._make_batcher(max_batch_size=16, max_wait_ms=50)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(batcher.encode, [["x" * i] for i in range(1, 9)]))
+        assert [r[0][0] for r in results] == [float(i) for i in range(1, 9)]
+        assert registry.encode.call_count < 8
+        stats = batcher.stats()
+        assert stats["requests_total"] == 8
+        assert 0 < stats["avg_occupancy"] <= 1
+        batcher.close()
+
+    def test_large_request_bypasses_queue(self):
+        batcher, _ = self._make_batcher(max_batch_size=2)
+        out = batcher.encode(["a", "b", "c"])
+        assert out.shape == (3, 2)
+        assert batcher.stats()["bypassed_total"] == 1
+
+    def test_encode_error_propagates(self):
+        batcher, registry = self._make_batcher()
+        registry.encode.side_effect = RuntimeError("boom")
+        with pytest.raises(RuntimeError):
+            batcher.encode("a")
+        batcher.close()
+
 
 class TestResumeLoader:
     def test_no_resume_found(self):
@@ -157,5 +349,117 @@ class TestJDLoader:
             temp_path.unlink(missing_ok=True)
 
 
+class TestTurnPrefetcher:
+    def test_candidates_served_from_prefetch(self):
+        from src.core.turn_prefetch import TurnPrefetcher
+        retrieve = MagicMock(side_effect=lambda d: [{"id": f"q_{d}"}])
+        warm = MagicMock()
+        prefetch = TurnPrefetcher(retrieve, {"Easy", "Medium"}, warm).start()
+
+        assert prefetch.candidates("Easy") == [{"id": "q_Easy"}]
+        assert retrieve.call_count == 2
+        warm.assert_called_once()
+
+    def test_unprefetched_difficulty_retrieves_directly(self):
+        from src.core.turn_prefetch import TurnPrefetcher
+        retrieve = MagicMock(side_effect=lambda d: [{"id": f"q_{d}"}])
+        prefetch = TurnPrefetcher(retrieve, {"Easy"}).start()
+        assert prefetch.candidates("Hard") == [{"id": "q_Hard"}]
+        assert TurnPrefetcher(None, {"Easy"}).start().candidates("Easy") == []
+
+    def test_cancel_drops_queued_jobs(self):
+        import threading
+        from src.core import turn_prefetch
+        release = threading.Event()
+        blockers = [turn_prefetch._executor.submit(release.wait) for _ in range(2)]
+        retrieve, warm = MagicMock(return_value=[]), MagicMock()
+        try:
+            prefetch = turn_prefetch.TurnPrefetcher(retrieve, {"Easy", "Hard"}, warm).start()
+            prefetch.cancel()
+        finally:
+            release.set()
+        for blocker in blockers:
+            blocker.result(timeout=2)
+        turn_prefetch._executor.submit(lambda: None).result(timeout=2)
+        retrieve.assert_not_called()
+        warm.assert_not_called()
+
+    def test_reachable_difficulties_cover_decision(self):
+        from src.brain.decision_engine import DecisionEngine
+        for answer in ["no idea", "short one", "a long and detailed answer " * 3]:
+            engine = DecisionEngine()
+            engine.current_difficulty_score = 4
+            reachable = engine.reachable_difficulties()
+            assert engine.evaluate(answer, "Hard")["new_difficulty"] in reachable
+
+
+class TestReportSections:
+    @staticmethod
+    def _orchestrator():
+        from orchestrator import IntrvAIOrchestrator
+        orch = IntrvAIOrchestrator()
+        orch._evaluator = MagicMock()
+        orch._proctoring = MagicMock()
+        return orch
+
+    def test_sections_stream_as_they_complete(self):
+        orch = self._orchestrator()
+        orch._evaluator.generate_report.side_effect = lambda h, **kw: time.sleep(0.2) or {"overall_score": 7}
+        orch._proctoring.get_violations_summary.return_value = {"total_violations": 0}
+
+        started = time.perf_counter()
+        sections = list(orch.generate_report_sections([{"role": "user", "content": "hi"}],
+                                                      include_proctoring=True))
+        assert [name for name, _ in sections] == ["proctoring", "evaluation"]
+        assert dict(sections)["evaluation"] == {"overall_score": 7}
+        assert time.perf_counter() - started < 0.4
+        orch._proctoring.stop.assert_called_once()
+
+    def test_failed_section_reports_error(self):
+        orch = self._orchestrator()
+        orch._evaluator.generate_report.side_effect = RuntimeError("ollama down")
+        sections = dict(orch.generate_report_sections([{"role": "user", "content": "hi"}]))
+        assert sections == {"evaluation": {"error": "ollama down"}}
+
+    def test_speech_analysis_uses_recorded_turns(self):
+        from config import settings
+        orch = self._orchestrator()
+        orch._evaluator.generate_report.return_value = {}
+        orch._sentiment = MagicMock()
+        orch._sentiment.analyze_batch.return_value = [{
+            "emotions": {"neu": 0.7, "hap": 0.3}, "confidence_score": 0.8,
+            "speech_metrics": {"wpm": 120.0}, "fillers": {"total_fillers": 2},
+        }]
+        with patch.object(settings, "ENABLE_SENTIMENT", True):
+            orch._remember_turn_audio(np.full(16000, 0.5, dtype=np.float32), "I built it")
+            orch._remember_turn_audio(np.zeros(16000, dtype=np.float32), "")  # no transcript
+
+        sections = dict(orch.generate_report_sections([{"role": "user", "content": "I built it"}]))
+        audios, transcripts = orch._sentiment.analyze_batch.call_args[0]
+        assert transcripts == ["I built it"]
+        assert audios[0] == pytest.approx(np.full(16000, 0.5), abs=1e-4)
+        assert sections["speech_analysis"]["dominant_emotion"] == "neu"
+        assert sections["speech_analysis"]["total_filler_words"] == 2
+
+        orch.reset_chat()
+        assert orch.analyze_speech() is None
+
+
+
+class TestServiceStats:
+    def test_stats_only_reported_for_running_services(self, monkeypatch):
+        import sys
+        from orchestrator import IntrvAIOrchestrator
+
+        orch = IntrvAIOrchestrator()
+        monkeypatch.delitem(sys.modules, "src.eyes.vision_service", raising=False)
+        assert orch.vision_stats() is None
+        assert "src.eyes.vision_service" not in sys.modules  # nothing imported or built
+
+        fake_module = MagicMock()
+        fake_module._global_batcher.stats.return_value = {"batches_total": 3}
+        monkeypatch.setitem(sys.modules, "src.core.embedding_batcher", fake_module)
+        assert orch.embedding_stats() == {"batches_total": 3}
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -45,6 +45,42 @@ class TestSentimentAnalyzerFillers:
         assert result == {"neutral": 1.0}
 
 
+class TestSentimentAnalyzerPipeline:
+    """Tests for the decode-once prosody metrics and batched analysis."""
+
+    def _make_analyzer(self):
+        with patch("src.ears.sentiment_analyzer.Wav2Vec2FeatureExtractor"), \
+             patch("src.ears.sentiment_analyzer.Wav2Vec2ForSequenceClassification"):
+            from src.ears.sentiment_analyzer import SentimentAnalyzer
+            analyzer = SentimentAnalyzer()
+            analyzer.model = None
+            return analyzer
+
+    @staticmethod
+    def _tone(seconds=3.0, f0=150.0):
+        t = np.arange(int(16000 * seconds)) / 16000
+        return (0.3 * np.sin(2 * np.pi * f0 * t)).astype(np.float32)
+
+    def test_steady_tone_has_low_jitter(self):
+        analyzer = self._make_analyzer()
+        metrics = analyzer.calculate_speech_metrics(self._tone(), "one two three four five six")
+        assert metrics["wpm"] == pytest.approx(120.0)
+        assert metrics["jitter"] < 0.01
+
+    def test_silence_has_no_pitch(self):
+        analyzer = self._make_analyzer()
+        metrics = analyzer.calculate_speech_metrics(np.zeros(32000, dtype=np.float32), "hi")
+        assert metrics["jitter"] == 0.0
+
+    def test_analyze_batch_matches_turns(self):
+        analyzer = self._make_analyzer()
+        results = analyzer.analyze_batch([self._tone(), self._tone(1.5)], ["umm yes", "so basically"])
+        assert len(results) == 2
+        assert results[0]["fillers"]["total_fillers"] == 1
+        assert results[1]["dominant_emotion"] == "neutral"
+        assert analyzer.analyze_full(self._tone(), "umm yes") == results[0]
+
+
 class TestSTTEngine:
     """Tests for STTEngine.transcribe — file validation logic (model mocked)."""
 
@@ -97,6 +133,160 @@ class TestSTTEngine:
             os.unlink(tmp_path)
 
 
+class TestStreamingTranscriber:
+    """Tests for StreamingTranscriber — energy VAD segmentation, partial/final decodes."""
+
+    def _make(self):
+        from src.ears.streaming_stt import StreamingTranscriber
+        stt = MagicMock()
+        stt.transcribe_array.side_effect = lambda audio, **kw: (
+            f"{'final' if kw['beam_size'] > 1 else 'partial'}{len(audio) // 1600}", "en"
+        )
+        return StreamingTranscriber(stt, sample_rate=16000), stt
+
+    @staticmethod
+    def _pcm(seconds, loud):
+        t = np.arange(int(16000 * seconds)) / 16000
+        wave = 0.3 * np.sin(2 * np.pi * 220 * t) if loud else np.zeros_like(t)
+        return (wave * 32767).astype("<i2").tobytes()
+
+    def test_silence_never_decodes(self):
+        transcriber, stt = self._make()
+        assert transcriber.append(self._pcm(2.0, loud=False)) is False
+        assert transcriber.finish() == ""
+        stt.transcribe_array.assert_not_called()
+
+    def test_partial_then_segment_commit(self):
+        transcriber, stt = self._make()
+        assert transcriber.append(self._pcm(1.0, loud=True)) is True
+        assert transcriber.decode_pending().startswith("partial")
+
+        # A pause closes the segment; it is decoded once with the full beam.
+        assert transcriber.append(self._pcm(0.7, loud=False)) is True
+        committed = transcriber.decode_pending()
+        assert committed.startswith("final") and "partial" not in committed
+
+        transcriber.append(self._pcm(0.5, loud=True))
+        text = transcriber.finish()
+        assert text.count("final") == 2
+        assert stt.transcribe_array.call_args.kwargs["language"] == "en"
+
+    def test_odd_byte_frames_are_reassembled(self):
+        transcriber, _ = self._make()
+        pcm = self._pcm(0.5, loud=True)
+        for i in range(0, len(pcm), 333):
+            transcriber.append(pcm[i:i + 333])
+        assert transcriber.total_samples == 8000
+
+    def test_rejects_unsupported_encoding(self):
+        from src.ears.streaming_stt import StreamingTranscriber
+        with pytest.raises(ValueError):
+            StreamingTranscriber(MagicMock(), encoding="opus")
+
+
+class TestSTTService:
+    """Tests for STTService — shared engine, priority ordering, metrics."""
+
+    def _make(self, workers=1):
+        import threading
+        from src.ears.stt_service import STTService
+        gate = threading.Event()
+        order = []
+        engine = MagicMock()
+
+        def transcribe_array(audio, **kw):
+            gate.wait(5)
+            order.append(kw.get("beam_size"))
+            return "text", "en"
+
+        engine.transcribe_array.side_effect = transcribe_array
+        factory = MagicMock(return_value=engine)
+        return STTService(engine_factory=factory, workers=workers), factory, gate, order
+
+    def test_live_jobs_run_before_partials_and_background(self):
+        import time
+        from src.ears.stt_service import PRIORITY_BACKGROUND, PRIORITY_LIVE, PRIORITY_PARTIAL
+        service, factory, gate, order = self._make()
+        audio = np.zeros(1600, dtype=np.float32)
+        blocker = service.submit("transcribe_array", audio, beam_size=0)
+        while service.stats()["in_flight"] == 0:
+            time.sleep(0.001)
+        futures = [
+            service.submit("transcribe_array", audio, beam_size=3, priority=PRIORITY_BACKGROUND),
+            service.submit("transcribe_array", audio, beam_size=2, priority=PRIORITY_PARTIAL),
+            service.submit("transcribe_array", audio, beam_size=1, priority=PRIORITY_LIVE),
+        ]
+        assert service.stats()["queue_depth"] == 3
+        gate.set()
+        for f in [blocker] + futures:
+            f.result(timeout=5)
+        assert order == [0, 1, 2, 3]
+        factory.assert_called_once()
+        service.close()
+
+    def test_stats_report_rtf(self):
+        service, _, gate, _ = self._make(workers=2)
+        gate.set()
+        assert service.transcribe_array(np.zeros(16000, dtype=np.float32)) == ("text", "en")
+        stats = service.stats()
+        assert stats["completed_total"] == 1
+        assert stats["avg_rtf"] is not None and stats["queue_depth"] == 0
+        service.close()
+
+    def test_engine_errors_propagate(self):
+        service, _, gate, _ = self._make()
+        service.engine.transcribe.side_effect = RuntimeError("decode failed")
+        with pytest.raises(RuntimeError):
+            service.transcribe("clip.wav")
+        assert service.stats()["failed_total"] == 1
+        service.close()
+
+
+class TestDecodeAudio:
+    """Tests for decode_audio — in-memory decoding without temp files."""
+
+    @staticmethod
+    def _wav_bytes(audio, rate=16000):
+        import io
+        import soundfile as sf
+        buf = io.BytesIO()
+        sf.write(buf, audio, rate, format="WAV")
+        return buf.getvalue()
+
+    def test_wav_bytes_and_memoryview(self):
+        from src.ears.audio_io import decode_audio
+        tone = (0.5 * np.sin(np.linspace(0, 100, 16000))).astype(np.float32)
+        data = self._wav_bytes(tone)
+        for source in (data, memoryview(data)):
+            audio = decode_audio(source)
+            assert audio.dtype == np.float32 and audio.shape == (16000,)
+            assert np.allclose(audio, tone, atol=1e-3)
+
+    def test_stereo_is_downmixed(self):
+        from src.ears.audio_io import decode_audio
+        stereo = np.stack([np.full(800, 0.5), np.zeros(800)], axis=1).astype(np.float32)
+        assert np.allclose(decode_audio(self._wav_bytes(stereo)), 0.25, atol=1e-3)
+
+    def test_empty_and_oversized_input(self):
+        from src.ears import audio_io
+        assert audio_io.decode_audio(b"").size == 0
+        with patch.object(audio_io, "MAX_AUDIO_BYTES", 10):
+            with pytest.raises(ValueError):
+                audio_io.decode_audio(b"x" * 11)
+
+    def test_stt_bytes_decodes_once_in_memory(self):
+        from src.ears.stt_service import STTService
+        engine = MagicMock()
+        engine.transcribe_array.return_value = ("hello", "en")
+        service = STTService(engine_factory=lambda: engine, workers=1)
+        assert service.transcribe_bytes(self._wav_bytes(np.zeros(16000, dtype=np.float32))) == ("hello", "en")
+        audio = engine.transcribe_array.call_args.args[0]
+        assert audio.shape == (16000,)
+        assert engine.transcribe_array.call_args.kwargs["vad_filter"] is True
+        engine.transcribe.assert_not_called()
+        service.close()
+
+
 class TestVoiceRecorder:
     """Tests for VoiceRecorder — VAD threshold modes (model mocked)."""
 
@@ -57,6 +57,66 @@ class TestProctoringEngine:
         engine.cleanup()
         mock_face_mesh.close.assert_called_once()
 
+    def test_plan_stages(self):
+        from src.eyes.proctoring_engine import plan_stages
+
+        assert plan_stages(["user_left", "multiple_people"]) == ("faces",)
+        assert plan_stages(["looking_away"]) == ("faces", "gaze")
+        assert plan_stages(["object_cell_phone"]) == ("objects",)
+        with patch("src.eyes.proctoring_engine.settings") as mock_settings:
+            mock_settings.ENABLE_OBJECT_DETECTION = False
+            assert plan_stages(["user_left", "object_book"]) == ("faces",)
+
+    def test_analyze_frame_skips_stages_for_disabled_violations(self):
+        engine, _ = self._make_engine()
+        engine.detect_faces = MagicMock(return_value=(2, [MagicMock(), MagicMock()]))
+        engine.calculate_gaze_direction = MagicMock()
+        engine.calculate_head_pose = MagicMock()
+        engine.detect_earpiece = MagicMock()
+
+        violations, metadata = engine.analyze_frame(np.zeros((480, 640, 3), dtype=np.uint8))
+
+        assert violations == ["multiple_people"]
+        engine.calculate_gaze_direction.assert_not_called()
+        engine.calculate_head_pose.assert_not_called()
+        engine.detect_earpiece.assert_not_called()
+        assert engine.get_stage_stats()["stages"]["faces"]["calls"] == 1
+
+    def test_object_detection_cadence(self):
+        with patch("src.eyes.proctoring_engine.mp"), patch("src.eyes.proctoring_engine.cv2"):
+            from src.eyes.proctoring_engine import ProctoringEngine
+            engine = ProctoringEngine(violations={"user_left", "object_book"})
+        detector = MagicMock()
+        detector.detect.return_value = [{"class_name": "book", "bbox": [0, 0, 10, 10]}]
+        engine._object_detector = detector
+        engine.detect_faces = MagicMock(return_value=(0, None))
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        results = [engine.analyze_frame(frame)[0] for _ in range(6)]
+        assert detector.detect.call_count == 2  # first frame, then once the interval elapsed
+        assert all(v == ["user_left", "object_book"] for v in results)  # reused in between
+
+        engine.detect_faces.return_value = (1, [MagicMock()])
+        engine.analyze_frame(frame)
+        assert detector.detect.call_count == 3  # face count changed
+
+    def test_detection_runs_at_analysis_resolution(self):
+        with patch("src.eyes.proctoring_engine.mp"), patch("src.eyes.proctoring_engine.cv2"):
+            from src.eyes.proctoring_engine import ProctoringEngine
+            engine = ProctoringEngine(violations={"multiple_people", "earpiece_suspected"})
+        seen = []
+        engine.detect_faces = MagicMock(side_effect=lambda f: seen.append(f) or (1, [MagicMock()]))
+        engine.detect_earpiece = MagicMock(return_value={"earpiece_detected": False})
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+        engine.analyze_frame(frame)
+        engine.analyze_frame(frame)
+
+        assert seen[0].shape == (360, 640, 3)
+        assert seen[0] is seen[1]  # downscaled into the same buffer
+        assert engine.detect_earpiece.call_args[0][1] is frame  # landmark stages read full resolution
+        assert engine.get_stage_stats()["stages"]["downscale"]["calls"] == 2
+
 
 class TestProctoringMonitor:
     """Tests for ProctoringMonitor — violation logging, summary generation."""
@@ -110,5 +170,260 @@ class TestProctoringMonitor:
         monitor.stop()  # should not raise
 
 
+class TestRiskScorer:
+    """Tests for the windowed risk score and run-length timeline."""
+
+    def _scorer(self, **overrides):
+        from config import settings
+        from src.eyes.proctoring_monitor import RiskScorer
+
+        overrides.setdefault("PROCTORING_TIMELINE_MERGE_SECONDS", 10)
+        with patch.multiple(settings, **overrides):
+            return RiskScorer(window_seconds=30)
+
+    def test_window_sum_expires_old_events(self):
+        clock = [1000.0]
+        with patch("src.eyes.proctoring_monitor.time.time", side_effect=lambda: clock[0]):
+            scorer = self._scorer()
+            scorer.add_violation("user_left")  # weight 1.0
+            clock[0] += 20
+            scorer.add_violation("multiple_people")  # weight 1.0
+            assert scorer.get_risk_score() == pytest.approx(0.4)
+            clock[0] += 15
+            assert scorer.get_risk_score() == pytest.approx(0.2)
+            clock[0] += 60
+            assert scorer.get_risk_score() == 0.0
+            assert scorer.get_summary()["peak_risk_score"] == pytest.approx(0.4)
+
+    def test_nearby_violations_share_one_segment(self):
+        clock = [1000.0]
+        with patch("src.eyes.proctoring_monitor.time.time", side_effect=lambda: clock[0]):
+            scorer = self._scorer(PROCTORING_TIMELINE_MERGE_SECONDS=10)
+            for _ in range(5):
+                scorer.add_violation("user_left", sustained=True, duration=2.0)
+                clock[0] += 2
+            clock[0] += 30
+            scorer.add_violation("user_left")
+            timeline = scorer.get_timeline()
+
+        assert [seg["count"] for seg in timeline] == [5, 1]
+        assert timeline[0]["duration"] == 8.0
+        assert timeline[0]["sustained"] is True
+
+    def test_timeline_ring_buffer_is_bounded(self):
+        clock = [1000.0]
+        with patch("src.eyes.proctoring_monitor.time.time", side_effect=lambda: clock[0]):
+            scorer = self._scorer(PROCTORING_TIMELINE_MAX_SEGMENTS=3,
+                            PROCTORING_TIMELINE_MERGE_SECONDS=1)
+            for _ in range(10):
+                scorer.add_violation("looking_away")
+                clock[0] += 5
+            summary = scorer.get_summary()
+
+        assert len(summary["violation_timeline"]) == 3
+        assert summary["timeline_segments_dropped"] == 7
+        assert summary["total_violations"] == 10
+
+    def test_report_timeline_is_downsampled(self):
+        clock = [1000.0]
+        with patch("src.eyes.proctoring_monitor.time.time", side_effect=lambda: clock[0]):
+            scorer = self._scorer(PROCTORING_TIMELINE_MERGE_SECONDS=1)
+            for _ in range(100):
+                scorer.add_violation("looking_away")
+                clock[0] += 5
+            timeline = scorer.get_timeline(max_buckets=10)
+
+        assert len(timeline) == 10
+        assert sum(seg["count"] for seg in timeline) == 100
+
+
+
+class TestRemoteProctoring:
+    """Tests for proctoring over client-uploaded frames."""
+
+    def _frame(self, seq=1, width=320, height=240):
+        import cv2
+        from src.eyes.remote_proctoring import FRAME_HEADER, FRAME_MAGIC
+
+        ok, jpeg = cv2.imencode(".jpg", np.zeros((height, width, 3), dtype=np.uint8))
+        assert ok
+        return FRAME_HEADER.pack(FRAME_MAGIC, seq) + jpeg.tobytes()
+
+    def _monitor(self, violations=("user_left",), fps=5, max_width=640):
+        from src.eyes.remote_proctoring import RemoteProctoringMonitor
+
+        engine = MagicMock()
+        engine.analyze_frame.return_value = (list(violations), {"face_count": 0})
+        monitor = RemoteProctoringMonitor(fps=fps, max_width=max_width, engine=engine)
+        monitor.start()
+        return monitor, engine
+
+    def test_parse_frame(self):
+        from src.eyes.remote_proctoring import parse_frame, is_proctoring_frame
+
+        data = self._frame(seq=7)
+        seq, payload = parse_frame(data)
+        assert seq == 7 and bytes(payload[:2]) == b"\xff\xd8"
+        assert is_proctoring_frame(data)
+        assert not is_proctoring_frame(b"TTSA....")
+        with pytest.raises(ValueError):
+            parse_frame(b"PRCT")
+
+    def test_config_is_clamped(self):
+        from config import settings
+
+        monitor, _ = self._monitor(fps=60, max_width=4000)
+        assert monitor.config["fps"] == settings.PROCTORING_REMOTE_MAX_FPS
+        assert monitor.config["max_width"] == settings.PROCTORING_REMOTE_MAX_WIDTH
+
+    def test_update_sent_only_on_change(self):
+        monitor, engine = self._monitor()
+        monitor._min_interval = 0
+
+        update = monitor.submit_frame(self._frame(seq=1)).result(timeout=5)
+        assert update["seq"] == 1
+        assert update["violations"] == ["user_left"]
+        assert update["alert_level"] in ("clear", "info", "warning", "critical")
+        assert monitor.submit_frame(self._frame(seq=2)).result(timeout=5) is None
+        assert engine.analyze_frame.call_count == 2
+
+    def test_frames_faster_than_negotiated_rate_are_dropped(self):
+        monitor, _ = self._monitor(fps=1)
+
+        assert monitor.submit_frame(self._frame()).result(timeout=5) is not None
+        assert monitor.submit_frame(self._frame()) is None
+        assert monitor.get_violations_summary()["frames"]["dropped_rate"] == 1
+
+    def test_frame_dropped_while_previous_is_analyzed(self):
+        import threading
+
+        monitor, engine = self._monitor()
+        monitor._min_interval = 0
+        release = threading.Event()
+
+        def slow_analysis(frame):
+            release.wait(5)
+            return [], {"face_count": 1}
+
+        engine.analyze_frame.side_effect = slow_analysis
+        first = monitor.submit_frame(self._frame())
+        assert monitor.submit_frame(self._frame()) is None
+        release.set()
+        first.result(timeout=5)
+        assert monitor.get_violations_summary()["frames"]["dropped_busy"] == 1
+
+    def test_wide_frames_downscaled_into_reused_buffer(self):
+        monitor, engine = self._monitor(max_width=320)
+        monitor._min_interval = 0
+
+        shapes, buffers = [], []
+
+        def record(frame):
+            shapes.append(frame.shape)
+            buffers.append(frame)
+            return [], {"face_count": 1}
+
+        engine.analyze_frame.side_effect = record
+        monitor.submit_frame(self._frame(width=640, height=480)).result(timeout=5)
+        monitor.submit_frame(self._frame(width=640, height=480)).result(timeout=5)
+        assert shapes == [(240, 320, 3), (240, 320, 3)]
+        assert buffers[0] is buffers[1]
+
+    def test_invalid_frames_are_counted(self):
+        from src.eyes.remote_proctoring import FRAME_HEADER, FRAME_MAGIC
+
+        monitor, engine = self._monitor()
+        garbage = FRAME_HEADER.pack(FRAME_MAGIC, 1) + b"not an image"
+        assert monitor.submit_frame(garbage).result(timeout=5) is None
+        engine.analyze_frame.assert_not_called()
+        assert monitor.get_violations_summary()["frames"]["invalid"] == 1
+
+    def test_image_size_read_from_header(self):
+        import cv2
+        import struct
+        from src.eyes.remote_proctoring import image_size
+
+        image = np.zeros((37, 53, 3), dtype=np.uint8)
+        for ext, params in ((".jpg", []), (".webp", [cv2.IMWRITE_WEBP_QUALITY, 80]),
+                            (".webp", [cv2.IMWRITE_WEBP_QUALITY, 101])):  # 101 = lossless VP8L
+            ok, encoded = cv2.imencode(ext, image, params)
+            assert ok and image_size(encoded.tobytes()) == (53, 37)
+
+        vp8x = b"RIFF" + struct.pack("<I", 22) + b"WEBPVP8X" + struct.pack("<I", 10) + b"\x00" * 4
+        vp8x += (4999).to_bytes(3, "little") + (2999).to_bytes(3, "little")
+        assert image_size(vp8x) == (5000, 3000)
+        with pytest.raises(ValueError):
+            image_size(b"GIF89a....")
+
+    def test_oversized_header_rejected_before_decoding(self):
+        import struct
+        from src.eyes.remote_proctoring import FRAME_HEADER, FRAME_MAGIC
+
+        monitor, engine = self._monitor()
+        # Tiny JPEG that declares a 30000x30000 image in its SOF0 header
+        bomb = b"\xff\xd8\xff\xc0" + struct.pack("!HBHH", 11, 8, 30000, 30000) + b"\x01\x01\x11\x00"
+        with patch("src.eyes.remote_proctoring.cv2.imdecode") as imdecode:
+            assert monitor.submit_frame(FRAME_HEADER.pack(FRAME_MAGIC, 1) + bomb).result(timeout=5) is None
+        imdecode.assert_not_called()
+        engine.analyze_frame.assert_not_called()
+        assert monitor.get_violations_summary()["frames"]["invalid"] == 1
+
+    def test_stop_rejects_further_frames(self):
+        monitor, engine = self._monitor()
+        monitor.stop()
+        engine.cleanup.assert_called_once()
+        assert monitor.submit_frame(self._frame()) is None
+
+class TestVisionService:
+    """Tests for the shared, batched YOLO service."""
+
+    def _detector(self):
+        detector = MagicMock()
+        detector.backend = "torch"
+        detector.detect_batch.side_effect = lambda frames: [
+            [{"class_name": "book", "frame_value": int(f[0, 0, 0])}] for f in frames
+        ]
+        return detector
+
+    def test_concurrent_frames_share_batches_and_results_are_routed(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from src.eyes.vision_service import VisionService
+
+        detector = self._detector()
+        service = VisionService(detector=detector, max_batch_size=8, max_wait_ms=50)
+        frames = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(6)]
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            results = list(pool.map(service.detect, frames))
+
+        assert [r[0]["frame_value"] for r in results] == list(range(6))
+        stats = service.stats()
+        assert stats["frames_total"] == 6
+        assert stats["batches_total"] < 6
+        service.close()
+
+    def test_batch_failure_propagates_to_every_caller(self):
+        from src.eyes.vision_service import VisionService
+
+        detector = self._detector()
+        detector.detect_batch.side_effect = RuntimeError("boom")
+        service = VisionService(detector=detector, max_wait_ms=1)
+        with pytest.raises(RuntimeError):
+            service.detect(np.zeros((4, 4, 3), dtype=np.uint8))
+        service.close()
+
+    def test_export_failure_falls_back_to_torch(self, tmp_path):
+        from src.eyes.object_detector import ObjectDetector
+
+        with patch.object(ObjectDetector, "_load_model"):
+            detector = ObjectDetector(backend="onnx")
+        detector._model = MagicMock()
+        detector._model.export.side_effect = ImportError("onnxruntime")
+
+        model = detector._load_export(MagicMock(), tmp_path / "yolov8n.pt")
+        assert model is detector._model
+        assert detector.backend == "torch"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
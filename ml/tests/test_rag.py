@@ -1,4 +1,8 @@
-"""Tests for RAG engine: ChromaDB indexing, querying, overlap chunking."""
+"""Tests for RAG engine: shared JD indexes, querying, overlap chunking, question bank."""
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from src.brain.rag_engine import RAGEngine
 
@@ -18,29 +22,19 @@ def jd_text():
 
 
 @pytest.fixture(autouse=True)
-def clean_chromadb():
-    """Clean the job_context collection before each test to avoid stale data."""
-    import chromadb
-    from config import settings
-
-    settings.CHROMADB_DIR.mkdir(parents=True, exist_ok=True)
-    client = chromadb.PersistentClient(path=str(settings.CHROMADB_DIR))
-    try:
-        client.delete_collection(name="job_context")
-    except Exception:
-        pass
+def clean_jd_cache():
+    """Start each test with an empty shared JD index cache."""
+    from src.brain.jd_index import get_jd_index_cache
+    get_jd_index_cache().clear()
     yield
-    try:
-        client.delete_collection(name="job_context")
-    except Exception:
-        pass
+    get_jd_index_cache().clear()
 
 
 def test_rag_engine_index_and_query(jd_text):
     rag = RAGEngine(jd_text=jd_text)
 
     assert rag is not None
-    assert rag.collection.count() > 0
+    assert rag.chunk_count > 0
 
     results = rag.query_jd("technical skills", top_k=2)
     assert isinstance(results, list)
@@ -60,9 +54,10 @@ def test_rag_engine_empty_query():
 
 def test_rag_engine_reset_index(jd_text):
     rag = RAGEngine(jd_text=jd_text)
-    assert rag.collection.count() > 0
+    assert rag.chunk_count > 0
     rag.reset_index()
-    assert rag.collection.count() == 0
+    assert rag.chunk_count == 0
+    assert rag.query_jd("python") == []
 
 
 def test_rag_engine_multi_query(jd_text):
@@ -72,14 +67,87 @@ def test_rag_engine_multi_query(jd_text):
     assert len(results) > 0
 
 
-def test_rag_engine_always_reindexes(jd_text):
-    """Test that providing jd_text always forces reindex."""
+def test_rag_engine_sessions_are_isolated(jd_text):
+    """A session loading another JD must not affect an existing session."""
     rag1 = RAGEngine(jd_text="Old JD about Java and Spring Boot")
-    rag2 = RAGEngine(jd_text=jd_text)  # Should replace old data
-    results = rag2.query_jd("Python FastAPI")
-    combined = " ".join(results).lower()
-    # Should find new JD content, not old
+    rag2 = RAGEngine(jd_text=jd_text)
+    combined = " ".join(rag2.query_jd("Python FastAPI")).lower()
     assert "python" in combined or "fastapi" in combined
+    assert "java" in " ".join(rag1.query_jd("Java")).lower()
+
+
+def test_identical_jd_embedded_once(jd_text):
+    from unittest.mock import MagicMock
+    import numpy as np
+    encoder = MagicMock()
+    encoder.encode.side_effect = lambda texts: np.ones((len(texts), 3))
+    rag1 = RAGEngine(jd_text=jd_text, embedding_model=encoder)
+    rag2 = RAGEngine(jd_text="  " + jd_text.replace("\n", " "), embedding_model=encoder)
+    assert rag1.index is rag2.index
+    encoder.encode.assert_called_once()
+
+
+def test_multi_query_is_batched_and_memoized():
+    from unittest.mock import MagicMock
+    import numpy as np
+    jd = " ".join(f"w{i}" for i in range(400))  # several overlapping chunks
+    vocab = {"alpha": [1.0, 0.0], "beta": [0.0, 1.0]}
+    encoder = MagicMock()
+    encoder.encode.side_effect = lambda texts: np.array(
+        [vocab.get(t, [1.0, float(i)]) for i, t in enumerate(texts)]
+    )
+    rag = RAGEngine(jd_text=jd, embedding_model=encoder)
+    encoder.encode.reset_mock()
+
+    results = rag.query_jd_multi(["alpha", "beta"], top_k=2)
+    assert len(results) == len(set(results)) and len(results) >= 2
+    encoder.encode.assert_called_once_with(["alpha", "beta"])
+
+    other_session = RAGEngine(jd_text=jd, embedding_model=encoder)
+    assert other_session.query_jd_multi(["alpha", "beta"], top_k=2) == results
+    encoder.encode.assert_called_once()
+
+
+def test_concurrent_identical_jd_builds_once(jd_text):
+    import threading
+    import time
+    from unittest.mock import MagicMock
+    import numpy as np
+    from src.brain.jd_index import JDIndexCache
+
+    def slow_encode(texts):
+        time.sleep(0.05)
+        return np.ones((len(texts), 3))
+
+    encoder = MagicMock()
+    encoder.encode.side_effect = slow_encode
+    cache = JDIndexCache(max_entries=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build(jd_text, encoder)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert encoder.encode.call_count == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_whitespace_only_jd_gives_empty_index():
+    from unittest.mock import MagicMock
+    import numpy as np
+    from src.brain.jd_index import JDIndexCache
+
+    encoder = MagicMock()
+    encoder.encode.side_effect = lambda texts: np.ones((len(texts), 3))
+    index = JDIndexCache().get_or_build("   \n  ", encoder)
+    assert len(index) == 0
+    assert index.matrix.shape[0] == 0
+    encoder.encode.assert_not_called()
+
+    rag = RAGEngine(jd_text="   \n  ", embedding_model=encoder)
+    assert rag.query_jd("python", top_k=3) == []
+    assert rag.query_jd_multi(["python", "sql"], top_k=3) == []
 
 
 def test_rag_engine_chunk_overlap(jd_text):
@@ -88,5 +156,117 @@ def test_rag_engine_chunk_overlap(jd_text):
     assert len(chunks) > 2  # With overlap, should get more chunks than without
 
 
+def _question_index():
+    import numpy as np
+    from src.brain.question_index import QuestionBankIndex, question_record
+    questions = [
+        {"question": "Explain binary search", "category": "dsa", "difficulty": "easy", "tags": ["search"]},
+        {"question": "Design a URL shortener", "category": "system_design", "difficulty": "hard"},
+        {"question": "Reverse a linked list", "category": "dsa", "difficulty": "medium"},
+    ]
+    embeddings = np.array([[1.0, 0.0], [0.0, 1.0], [0.8, 0.2]])
+    return QuestionBankIndex(
+        [f"qb_{i}" for i in range(3)], embeddings, [question_record(q) for q in questions]
+    )
+
+
+def test_question_index_ranks_by_cosine():
+    index = _question_index()
+    results = index.search([2.0, 0.0], top_k=2)
+    assert [r["id"] for r in results] == ["qb_0", "qb_2"]
+    assert results[0]["distance"] == pytest.approx(0.0, abs=1e-6)
+    assert results[0]["tags"] == ["search"]
+
+
+def test_question_index_filters_and_excludes():
+    index = _question_index()
+    assert [r["id"] for r in index.search([1.0, 0.0], category="dsa", exclude_ids=["qb_0"])] == ["qb_2"]
+    assert [r["id"] for r in index.search([1.0, 0.0], difficulty="hard")] == ["qb_1"]
+    assert index.search([1.0, 0.0], category="unknown") == []
+
+
+@pytest.fixture
+def isolated_question_bank(tmp_path, monkeypatch):
+    """QuestionBankRAG on a throwaway ChromaDB dir with a deterministic encoder."""
+    import numpy as np
+    from unittest.mock import MagicMock
+    from config import settings
+    from src.brain import rag_engine
+
+    monkeypatch.setattr(settings, "CHROMADB_DIR", tmp_path)
+    monkeypatch.setattr(rag_engine, "QUESTION_BANK_MANIFEST_PATH", tmp_path / "manifest.json")
+    encoder = MagicMock()
+    encoder.encode.side_effect = lambda texts: np.array(
+        [[float(len(t)), 1.0, 0.5] for t in texts], dtype=np.float32
+    )
+    return rag_engine.QuestionBankRAG(embedding_model=encoder), encoder
+
+
+def test_question_bank_sync_is_incremental(isolated_question_bank):
+    qb, encoder = isolated_question_bank
+    questions = [
+        {"question": "What is a hash map and how does it work?", "category": "dsa"},
+        {"question": "Explain the CAP theorem in distributed systems", "category": "system_design"},
+    ]
+    qb.index_questions(questions)
+    ids_before = set(qb.collection.get()["ids"])
+    encoder.encode.reset_mock()
+
+    # Reorder, edit metadata of one, drop nothing, add one
+    questions = [dict(questions[1], difficulty="hard"), questions[0],
+                 {"question": "How does garbage collection work in Python?", "category": "python"}]
+    qb.index_questions(questions)
+
+    assert qb.last_sync == {"added": 1, "updated": 1, "removed": 0, "total": 3}
+    assert ids_before <= set(qb.collection.get()["ids"])
+    encoder.encode.assert_called_once()
+    assert len(encoder.encode.call_args[0][0]) == 1
+
+    qb.index_questions(questions[:1])
+    assert qb.last_sync["removed"] == 2
+    assert qb.collection.count() == 1
+
+
+def test_question_bank_manifest_skips_unchanged(isolated_question_bank, tmp_path):
+    import json
+    qb, encoder = isolated_question_bank
+    bank = tmp_path / "question_bank.json"
+    bank.write_text(json.dumps([{"question": "What is dependency injection?"}]))
+
+    assert qb.ensure_indexed(bank)["status"] == "indexed"
+    encoder.encode.reset_mock()
+    assert qb.ensure_indexed(bank) == {"status": "unchanged", "count": 1}
+    encoder.encode.assert_not_called()
+
+
+def test_is_indexed_skips_chromadb_count(isolated_question_bank):
+    from unittest.mock import MagicMock
+    qb, _ = isolated_question_bank
+    assert not qb.is_indexed
+    qb.index_questions([{"question": "What is dependency injection?"}])
+    qb.collection = MagicMock(wraps=qb.collection)
+
+    assert qb.is_indexed
+    qb._get_memory_index()
+    assert qb.is_indexed
+    qb.collection.count.assert_not_called()
+
+    qb.index_questions([{"question": "short"}])  # filtered out: bank now empty
+    assert not qb.is_indexed
+
+
+def test_brain_package_imports_in_fresh_interpreter():
+    """src.brain must import on its own, without src.core loaded first."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.brain"],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True, text=True, timeout=120,
+    )
+    assert "partially initialized" not in result.stderr
+    if result.returncode and "ModuleNotFoundError" in result.stderr:
+        pytest.skip(f"optional dependency missing: {result.stderr.strip().splitlines()[-1]}")
+    assert result.returncode == 0, result.stderr
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
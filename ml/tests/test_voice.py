@@ -80,38 +80,230 @@ class TestTTSEngine:
             engine.speak_stream(gen())
             mock_synth.assert_not_called()
 
-    @patch("src.voice.tts_engine.settings")
-    def test_edge_failure_increments_counter(self, mock_settings):
+    def test_synthesize_and_play_plays_service_audio(self):
         from src.voice.tts_engine import TTSEngine
 
         engine = TTSEngine.__new__(TTSEngine)
         engine.vad = None
-        engine._piper_voice = None
-        engine._edge_failed_count = 0
-        engine._max_edge_failures = 5
-        engine._temp_dir = MagicMock()
+        engine.service = MagicMock()
+        engine.service.synthesize.return_value = (b"audio", "mp3")
 
-        with patch.object(engine, '_synthesize_edge', return_value=None):
-            with patch.object(engine, '_synthesize_piper', return_value=None):
-                engine._synthesize_and_play("Test")
-                assert engine._edge_failed_count == 1
+        with patch.object(engine, '_play_audio') as mock_play:
+            engine._synthesize_and_play("Test")
+            engine.service.synthesize.assert_called_once_with("Test")
+            mock_play.assert_called_once_with(b"audio")
 
-    @patch("src.voice.tts_engine.settings")
-    def test_skips_edge_after_max_failures(self, mock_settings):
+    def test_synthesize_and_play_silent_on_failure(self):
         from src.voice.tts_engine import TTSEngine
 
         engine = TTSEngine.__new__(TTSEngine)
         engine.vad = None
-        engine._piper_voice = None
-        engine._edge_failed_count = 5
-        engine._max_edge_failures = 5
-        engine._temp_dir = MagicMock()
+        engine.service = MagicMock()
+        engine.service.synthesize.return_value = None
+
+        with patch.object(engine, '_play_audio') as mock_play:
+            engine._synthesize_and_play("Test")
+            mock_play.assert_not_called()
+
+
+class TestTTSService:
+    """Tests for the shared TTS synthesis service."""
+
+    class _Backend:
+        codec = "mp3"
+        voice = "test"
+        sample_rate = 16000
+        available = True
+
+        def __init__(self, name, audio=b"x" * 200):
+            self.name = name
+            self.audio = audio
+            self.calls = []
+
+        async def synthesize(self, text):
+            self.calls.append(text)
+            if isinstance(self.audio, Exception):
+                raise self.audio
+            return self.audio
+
+    def test_falls_back_and_counts_failures(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
+
+        edge = self._Backend("edge", RuntimeError("offline"))
+        piper = self._Backend("piper")
+        piper.codec = "wav"
+        service = TTSService([edge, piper], max_failures=5, cache=TTSCache(tmp_path))
+        try:
+            assert service.synthesize("Hello") == (b"x" * 200, "wav")
+            assert service.stats()["backends"][0]["consecutive_failures"] == 1
+        finally:
+            service.close()
+
+    def test_skips_backend_after_max_failures(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
+
+        edge = self._Backend("edge", b"")  # too short: counts as a failure
+        piper = self._Backend("piper")
+        service = TTSService([edge, piper], max_failures=2, cache=TTSCache(tmp_path))
+        try:
+            for _ in range(3):
+                assert service.synthesize("Hello") is not None
+            assert len(edge.calls) == 2
+            assert service.stats()["backends"][0]["skipped"] is True
+        finally:
+            service.close()
+
+    def test_skipped_backend_recovers_after_cooldown(self, tmp_path):
+        import time
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
+
+        edge = self._Backend("edge", RuntimeError("outage"))
+        piper = self._Backend("piper")
+        service = TTSService([edge, piper], max_failures=2, retry_after=0.2, cache=TTSCache(tmp_path))
+        try:
+            service.synthesize("One")
+            service.synthesize("Two")
+            service.synthesize("Three")
+            assert len(edge.calls) == 2  # skipped during the cooldown
+
+            edge.audio = b"y" * 200  # outage over
+            time.sleep(0.25)
+            assert service.synthesize("Four") == (b"y" * 200, "mp3")
+            stats = service.stats()["backends"][0]
+            assert stats["consecutive_failures"] == 0 and stats["skipped"] is False
+            assert service.synthesize("Five") == (b"y" * 200, "mp3")
+        finally:
+            service.close()
+
+    def test_failed_trial_waits_another_cooldown(self, tmp_path):
+        import time
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
+
+        edge = self._Backend("edge", RuntimeError("outage"))
+        piper = self._Backend("piper")
+        service = TTSService([edge, piper], max_failures=1, retry_after=0.2, cache=TTSCache(tmp_path))
+        try:
+            service.synthesize("One")
+            time.sleep(0.25)
+            service.synthesize("Two")  # single trial, still failing
+            service.synthesize("Three")
+            assert edge.calls == ["One", "Two"]
+            assert service.stats()["backends"][0]["retry_in_seconds"] > 0
+        finally:
+            service.close()
+
+    def test_returns_none_when_all_backends_fail(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
+
+        service = TTSService([self._Backend("edge", b"")], cache=TTSCache(tmp_path))
+        try:
+            assert service.synthesize("Hello") is None
+            assert service.synthesize("   ") is None
+            assert service.stats()["failed_total"] == 1
+        finally:
+            service.close()
+
+    def test_sentences_synthesize_concurrently(self, tmp_path):
+        import time
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService, StubTTSBackend
+
+        service = TTSService([StubTTSBackend(latency=0.2)], max_concurrent=4, cache=TTSCache(tmp_path))
+        try:
+            started = time.perf_counter()
+            futures = [service.submit(f"Sentence number {i}.") for i in range(4)]
+            results = [f.result(timeout=5) for f in futures]
+            elapsed = time.perf_counter() - started
+        finally:
+            service.close()
+
+        assert all(codec == "wav" and audio[:4] == b"RIFF" for audio, codec in results)
+        assert elapsed < 0.6  # serial synthesis would take 0.8s
+
+
+    def test_repeated_utterance_served_from_cache(self, tmp_path):
+        import time
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
+
+        backend = self._Backend("edge")
+        service = TTSService([backend], cache=TTSCache(tmp_path))
+        try:
+            assert service.synthesize("Ending session.") == (b"x" * 200, "mp3")
+            deadline = time.monotonic() + 2
+            while not list(tmp_path.glob("*.mp3")) and time.monotonic() < deadline:
+                time.sleep(0.01)  # cache writes happen off the loop
+            future = service.submit("  Ending   session. ")
+            assert future.done()
+            assert future.result() == (b"x" * 200, "mp3")
+            assert backend.calls == ["Ending session."]
+        finally:
+            service.close()
 
-        with patch.object(engine, '_synthesize_edge') as mock_edge:
-            with patch.object(engine, '_synthesize_piper', return_value=None):
-                engine._synthesize_and_play("Test")
-                mock_edge.assert_not_called()
+    def test_prewarm_caches_uncached_texts(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+        from src.voice.tts_service import TTSService
 
+        backend = self._Backend("edge")
+        service = TTSService([backend], cache=TTSCache(tmp_path))
+        try:
+            assert service.prewarm(["One.", "Two.", "", "One."]).result(timeout=5) == 2
+            assert service.submit("Two.").done()
+            assert backend.calls == ["One.", "Two."]
+        finally:
+            service.close()
+
+
+class TestTTSCache:
+    """Tests for the content-addressed utterance cache."""
+
+    def test_key_covers_voice_backend_and_rate(self):
+        from src.voice.tts_cache import TTSCache
+
+        key = TTSCache.key("Hello there.", "guy", "edge", 24000)
+        assert key == TTSCache.key("  Hello   there. ", "guy", "edge", 24000)
+        assert key != TTSCache.key("Hello there.", "ryan", "edge", 24000)
+        assert key != TTSCache.key("Hello there.", "guy", "piper", 24000)
+        assert key != TTSCache.key("Hello there.", "guy", "edge", 22050)
+
+    def test_persists_across_instances(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+
+        TTSCache(tmp_path).put("abc", b"audio", "wav")
+        cache = TTSCache(tmp_path)
+        assert "abc" in cache
+        assert cache.get("abc") == (b"audio", "wav")
+        assert cache.get("missing") is None
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    def test_memory_bound_evicts_least_recently_used(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+
+        cache = TTSCache(tmp_path, max_memory_bytes=10)
+        cache.put("a", b"12345", "wav")
+        cache.put("b", b"12345", "wav")
+        cache.get("a")
+        cache.put("c", b"12345", "wav")
+        assert set(cache._memory) == {"a", "c"}
+        assert cache.get("b") == (b"12345", "wav")  # still on disk
+
+    def test_disk_bound_evicts_oldest_files(self, tmp_path):
+        from src.voice.tts_cache import TTSCache
+
+        cache = TTSCache(tmp_path, max_disk_bytes=10)
+        for key in ("a", "b", "c"):
+            cache.put(key, b"12345", "mp3")
+        assert sorted(p.stem for p in tmp_path.glob("*.mp3")) == ["b", "c"]
+        assert cache.stats()["disk_bytes"] == 10
+
+        cache.clear()
+        assert not list(tmp_path.glob("*.mp3"))
+        assert cache.get("c") is None
 
 class TestTTSWorkerProtocol:
     """Tests for TTS worker message parsing logic (legacy)."""
@@ -137,5 +329,103 @@ class TestTTSWorkerProtocol:
         assert ".." in filename
 
 
+class TestSpeechStream:
+    """Tests for sentence-pipelined TTS frames."""
+
+    def _collect(self, stream):
+        async def run():
+            return [frame async for frame in stream.frames()]
+        return run
+
+    def test_frame_roundtrip(self):
+        from src.voice.tts_stream import encode_frame, decode_frame, CODEC_MP3
+
+        frame = decode_frame(encode_frame(7, 3, b"audio", CODEC_MP3))
+        assert (frame.stream_id, frame.seq, frame.codec, frame.final, frame.payload) == (
+            7, 3, CODEC_MP3, False, b"audio")
+
+    def test_decode_rejects_foreign_frames(self):
+        from src.voice.tts_stream import decode_frame
+
+        with pytest.raises(ValueError):
+            decode_frame(b"TTS")
+        with pytest.raises(ValueError):
+            decode_frame(b"RIFF" + b"\x00" * 20)
+
+    def test_frames_are_ordered_and_end_with_final(self):
+        import asyncio
+        from src.voice.tts_stream import SpeechStream, decode_frame, CODEC_MP3, CODEC_NONE
+
+        spoken = []
+
+        def synthesize(text):
+            spoken.append(text)
+            return text.encode(), "mp3"
+
+        async def run():
+            stream = SpeechStream(synthesize, stream_id=2)
+            stream.feed("Hello there.")
+            stream.feed("  ")
+            stream.feed("How are you?")
+            stream.close()
+            return [decode_frame(f) async for f in stream.frames()]
+
+        frames = asyncio.run(run())
+        # Fragments queued before synthesis starts are merged into one request
+        assert spoken == ["Hello there. How are you?"]
+        assert [f.seq for f in frames] == [0, 1]
+        assert frames[0].codec == CODEC_MP3
+        assert frames[0].payload == b"Hello there. How are you?"
+        assert frames[-1].final and frames[-1].codec == CODEC_NONE and frames[-1].payload == b""
+        assert all(f.stream_id == 2 for f in frames)
+
+    def test_failed_synthesis_is_skipped(self):
+        import asyncio
+        from src.voice.tts_stream import SpeechStream, decode_frame
+
+        results = iter([RuntimeError("offline"), None, (b"ok", "wav")])
+
+        def synthesize(text):
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        async def run():
+            stream = SpeechStream(synthesize)
+            collect = asyncio.ensure_future(self._collect(stream)())
+            for text in ("One.", "Two.", "Three."):
+                stream.feed(text)
+                await asyncio.sleep(0.05)  # let each fragment be synthesized alone
+            stream.close()
+            return [decode_frame(f) for f in await collect]
+
+        frames = asyncio.run(run())
+        assert [f.payload for f in frames] == [b"ok", b""]
+        assert [f.seq for f in frames] == [0, 1]
+
+    def test_concurrent_syntheses_keep_order(self):
+        import asyncio
+        import time
+        from src.voice.tts_stream import SpeechStream, decode_frame
+
+        def synthesize(text):
+            time.sleep(0.15 if text == "Slow." else 0.01)
+            return text.encode(), "mp3"
+
+        async def run():
+            stream = SpeechStream(synthesize, max_in_flight=2)
+            collect = asyncio.ensure_future(self._collect(stream)())
+            stream.feed("Slow.")
+            await asyncio.sleep(0.02)
+            stream.feed("Fast.")
+            await asyncio.sleep(0.05)
+            stream.close()
+            return [decode_frame(f) for f in await collect]
+
+        frames = asyncio.run(run())
+        assert [f.payload for f in frames] == [b"Slow.", b"Fast.", b""]
+        assert [f.seq for f in frames] == [0, 1, 2]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])